@@ -0,0 +1,86 @@
+"""
+Benchmark for thread placement under contention.
+A periodic worker imitating ai_worker (fixed CPU work every 33 ms) runs while CPU-hog processes stand in for VLC's
+decoder threads. It is measured once with the inherited placement and once with the given core list and nice values
+applied through thread_placement, reporting the period jitter (lateness of each wakeup) and per-iteration work time.
+Lowering niceness below 0 needs CAP_SYS_NICE (run as root or grant the capability); otherwise only the hogs are
+de-prioritised through --hog-nice.
+Usage:
+    python bench_affinity.py --hogs 4 --worker-cores 2-3 --worker-nice -5 --hog-cores 0-1 --hog-nice 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from threading import Thread
+
+from thread_placement import ThreadPlacement, parse_cores
+from utilities import percentile
+
+def hog(cores, nice):
+    """Busy loop standing in for a video decoder thread."""
+    if cores:
+        os.sched_setaffinity(0, cores)
+    if nice:
+        os.nice(nice)
+    x = 0
+    while True:
+        x = (x * 31 + 7) % 1000003
+
+def periodic_worker(placement, period, work_ms, iterations, out):
+    """Wakes every period seconds and burns work_ms of CPU, like one capture + inference submission cycle."""
+    placement.apply("ai_worker")
+    lateness, work = [], []
+    next_wake = time.perf_counter() + period
+    for _ in range(iterations):
+        delay = next_wake - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        woke = time.perf_counter()
+        lateness.append((woke - next_wake) * 1000)
+        end = woke + work_ms / 1000
+        while time.perf_counter() < end:
+            pass
+        work.append((time.perf_counter() - woke) * 1000)
+        next_wake += period
+        if next_wake < time.perf_counter():
+            next_wake = time.perf_counter() + period        # Skip missed periods instead of bursting
+    out["lateness"], out["work"] = lateness, work
+
+def run(label, placement, args):
+    out = {}
+    worker = Thread(target=periodic_worker, args=(placement, args.period, args.work_ms, args.iterations, out))
+    worker.start()
+    worker.join()
+    print(f"{label:<12} | {placement.describe_role('ai_worker')}")
+    print(f"{'':<12} | wakeup lateness p50 {percentile(out['lateness'], 50):6.2f} ms  p99 {percentile(out['lateness'], 99):6.2f} ms"
+          f" | work p50 {percentile(out['work'], 50):6.2f} ms  p99 {percentile(out['work'], 99):6.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure ai_worker-like jitter with and without thread placement.")
+    parser.add_argument("--hogs", type=int, default=os.cpu_count() or 1, help="CPU-hog processes standing in for VLC")
+    parser.add_argument("--hog-cores", default="", help="Core list for the hogs, e.g. 0-1 (default: any)")
+    parser.add_argument("--hog-nice", type=int, default=0)
+    parser.add_argument("--worker-cores", default="", help="Core list for the worker, e.g. 2-3")
+    parser.add_argument("--worker-nice", default="-5")
+    parser.add_argument("--period", type=float, default=0.033)
+    parser.add_argument("--work-ms", type=float, default=8.0)
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    hog_cores = parse_cores(args.hog_cores)
+    hogs = [multiprocessing.Process(target=hog, args=(hog_cores, args.hog_nice), daemon=True) for _ in range(args.hogs)]
+    for p in hogs:
+        p.start()
+    time.sleep(0.5)
+    print(f"{args.hogs} hog process(es) on cores {sorted(hog_cores) if hog_cores else 'any'}, nice {args.hog_nice}; "
+          f"{os.cpu_count()} CPU(s) available")
+    try:
+        run("inherited", ThreadPlacement(), args)
+        pinned = ThreadPlacement()
+        pinned.configure({"ai_worker": {"cores": args.worker_cores, "nice": args.worker_nice}})
+        run("placed", pinned, args)
+    finally:
+        for p in hogs:
+            p.terminate()
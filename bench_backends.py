@@ -0,0 +1,92 @@
+"""
+Benchmark of the player backends in input_handler.py against the local VLC stand-ins (vlc_stub.py).
+For each backend it sends the same mix of commands back to back and reports round-trip latency percentiles
+and sustained throughput. Backends are called directly so the numbers exclude the command queue.
+Before timing, every backend is checked to move the stub's player by exactly the requested amount for "+"/"-" steps
+(the RC stub treats "volume X" and "seek X" as absolute, like VLC does), so every backend has the same step size.
+Run with: python bench_backends.py --commands 2000 --latency 0.0
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from input_handler import HTTPBackend, RCSocketBackend
+from utilities import percentile
+from vlc_stub import FaultProfile, RCStubServer, VLCStubServer
+
+COMMAND_MIX = [
+    ("volume", "+5"),
+    ("volume", "-5"),
+    ("seek", "+1"),
+    ("seek", "-1"),
+    ("pause", None),
+]
+
+def check_steps(backend, player):
+    """Sends one relative step of each kind from a known player state. Returns a list of problems found."""
+    problems = []
+    checks = [
+        ("volume", "+5", lambda: player.volume == 261),
+        ("volume", "-5", lambda: player.volume == 251),
+        ("seek", "+1", lambda: int(player._current_time()) == 101),
+        ("seek", "-1", lambda: int(player._current_time()) == 99),
+    ]
+    for action, value, moved_as_expected in checks:
+        with player.lock:
+            player.state = "paused"
+            player.volume = 256
+            player._set_time(100)
+        backend.send(action, value)
+        if not moved_as_expected():
+            problems.append(f"{action} {value} -> volume {player.volume}, time {int(player._current_time())} s")
+    return problems
+
+def run_backend(backend, commands):
+    """Sends commands sequentially through backend. Returns (round-trip times in ms, total elapsed seconds, failures)."""
+    backend.send("pause")           # Warm up: opens the persistent connection where there is one
+    timings, failures = [], 0
+    start = time.perf_counter()
+    for i in range(commands):
+        action, value = COMMAND_MIX[i % len(COMMAND_MIX)]
+        t0 = time.perf_counter()
+        if not backend.send(action, value):
+            failures += 1
+        timings.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - start
+    backend.close()
+    return timings, elapsed, failures
+
+def print_row(name, timings, elapsed, failures):
+    print(f"{name:<12} p50 {percentile(timings, 50):7.3f} ms | p95 {percentile(timings, 95):7.3f} ms | "
+          f"p99 {percentile(timings, 99):7.3f} ms | {len(timings) / elapsed:8.1f} cmd/s | failures {failures}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare HTTP and RC socket player backends against the local stubs.")
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated player processing delay in seconds")
+    args = parser.parse_args()
+
+    faults = FaultProfile(latency=args.latency)
+    http_stub = VLCStubServer(port=0, faults=faults).start()
+    tcp_stub = RCStubServer("127.0.0.1:0", faults=faults).start()
+    unix_path = os.path.join(tempfile.gettempdir(), f"vlc_rc_bench_{os.getpid()}.sock")
+    unix_stub = RCStubServer(unix_path, faults=faults).start()
+
+    try:
+        print(f"{args.commands} commands per backend, simulated player latency {args.latency * 1000:.1f} ms")
+        backends = [
+            ("http", HTTPBackend("127.0.0.1", str(http_stub.port), http_stub.password, timeout=2.0), http_stub),
+            ("rc-tcp", RCSocketBackend(tcp_stub.address, timeout=2.0), tcp_stub),
+            ("rc-unix", RCSocketBackend(unix_stub.address, timeout=2.0), unix_stub),
+        ]
+        for name, backend, stub in backends:
+            problems = check_steps(backend, stub.player)
+            if problems:
+                print(f"{name:<12} WRONG relative steps: {'; '.join(problems)}")
+            print_row(name, *run_backend(backend, args.commands))
+    finally:
+        http_stub.stop()
+        tcp_stub.stop()
+        unix_stub.stop()
@@ -0,0 +1,67 @@
+"""
+Benchmark of the landmark classifier in landmark_classifier.py.
+Synthetic poses (random finger layouts) are enrolled, then unseen noisy copies of them are classified after random
+translation, scaling and hand mirroring. It reports per-frame classification time (normalisation plus kNN, batched
+across all hands) for 1-4 hands and several enrollment sizes, plus accuracy and the open-set rejection rate.
+The target is well under 1 ms per frame.
+Run with: python bench_classifier.py
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from landmark_classifier import NUM_LANDMARKS, LandmarkClassifier, normalise_landmarks
+from utilities import percentile
+
+def make_poses(count, rng):
+    """Random base poses: (count, 21, 2) landmark layouts with the wrist at the origin and unit hand scale."""
+    poses = rng.uniform(-1.0, 1.0, size=(count, NUM_LANDMARKS, 2))
+    poses[:, 0] = 0.0
+    poses[:, 9] = [0.0, -1.0]
+    return poses
+
+def observe(poses, rng, noise=0.04):
+    """Places poses in the image: random wrist position, hand size, optional mirroring (left hands) and landmark noise."""
+    n = len(poses)
+    left = rng.random(n) < 0.5
+    scale = rng.uniform(0.08, 0.2, size=n)
+    offset = rng.uniform(0.3, 0.7, size=(n, 1, 2))
+    points = poses + rng.normal(0, noise, size=poses.shape)
+    points[left, :, 0] *= -1
+    return (points * scale[:, None, None] + offset).astype(np.float32), left
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the landmark kNN classifier.")
+    parser.add_argument("--classes", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    poses = make_poses(args.classes, rng)
+    unknown = make_poses(args.classes, rng)          # Poses that were never enrolled
+
+    for samples_per_class in (30, 90, 300):          # About 1, 3 and 10 seconds of recording at 30 fps
+        classifier = LandmarkClassifier()
+        for c in range(args.classes):
+            points, left = observe(np.repeat(poses[c:c + 1], samples_per_class, axis=0), rng)
+            classifier.enroll(f"pose_{c}", normalise_landmarks(points, left))
+
+        for hands in (1, 2, 4):
+            timings, correct, total = [], 0, 0
+            for _ in range(args.frames):
+                labels = rng.integers(0, args.classes, size=hands)
+                points, left = observe(poses[labels], rng)
+                t0 = time.perf_counter()
+                results = classifier.classify(normalise_landmarks(points, left))
+                timings.append((time.perf_counter() - t0) * 1000)
+                correct += sum(r[0] == f"pose_{l}" for r, l in zip(results, labels))
+                total += hands
+
+            points, left = observe(unknown[rng.integers(0, args.classes, size=500)], rng)
+            rejected = sum(r[0] is None for r in classifier.classify(normalise_landmarks(points, left)))
+
+            print(f"{samples_per_class:>4} samples/class | {hands} hands | p50 {percentile(timings, 50):.3f} ms | "
+                  f"p99 {percentile(timings, 99):.3f} ms | accuracy {correct / total:.1%} | unknown rejected {rejected / 500:.1%}")
@@ -0,0 +1,98 @@
+"""
+Benchmark of the two gesture dispatch modes in main.py.
+It rebuilds the pipeline around SharedState with simulated parts: a camera whose read() blocks until the next frame,
+a recognizer that answers after a fixed inference time, and a gesture decision that burns a fixed amount of CPU.
+For each mode it reports the end-to-end latency from frame capture to the gesture decision on that frame's result
+(the "Decision Latency" shown on the main page).
+- frame: The decision runs in ai_worker after the next camera.read() returns (the original behaviour).
+- callback: result_callback wakes the gesture worker, which decides straight away.
+Run with: python bench_dispatch.py --seconds 5 --fps 30 --inference-ms 45
+"""
+
+import argparse
+import time
+from threading import Thread
+
+from shared_state import SharedState
+from utilities import percentile
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+def run(mode, seconds, fps, inference_ms, decision_ms):
+    state = SharedState()
+    state.dispatch.set_callback_mode(mode == "callback")
+    latencies = []
+    period = 1 / fps
+    stop = time.perf_counter() + seconds
+
+    def decide(snapshot):
+        busy(decision_ms)
+        latencies.append((time.perf_counter() - snapshot.timestamp_us / 1e6) * 1000)
+
+    def result_callback(capture_time):
+        state.publish_result(object(), 0, capture_time * 1e6)
+        state.in_flight.release()
+        if state.dispatch.callback_mode:
+            state.dispatch.wake.set()
+
+    def recognize_async(capture_time):
+        Thread(target=lambda: (time.sleep(inference_ms / 1000), result_callback(capture_time))).start()
+
+    def gesture_worker():
+        dispatch = state.dispatch
+        last_version = 0
+        while time.perf_counter() < stop:
+            dispatch.wake.wait(0.5)
+            dispatch.wake.clear()
+            if not dispatch.begin():
+                continue
+            snapshot = state.result
+            if snapshot.version != last_version:
+                last_version = snapshot.version
+                decide(snapshot)
+            dispatch.end()
+
+    def ai_worker():
+        next_frame = time.perf_counter()
+        last_decided = 0
+        while time.perf_counter() < stop:
+            # Blocking camera.read(): returns when the next frame has been captured
+            next_frame += period
+            time.sleep(max(0.0, next_frame - time.perf_counter()))
+            capture_time = time.perf_counter()
+            snapshot = state.result
+            if not state.dispatch.callback_mode:
+                if snapshot.version != last_decided and snapshot.version:
+                    decide(snapshot)
+                else:
+                    busy(decision_ms)
+                last_decided = snapshot.version
+            if state.in_flight.try_acquire():
+                recognize_async(capture_time)
+
+    threads = [Thread(target=ai_worker), Thread(target=gesture_worker)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare capture-to-decision latency of the gesture dispatch modes.")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--inference-ms", type=float, default=45.0)
+    parser.add_argument("--decision-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("frame", "callback"):
+        results[mode] = run(mode, args.seconds, args.fps, args.inference_ms, args.decision_ms)
+        lat = results[mode]
+        print(f"{mode:<9} | {len(lat):4d} decisions | capture to decision p50 {percentile(lat, 50):6.1f} ms  "
+              f"p99 {percentile(lat, 99):6.1f} ms  max {max(lat):6.1f} ms")
+    saved = percentile(results["frame"], 50) - percentile(results["callback"], 50)
+    print(f"Median latency saved by deciding in the callback path: {saved:.1f} ms")
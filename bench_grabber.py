@@ -0,0 +1,97 @@
+"""
+Benchmark of FrameGrabber against plain camera.read().
+By default it uses a simulated V4L2 camera (30 fps, a driver queue of several frames, a few ms to decode) whose frames
+carry their capture time, so the age of every frame at hand-off can be measured for both readers. A consumer loop
+imitates ai_worker running slower than the camera (e.g. 20 fps while inference is busy).
+With --source N a real camera is opened instead; only the grabber's hand-off age can be measured there.
+Run with: python bench_grabber.py --consumer-fps 20
+"""
+
+import argparse
+import time
+from collections import deque
+
+import cv2
+
+from frame_grabber import FrameGrabber
+from utilities import percentile
+
+class QueuedCamera:
+    """Simulated camera: frames arrive at fps into a queue of queue_size; read() returns the oldest queued frame."""
+    def __init__(self, fps=30, queue_size=4, decode_ms=4.0):
+        self.fps = fps
+        self.queue = deque(maxlen=queue_size)
+        self.decode_ms = decode_ms
+        self.start = time.time()
+        self.produced = 0
+        self.current = None
+
+    def _arrive(self):
+        while self.start + self.produced / self.fps <= time.time():
+            self.queue.append(self.start + self.produced / self.fps)
+            self.produced += 1
+
+    def set(self, prop, value):
+        return False
+
+    def grab(self):
+        while True:
+            self._arrive()
+            if self.queue:
+                self.current = self.queue.popleft()
+                return True
+            time.sleep(0.001)
+
+    def retrieve(self):
+        time.sleep(self.decode_ms / 1000)
+        return True, self.current
+
+    def read(self):
+        self.grab()
+        return self.retrieve()
+
+    def release(self):
+        pass
+
+def consume(read, frames, consumer_fps):
+    """Calls read() like ai_worker would; returns the hand-off age (ms) of every frame."""
+    ages = []
+    for _ in range(frames):
+        capture_time = read()
+        if capture_time is not None:
+            ages.append((time.time() - capture_time) * 1000)
+        time.sleep(1 / consumer_fps)
+    return ages[5:]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare frame age of camera.read() and FrameGrabber.")
+    parser.add_argument("--source", type=int, default=None, help="Real camera index (default: simulated camera)")
+    parser.add_argument("--consumer-fps", type=float, default=20.0)
+    parser.add_argument("--frames", type=int, default=150)
+    parser.add_argument("--queue-size", type=int, default=4, help="Driver queue depth of the simulated camera")
+    args = parser.parse_args()
+
+    runs = {}
+    if args.source is None:
+        camera = QueuedCamera(queue_size=args.queue_size)
+        runs["camera.read()"] = consume(lambda: camera.read()[1], args.frames, args.consumer_fps)
+        camera = QueuedCamera(queue_size=args.queue_size)
+    else:
+        camera = cv2.VideoCapture(args.source)
+
+    grabber = FrameGrabber(camera).start()
+
+    def grabber_read():
+        success, frame, capture_time = grabber.read()
+        if not success:
+            return None
+        # The simulated camera's frame is its capture time; a real camera is measured from the grab
+        return frame if args.source is None else capture_time
+
+    runs["FrameGrabber"] = consume(grabber_read, args.frames, args.consumer_fps)
+    grabber.stop()                  # Releases the camera
+    print(f"grabbed {grabber.grabbed}, decoded {grabber.retrieved}, failed grabs {grabber.failures}, "
+          f"CAP_PROP_BUFFERSIZE supported: {grabber.buffer_size_supported}")
+
+    for name, ages in runs.items():
+        print(f"{name:<14} | frame age at hand-off p50 {percentile(ages, 50):6.1f} ms  p99 {percentile(ages, 99):6.1f} ms")
@@ -0,0 +1,202 @@
+"""
+Benchmark CLI for gesture recognizer models and recognizer configurations.
+It runs one or more .task models over a recorded image folder or video file and sweeps the recognizer options
+(num_hands, input resolution, running mode). For every configuration it reports per-frame inference latency
+percentiles, throughput, the recognizer's memory (peak RSS growth from just before the recognizer is created, so the
+decoded input frames held in memory are not counted) and how often the top gesture label agrees with a reference run
+(the first configuration unless --reference is given).
+Every configuration runs in its own process so peak RSS is measured in isolation.
+Usage:
+    python bench_models.py --models gesture_recognizer.task other.task --inputs recordings/session1.mp4 \\
+        --num-hands 1 2 4 --resolutions 480x320 320x240 --modes live_stream video
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import resource
+import time
+from threading import Event
+
+import cv2
+import mediapipe as mp
+
+from utilities import percentile
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+RUNNING_MODES = {
+    "image": mp.tasks.vision.RunningMode.IMAGE,
+    "video": mp.tasks.vision.RunningMode.VIDEO,
+    "live_stream": mp.tasks.vision.RunningMode.LIVE_STREAM,
+}
+
+def load_frames(inputs, max_frames):
+    """Reads BGR frames from image folders, single images or video files, in order, up to max_frames."""
+    frames = []
+    for path in inputs:
+        if os.path.isdir(path):
+            files = sorted(f for f in glob.glob(os.path.join(path, "*")) if f.lower().endswith(IMAGE_EXTENSIONS))
+            frames.extend(cv2.imread(f) for f in files)
+        elif path.lower().endswith(IMAGE_EXTENSIONS):
+            frames.append(cv2.imread(path))
+        else:
+            capture = cv2.VideoCapture(path)
+            while len(frames) < max_frames:
+                success, frame = capture.read()
+                if not success:
+                    break
+                frames.append(frame)
+            capture.release()
+        if len(frames) >= max_frames:
+            break
+    return [f for f in frames if f is not None][:max_frames]
+
+def current_rss_mb():
+    """Resident set size of this process right now, in MB (Linux /proc; falls back to the peak elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def top_label(result):
+    """Top gesture of the first detected hand, or "-" when no hand was found."""
+    if result and result.gestures:
+        return result.gestures[0][0].category_name
+    return "-"
+
+def run_config(config, inputs, max_frames, warmup):
+    """
+    Runs one configuration (executed in a child process).
+    Returns a dict with per-frame latencies (ms), labels, elapsed time and the recognizer's peak RSS growth (MB).
+    """
+    width, height = config["resolution"]
+    frames = [cv2.cvtColor(cv2.resize(f, (width, height)), cv2.COLOR_BGR2RGB) for f in load_frames(inputs, max_frames)]
+    images = [mp.Image(image_format=mp.ImageFormat.SRGB, data=f) for f in frames]
+    mode = config["mode"]
+
+    # LIVE_STREAM mirrors main.py: one frame in flight, latency measured from submit to callback
+    done = Event()
+    live_result = {}
+
+    def on_result(result, image, timestamp_ms):
+        live_result["result"] = result
+        live_result["t"] = time.perf_counter()
+        done.set()
+
+    options = mp.tasks.vision.GestureRecognizerOptions(
+        base_options=mp.tasks.BaseOptions(model_asset_path=config["model"]),
+        num_hands=config["num_hands"],
+        running_mode=RUNNING_MODES[mode],
+        result_callback=on_result if mode == "live_stream" else None
+    )
+    rss_before = current_rss_mb()          # The input frames are already loaded, so they are not counted
+    recogniser = mp.tasks.vision.GestureRecognizer.create_from_options(options)
+
+    latencies, labels = [], []
+    timestamp_ms = 0
+    start = None
+    for i, image in enumerate(images[:warmup] + images):
+        if i == warmup:
+            start = time.perf_counter()
+        timestamp_ms += 33
+        t0 = time.perf_counter()
+        if mode == "image":
+            result = recogniser.recognize(image)
+            t1 = time.perf_counter()
+        elif mode == "video":
+            result = recogniser.recognize_for_video(image, timestamp_ms)
+            t1 = time.perf_counter()
+        else:
+            done.clear()
+            recogniser.recognize_async(image, timestamp_ms)
+            done.wait(5.0)
+            result, t1 = live_result.get("result"), live_result.get("t", time.perf_counter())
+        if i >= warmup:
+            latencies.append((t1 - t0) * 1000)
+            labels.append(top_label(result))
+    elapsed = time.perf_counter() - start if start else 0.0
+    recogniser.close()
+
+    return {
+        "latencies": latencies,
+        "labels": labels,
+        "elapsed": elapsed,
+        "recognizer_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - rss_before,
+    }
+
+def _child(config, inputs, max_frames, warmup, out_queue):
+    try:
+        out_queue.put(run_config(config, inputs, max_frames, warmup))
+    except Exception as e:
+        out_queue.put({"error": str(e)})
+
+def run_isolated(config, inputs, max_frames, warmup):
+    """Runs a configuration in a fresh process so its peak RSS is not inflated by earlier runs."""
+    ctx = multiprocessing.get_context("spawn")
+    out_queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(config, inputs, max_frames, warmup, out_queue))
+    process.start()
+    result = out_queue.get()
+    process.join()
+    return result
+
+def config_name(config):
+    width, height = config["resolution"]
+    return f"{os.path.basename(config['model'])}:{config['mode']}:hands={config['num_hands']}:{width}x{height}"
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark gesture recognizer models and options on recorded input.")
+    parser.add_argument("--models", nargs="+", required=True, help="One or more .task model files")
+    parser.add_argument("--inputs", nargs="+", required=True, help="Image folders, images or video files")
+    parser.add_argument("--num-hands", nargs="+", type=int, default=[4])
+    parser.add_argument("--resolutions", nargs="+", type=parse_resolution, default=[(480, 320)], help="WIDTHxHEIGHT")
+    parser.add_argument("--modes", nargs="+", choices=sorted(RUNNING_MODES), default=["live_stream"])
+    parser.add_argument("--max-frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10, help="Frames run before measuring")
+    parser.add_argument("--reference", default=None, help="Configuration name to compare labels against (default: first run)")
+    parser.add_argument("--json", default=None, help="Also write the full results to this file")
+    args = parser.parse_args()
+
+    configs = [
+        {"model": model, "mode": mode, "num_hands": hands, "resolution": resolution}
+        for model in args.models
+        for mode in args.modes
+        for hands in args.num_hands
+        for resolution in args.resolutions
+    ]
+
+    results = {}
+    for config in configs:
+        name = config_name(config)
+        print(f"Running {name} ...", flush=True)
+        results[name] = run_isolated(config, args.inputs, args.max_frames, args.warmup)
+        if "error" in results[name]:
+            print(f"  failed: {results[name]['error']}")
+
+    valid = {name: r for name, r in results.items() if "error" not in r}
+    if not valid:
+        raise SystemExit("No configuration completed.")
+    reference = args.reference if args.reference in valid else next(iter(valid))
+    ref_labels = valid[reference]["labels"]
+
+    print(f"\nReference for label agreement: {reference}")
+    print(f"{'configuration':<58} {'p50':>7} {'p90':>7} {'p99':>7} {'fps':>7} {'RSS +MB':>8} {'agree':>7}")
+    for name, r in valid.items():
+        lat = r["latencies"]
+        fps = len(lat) / r["elapsed"] if r["elapsed"] else 0.0
+        pairs = list(zip(r["labels"], ref_labels))
+        agreement = sum(a == b for a, b in pairs) / len(pairs) if pairs else 0.0
+        r["agreement"] = agreement
+        print(f"{name:<58} {percentile(lat, 50):7.1f} {percentile(lat, 90):7.1f} {percentile(lat, 99):7.1f} "
+              f"{fps:7.1f} {r['recognizer_rss_mb']:8.0f} {agreement:7.1%}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"reference": reference, "results": results}, f, indent=2)
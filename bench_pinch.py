@@ -0,0 +1,108 @@
+"""
+Replay benchmark for the pinch logic in gesture_processor_logic.py, comparing the threshold-only behaviour with the
+predictive mode. Synthetic pinch traces (30 fps landmarks with tremor noise) are fed through GestureProcessor.process_result
+with replayed timestamps:
+- move: Pinch, hold, then move along one axis. The expected command is known; the time from movement onset to the
+  first command is measured, and a command in the wrong direction counts as an error.
+- hold / hesitate / reverse: Pinch held still, a short movement that stops below the threshold, or one that turns back.
+  Any command is a false trigger.
+Commands are counted from process_result's return value; nothing is sent to VLC.
+Run with: python bench_pinch.py --traces 300 --lead-ms 80
+"""
+
+import argparse
+import random
+from types import SimpleNamespace
+
+import gesture_processor_logic
+from gesture_processor_logic import GestureProcessor
+from utilities import percentile
+
+FPS = 30
+EXPECTED = {("vertical", 1): "Volume Up", ("vertical", -1): "Volume Down",
+            ("horizontal", 1): "Seek Forward", ("horizontal", -1): "Seek Backward"}
+
+def make_result(cx, cy, rng, noise):
+    """One-hand recognizer result with a closed pinch centred on (cx, cy)."""
+    jitter = lambda: rng.gauss(0, noise)
+    landmarks = [SimpleNamespace(x=cx + jitter(), y=cy + 0.15 + jitter()) for _ in range(21)]
+    landmarks[9] = SimpleNamespace(x=cx + jitter(), y=cy - 0.05 + jitter())          # Hand size 0.2
+    landmarks[4] = SimpleNamespace(x=cx - 0.005 + jitter(), y=cy + jitter())         # Thumb tip
+    landmarks[8] = SimpleNamespace(x=cx + 0.005 + jitter(), y=cy + jitter())         # Index tip
+    return SimpleNamespace(
+        gestures=[[SimpleNamespace(category_name="None", score=0.9)]],
+        handedness=[[SimpleNamespace(category_name="Left")]],
+        hand_landmarks=[landmarks],
+    )
+
+def make_trace(kind, rng, noise):
+    """
+    Returns (expected_label, onset_time, [(t, cx, cy), ...]).
+    Positive movement along an axis (the way dx/dy are measured from the pinch start) is a decreasing coordinate.
+    """
+    axis = rng.choice(["vertical", "horizontal"])
+    sign = rng.choice([-1, 1])
+    speed = rng.uniform(0.25, 1.0)
+    hold = rng.uniform(0.2, 0.5)
+    x0, y0 = rng.uniform(0.35, 0.65), rng.uniform(0.35, 0.65)
+    if kind == "move":
+        path = lambda t: min(speed * max(0.0, t - hold), 0.2)
+    elif kind == "hold":
+        path = lambda t: 0.0
+    elif kind == "hesitate":
+        stop = rng.uniform(0.03, 0.055)
+        path = lambda t: min(speed * max(0.0, t - hold), stop)
+    else:  # reverse
+        turn = rng.uniform(0.03, 0.05)
+        path = lambda t: max(0.0, turn - abs(turn - speed * max(0.0, t - hold)))
+    points = []
+    for f in range(int((hold + 1.2) * FPS)):
+        t = f / FPS
+        offset = -sign * path(t)
+        points.append((t, x0 + offset, y0) if axis == "horizontal" else (t, x0, y0 + offset))
+    expected = EXPECTED[(axis, sign)] if kind == "move" else None
+    return expected, hold, points
+
+def replay(trace, predictive, lead, rng, noise):
+    """Returns (first command label or None, time of first command)."""
+    processor = GestureProcessor()
+    processor.isSystemOn = True
+    processor.predictive_pinch = predictive
+    processor.pipeline_latency = lead
+    for t, cx, cy in trace:
+        label = processor.process_result(make_result(cx, cy, rng, noise), now=1000.0 + t)
+        if label:
+            return label, t
+    return None, None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare threshold and predictive pinch triggering on replayed traces.")
+    parser.add_argument("--traces", type=int, default=300)
+    parser.add_argument("--lead-ms", type=float, default=80.0, help="Pipeline latency used for extrapolation")
+    parser.add_argument("--noise", type=float, default=0.002, help="Landmark jitter (normalised units)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gesture_processor_logic.async_typer = lambda key: None          # Count commands without sending them
+    rng = random.Random(args.seed)
+    traces = [make_trace(rng.choice(["move", "move", "hold", "hesitate", "reverse"]), rng, args.noise)
+              for _ in range(args.traces)]
+
+    for name, predictive in (("threshold", False), ("predictive", True)):
+        replay_rng = random.Random(args.seed + 1)                   # Same landmark noise for both modes
+        delays, wrong, missed, false_triggers, idle = [], 0, 0, 0, 0
+        for expected, onset, points in traces:
+            label, t = replay(points, predictive, args.lead_ms / 1000, replay_rng, args.noise)
+            if expected is None:
+                idle += 1
+                false_triggers += label is not None
+            elif label is None:
+                missed += 1
+            elif label != expected:
+                wrong += 1
+            else:
+                delays.append((t - onset) * 1000)
+        moves = len(traces) - idle
+        print(f"{name:<10} | time to first command p50 {percentile(delays, 50):6.1f} ms  p90 {percentile(delays, 90):6.1f} ms | "
+              f"missed {missed}/{moves}  wrong direction {wrong}/{moves} | false triggers {false_triggers}/{idle} "
+              f"({false_triggers / max(idle, 1):.1%})")
@@ -0,0 +1,104 @@
+"""
+Benchmark of recognizer pool sizes (recognizer_pool.py).
+The real RecognizerPool and InFlightCounter are driven by simulated recognizers in virtual time: a 30 fps camera offers
+frames, ai_worker submits one whenever a pool slot is free, and every inference needs inference-ms of work on
+`parallelism` cores. Like a MediaPipe graph, each simulated instance works through its frames one at a time, so a
+frame handed to a busy instance waits behind the one it is running. When the concurrent inferences ask for more cores
+than the board has they are slowed down proportionally, and each extra concurrent inference costs `contention` on top
+(shared caches and memory bandwidth).
+Inference times vary by `jitter`, so results can finish out of order and get dropped by the pool.
+For each pool size it reports the inference FPS (published results per second), the capture-to-result latency of
+published results, and the dropped results. On the Pi, the same numbers are shown live as "Inference FPS" and
+"AI Latency" on the main page while switching "Recognizer Pool" on the settings page.
+Run with: python bench_pool.py --cores 4 --inference-ms 60
+"""
+
+import argparse
+import random
+from collections import deque
+
+from recognizer_pool import MAX_POOL_SIZE, RecognizerPool
+from shared_state import InFlightCounter
+from utilities import percentile
+
+TICK = 0.0005
+
+class SimulatedRecognizer:
+    """Stands in for a LIVE_STREAM recognizer: queues frames in order and calls back as each one finishes."""
+    def __init__(self, sim, callback):
+        self.sim = sim
+        self.callback = callback
+        self.jobs = deque()         # [remaining work, timestamp_us]; only the first one is running
+        sim.recognizers.append(self)
+
+    def recognize_async(self, image, timestamp_us):
+        work = self.sim.inference * max(0.2, self.sim.rng.gauss(1.0, self.sim.jitter))
+        self.jobs.append([work, timestamp_us])
+
+    def close(self):
+        pass
+
+class Simulation:
+    def __init__(self, args, seed):
+        self.rng = random.Random(seed)
+        self.inference = args.inference_ms / 1000
+        self.jitter = args.jitter
+        self.cores = args.cores
+        self.parallelism = args.parallelism
+        self.contention = args.contention
+        self.recognizers = []
+        self.now = 0.0
+
+    def step(self):
+        """Advances the running inference of every busy instance by one tick; returns (timestamp_us, callback) of those that finished."""
+        busy = [recognizer for recognizer in self.recognizers if recognizer.jobs]
+        if not busy:
+            return []
+        running = len(busy)
+        speed = min(1.0, self.cores / (running * self.parallelism)) / (1 + self.contention * (running - 1))
+        finished = []
+        for recognizer in busy:
+            job = recognizer.jobs[0]
+            job[0] -= TICK * speed
+            if job[0] <= 0:
+                recognizer.jobs.popleft()
+                finished.append((job[1], recognizer.callback))
+        return finished
+
+def run(size, args):
+    sim = Simulation(args, args.seed)
+    in_flight = InFlightCounter(size)
+    latencies = []
+    on_result = lambda result, image, timestamp_us: latencies.append((sim.now - timestamp_us / 1e6) * 1000)
+    pool = RecognizerPool(lambda callback: SimulatedRecognizer(sim, callback), size,
+                          on_result=on_result, on_done=in_flight.release)
+
+    next_frame = 0.0
+    while sim.now < args.seconds:
+        if sim.now >= next_frame:
+            next_frame += 1 / args.fps
+            if in_flight.try_acquire() and not pool.submit(None, int(sim.now * 1e6)):
+                in_flight.release()
+        sim.now += TICK
+        for timestamp_us, callback in sim.step():
+            callback(object(), None, timestamp_us)
+    pool.close()
+    return pool, latencies
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare inference FPS and latency of recognizer pool sizes.")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fps", type=float, default=30.0, help="Camera frame rate")
+    parser.add_argument("--inference-ms", type=float, default=60.0, help="Inference time of a single frame on an idle board")
+    parser.add_argument("--cores", type=float, default=4.0)
+    parser.add_argument("--parallelism", type=float, default=1.3, help="Cores one inference keeps busy")
+    parser.add_argument("--contention", type=float, default=0.1, help="Slowdown per extra concurrent inference")
+    parser.add_argument("--jitter", type=float, default=0.15, help="Relative standard deviation of inference time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in range(1, MAX_POOL_SIZE + 1):
+        pool, latencies = run(size, args)
+        print(f"pool {size} | inference {pool.published / args.seconds:5.1f} fps | capture to result p50 "
+              f"{percentile(latencies, 50):6.1f} ms  p99 {percentile(latencies, 99):6.1f} ms | "
+              f"submitted {pool.submitted}  dropped {pool.dropped}")
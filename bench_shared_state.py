@@ -0,0 +1,150 @@
+"""
+Benchmark of the state sharing between the AI worker, the recognizer callback and the GUI.
+It replays main.py's access pattern (30 fps worker loop, result callbacks, 10 Hz GUI refresh) for a few seconds
+against the old single-Lock SharedState and against the snapshot version in shared_state.py, whose only lock is the
+in-flight counter's.
+It reports lock acquisitions per second and how long each thread spent getting at the shared data.
+Run with: python bench_shared_state.py --seconds 5
+"""
+
+import argparse
+import time
+from threading import Lock, Thread
+
+from shared_state import SharedState
+from utilities import percentile
+
+class CountingLock:
+    """Lock that counts its acquisitions (the counter is only touched while the lock is held)."""
+    def __init__(self):
+        self.inner = Lock()
+        self.acquisitions = 0
+
+    def __enter__(self):
+        self.inner.acquire()
+        self.acquisitions += 1
+
+    def __exit__(self, *exc):
+        self.inner.release()
+
+class LockedState:
+    """The previous SharedState: every field guarded by one Lock, ai_busy as the in-flight gate."""
+    def __init__(self):
+        self.latest_result = None
+        self.current_action = "Idle"
+        self.lock = CountingLock()
+        self.ai_busy = False
+        self.ai_latency_ms = 0
+        self.frame_capture_time = 0
+        self.settings = {}
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+def run_locked(seconds, period, inference_ms):
+    state = LockedState()
+    access = {"worker": [], "callback": [], "gui": []}
+    stop = time.perf_counter() + seconds
+
+    def callback():
+        t0 = time.perf_counter()
+        with state.lock:
+            state.latest_result = object()
+            state.ai_latency_ms = inference_ms
+            state.ai_busy = False
+        access["callback"].append((time.perf_counter() - t0) * 1000)
+
+    def worker():
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            with state.lock:
+                res, settings = state.latest_result, state.settings
+            cost = time.perf_counter() - t0
+            busy(2)                                     # process_frame
+            t0 = time.perf_counter()
+            with state.lock:
+                state.current_action = "Volume Up"
+                state.frame_capture_time = time.time()
+            can_send = False
+            with state.lock:
+                if not state.ai_busy:
+                    state.ai_busy = True
+                    can_send = True
+            access["worker"].append((cost + time.perf_counter() - t0) * 1000)
+            if can_send:
+                Thread(target=lambda: (time.sleep(inference_ms / 1000), callback())).start()
+            time.sleep(period)
+
+    def gui():
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            with state.lock:
+                values = (state.latest_result, state.current_action, state.ai_latency_ms, state.frame_capture_time)
+            access["gui"].append((time.perf_counter() - t0) * 1000)
+            time.sleep(0.1)
+
+    threads = [Thread(target=worker), Thread(target=gui)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return state.lock.acquisitions, access
+
+def run_snapshots(seconds, period, inference_ms):
+    state = SharedState()
+    state.in_flight._lock = CountingLock()
+    state.publish_settings({})
+    access = {"worker": [], "callback": [], "gui": []}
+    stop = time.perf_counter() + seconds
+
+    def callback():
+        t0 = time.perf_counter()
+        state.publish_result(object(), inference_ms, 0)
+        state.in_flight.release()
+        access["callback"].append((time.perf_counter() - t0) * 1000)
+
+    def worker():
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            res, settings = state.result, state.settings
+            cost = time.perf_counter() - t0
+            busy(2)
+            t0 = time.perf_counter()
+            state.publish_frame(time.time())
+            state.publish_decision("Volume Up", True)
+            can_send = state.in_flight.try_acquire()
+            access["worker"].append((cost + time.perf_counter() - t0) * 1000)
+            if can_send:
+                Thread(target=lambda: (time.sleep(inference_ms / 1000), callback())).start()
+            time.sleep(period)
+
+    def gui():
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            result, frame = state.result, state.frame
+            access["gui"].append((time.perf_counter() - t0) * 1000)
+            time.sleep(0.1)
+
+    threads = [Thread(target=worker), Thread(target=gui)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return state.in_flight._lock.acquisitions, access
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the single-lock and snapshot shared state.")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--inference-ms", type=float, default=60.0)
+    args = parser.parse_args()
+
+    for name, run in (("Lock", run_locked), ("Snapshots", run_snapshots)):
+        acquisitions, access = run(args.seconds, 1 / args.fps, args.inference_ms)
+        print(f"{name:<10} | lock acquisitions {acquisitions / args.seconds:6.1f}/s")
+        for thread, times in access.items():
+            if times:
+                print(f"{'':<10} | {thread:<8} access p50 {percentile(times, 50) * 1000:7.1f} us  "
+                      f"p99 {percentile(times, 99) * 1000:7.1f} us  max {max(times) * 1000:7.1f} us")
@@ -0,0 +1,116 @@
+"""
+Replay benchmark for the swipe detector in motion_gestures.py.
+It replays hand-position traces frame by frame through SwipeDetector and reports detection accuracy
+(hits, misses, wrong direction, false triggers) and the per-frame cost of update() for several history sizes.
+Traces are synthetic by default (swipes at various speeds, resting jitter, slow drift, vertical waves).
+A recorded trace can be replayed instead with --trace file.csv, one "timestamp,hand,x,y,label" row per frame,
+where label is the expected gesture for the segment ("Swipe_Left", "Swipe_Right" or empty).
+Run with: python bench_swipe.py
+"""
+
+import argparse
+import csv
+import random
+import time
+
+from motion_gestures import SWIPE_LEFT, SWIPE_RIGHT, SwipeDetector
+from utilities import percentile
+
+FPS = 30
+
+def synthetic_segments(count, seed=0):
+    """
+    Builds a list of trace segments. Each segment is (expected_label, [(t, hand, x, y), ...]) with timestamps
+    relative to the segment start; expected_label is None for segments that must not trigger a swipe.
+    """
+    rng = random.Random(seed)
+    segments = []
+    for i in range(count):
+        kind = rng.choice(["swipe", "swipe", "rest", "drift", "vertical"])
+        hand = rng.choice(["Left", "Right"])
+        noise = lambda: rng.gauss(0, 0.004)
+        frames = []
+        if kind == "swipe":
+            direction = rng.choice([-1, 1])
+            duration = rng.uniform(0.15, 0.35)
+            distance = rng.uniform(0.3, 0.5)
+            x0 = 0.5 - direction * distance / 2
+            steps = max(2, int(duration * FPS))
+            for f in range(steps + 6):
+                progress = min(1.0, f / steps)
+                frames.append((f / FPS, hand, x0 + direction * distance * progress + noise(), 0.5 + noise()))
+            label = SWIPE_RIGHT if direction < 0 else SWIPE_LEFT
+        elif kind == "rest":
+            for f in range(30):
+                frames.append((f / FPS, hand, 0.5 + noise(), 0.5 + noise()))
+            label = None
+        elif kind == "drift":
+            speed = rng.uniform(-0.3, 0.3)           # Slow repositioning, well under swipe speed
+            for f in range(45):
+                frames.append((f / FPS, hand, 0.5 + speed * f / FPS + noise(), 0.5 + noise()))
+            label = None
+        else:
+            direction = rng.choice([-1, 1])
+            for f in range(12):
+                frames.append((f / FPS, hand, 0.5 + noise(), 0.3 + direction * 0.04 * f + noise()))
+            label = None
+        segments.append((label, frames))
+    return segments
+
+def load_trace(path):
+    """Loads a recorded CSV trace and groups consecutive rows with the same label into segments."""
+    segments = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith("#"):
+                continue
+            t, hand, x, y = float(row[0]), row[1], float(row[2]), float(row[3])
+            label = row[4] if len(row) > 4 and row[4] else None
+            if not segments or segments[-1][0] != label:
+                segments.append((label, []))
+            segments[-1][1].append((t, hand, x, y))
+    return segments
+
+def replay(segments, capacity=16):
+    """Replays segments back to back. Returns (accuracy counters, per-update times in microseconds)."""
+    detector = SwipeDetector(capacity=capacity)
+    counts = {"hits": 0, "misses": 0, "wrong_direction": 0, "false_triggers": 0}
+    timings = []
+    offset = 0.0
+    for label, frames in segments:
+        detected = []
+        base = frames[0][0]
+        for t, hand, x, y in frames:
+            t0 = time.perf_counter()
+            swipe = detector.update(hand, offset + (t - base), x, y)
+            timings.append((time.perf_counter() - t0) * 1e6)
+            if swipe:
+                detected.append(swipe)
+        offset += (frames[-1][0] - base) + 1.0     # Gap between segments clears the refractory period and the window
+        if label is None:
+            counts["false_triggers"] += len(detected)
+        elif label in detected:
+            counts["hits"] += 1
+            counts["false_triggers"] += len(detected) - 1
+        elif detected:
+            counts["wrong_direction"] += 1
+        else:
+            counts["misses"] += 1
+    return counts, timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay hand traces through the swipe detector.")
+    parser.add_argument("--segments", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace", default=None, help="CSV trace to replay instead of the synthetic one")
+    args = parser.parse_args()
+
+    segments = load_trace(args.trace) if args.trace else synthetic_segments(args.segments, args.seed)
+    expected = sum(1 for label, _ in segments if label)
+    print(f"{len(segments)} segments, {expected} swipes, {sum(len(f) for _, f in segments)} frames")
+
+    for capacity in (8, 16, 32, 64):
+        counts, timings = replay(segments, capacity)
+        print(f"capacity {capacity:>3} | update p50 {percentile(timings, 50):6.2f} us | p99 {percentile(timings, 99):6.2f} us | "
+              f"hits {counts['hits']}/{expected} | misses {counts['misses']} | wrong dir {counts['wrong_direction']} | "
+              f"false triggers {counts['false_triggers']}")
@@ -0,0 +1,134 @@
+"""
+Freshest-frame camera reader.
+cv2.VideoCapture on V4L2 queues several frames in the driver, so a plain camera.read() often returns a frame that was
+captured 50-100 ms earlier. FrameGrabber keeps the driver queue drained from a background thread by calling grab()
+continuously (cheap: no decode), and only decodes with retrieve() when a consumer asks for a frame, so the consumer
+always gets the frame captured right after it asked.
+All VideoCapture calls (grab, retrieve, set) happen on the grabber thread, as VideoCapture is not thread-safe.
+When the camera hangs, reopen() swaps in a newly opened camera on a new grab thread, with every property set through
+set() applied again; the old thread is abandoned and releases its camera if grab() ever returns.
+Every grab thread owns the camera it was started with and is the only one to release it, so a camera is never released
+while grab() is still running on it.
+"""
+
+import time
+from collections import deque
+from threading import Event, Thread
+
+import cv2
+
+from thread_placement import placement
+
+class FrameGrabber:
+    """
+    Wraps an opened cv2.VideoCapture.
+    - start() / stop(): Run and stop the grab thread. stop() waits up to timeout seconds for the thread to finish,
+      which releases the current camera; a thread still blocked in grab() releases it once grab() returns.
+    - read(timeout): Blocks until the next grabbed frame is decoded. Returns (success, frame, capture_time), with
+      capture_time in time.time() seconds taken when grab() returned.
+    - set(prop, value): Queues a capture property change, applied by the grab thread between grabs. It is remembered
+      and applied again to a reopened camera.
+    - reopen(camera): Replaces a hung or failing camera with a newly opened one (called by the watchdog).
+    Counters: grabbed (frames pulled from the driver), retrieved (frames decoded), failures (failed grabs), reopens.
+    last_age_ms is the age of the latest handed-off frame (capture to hand-off) in milliseconds.
+    last_grab is the time.perf_counter() of the latest successful grab (the watchdog's frame heartbeat).
+    """
+    def __init__(self, camera, buffer_size=1):
+        self.camera = camera
+        self.buffer_size = buffer_size
+        self.buffer_size_supported = bool(camera.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size))
+        if not self.buffer_size_supported:
+            print("Frame grabber: capture backend ignores CAP_PROP_BUFFERSIZE, relying on continuous grabbing")
+
+        self.grabbed = 0
+        self.retrieved = 0
+        self.failures = 0
+        self.reopens = 0
+        self.last_age_ms = 0.0
+        self.last_grab = time.perf_counter()
+
+        self._running = False
+        self._thread = None
+        self._generation = 0
+        self._wanted = Event()
+        self._ready = Event()
+        self._handoff = (False, None, 0.0)
+        self._pending_settings = deque()
+        self._properties = {}
+
+    def start(self):
+        self._running = True
+        self._start_thread()
+        return self
+
+    def _start_thread(self):
+        self._thread = Thread(target=self._run, args=(self._generation, self.camera), name="frame_grabber", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """
+        Returns:
+            bool: True if the grab thread finished and released its camera within timeout.
+        """
+        self._running = False
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def set(self, prop, value):
+        self._properties[prop] = value
+        self._pending_settings.append((prop, value))
+
+    def reopen(self, camera):
+        """Grabs from camera (already opened) on a new thread from now on. The old thread stops after its current grab()."""
+        camera.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        for prop, value in list(self._properties.items()):     # No grab thread uses the new camera yet
+            camera.set(prop, value)
+        self._generation += 1
+        self.camera = camera
+        self.last_grab = time.perf_counter()
+        self.reopens += 1
+        self._start_thread()
+
+    def read(self, timeout=1.0):
+        self._ready.clear()             # Drop a hand-off left over from an earlier read() that timed out
+        self._wanted.set()
+        if not self._ready.wait(timeout):
+            return False, None, 0.0
+        self._ready.clear()
+        success, frame, capture_time = self._handoff
+        if success:
+            self.last_age_ms = (time.time() - capture_time) * 1000
+        return success, frame, capture_time
+
+    def _run(self, generation, camera):
+        while self._running and generation == self._generation:
+            placement.apply("frame_grabber")
+            while self._pending_settings:
+                prop, value = self._pending_settings.popleft()
+                camera.set(prop, value)
+
+            success = camera.grab()
+            capture_time = time.time()
+            if generation != self._generation:      # Replaced by reopen() while grab() was blocked
+                break
+            if not success:
+                self.failures += 1
+                if self._wanted.is_set():           # Let the consumer see the failure instead of timing out
+                    self._wanted.clear()
+                    self._handoff = (False, None, capture_time)
+                    self._ready.set()
+                time.sleep(0.005)
+                continue
+            self.grabbed += 1
+            self.last_grab = time.perf_counter()
+
+            if self._wanted.is_set():
+                self._wanted.clear()
+                success, frame = camera.retrieve()
+                self.retrieved += success
+                self._handoff = (success, frame, capture_time)
+                self._ready.set()
+
+        camera.release()                            # Stopped, or replaced by reopen(): this thread owns the camera
@@ -3,14 +3,105 @@ The GestureProcessor class encapsulates the core logic for interpreting hand ges
 It processes the gesture recognition results, applies user preferences and cooldowns, and executes corresponding media commands through the input_handler.py.
 """
 
+from collections import deque
 from math import sqrt
 import cv2
+import numpy as np
 import time
 from OneEuroFilter import OneEuroFilter
 from input_handler import async_typer
+from landmark_classifier import LandmarkClassifier, landmarks_to_array, normalise_landmarks
+from motion_gestures import SWIPE_LEFT, SWIPE_RIGHT, SwipeDetector
 from utilities import GestureCooldown
 
+class DispatchRule:
+    """
+    One compiled entry of the gesture dispatch table.
+    - action: The action name as shown in the settings page (e.g. "Play/Pause").
+    - handler: Bound GestureProcessor method called as handler(rule); returns the action label or None.
+    - cooldown: The GestureCooldown shared by this action.
+    - command: The key passed to async_typer.
+    - label: Text shown on the main page when the action fires.
+    - hand: Required handedness ("Left"/"Right") or None for any hand.
+    - min_score: Minimum gesture confidence for the rule to match.
+    - always_active: True if the rule fires even while the system is switched off.
+    """
+    __slots__ = ("action", "handler", "cooldown", "command", "label", "hand", "min_score", "always_active")
+
+    def __init__(self, action, handler, cooldown, command, label, hand=None, min_score=0.0, always_active=False):
+        self.action = action
+        self.handler = handler
+        self.cooldown = cooldown
+        self.command = command
+        self.label = label
+        self.hand = hand
+        self.min_score = min_score
+        self.always_active = always_active
+
+RULE_HANDS = (None, "Left", "Right", "Both / No Preference")
+
+def rule_error(rule):
+    """
+    Checks one user gesture rule before it is compiled.
+    A rule must be a dictionary with a known discrete action, a string gesture, a hand of None, "Left" or "Right" and,
+    optionally, a numeric min_score.
+    Returns:
+        str or None: Why the rule is invalid, or None if it is valid.
+    """
+    if not isinstance(rule, dict):
+        return "not a dictionary"
+    if rule.get("action") not in GestureProcessor.DISCRETE_ACTIONS:
+        return f"unknown action {rule.get('action')!r}"
+    if not isinstance(rule.get("gesture"), str):
+        return "gesture must be a string"
+    if rule.get("hand") not in RULE_HANDS:
+        return f"hand must be \"Left\", \"Right\" or null, not {rule.get('hand')!r}"
+    min_score = rule.get("min_score", 0.0)
+    if isinstance(min_score, bool) or not isinstance(min_score, (int, float)):
+        return f"min_score must be a number, not {min_score!r}"
+    return None
+
 class GestureProcessor:
+    # Discrete actions: action -> (handler method, cooldown attribute, command key, label)
+    DISCRETE_ACTIONS = {
+        "System Toggle": ("_fire_system_toggle", "toggle_cooldown", "`", None),
+        "Mute Toggle": ("_fire_mute_toggle", "toggle_cooldown", "m", None),
+        "Play/Pause": ("_fire_key", "toggle_cooldown", "space", "Play/Pause"),
+        "Next Track": ("_fire_key", "toggle_cooldown", "next", "Next track"),
+        "Previous Track": ("_fire_key", "toggle_cooldown", "prev", "Previous track"),
+    }
+    # Continuous actions driven by pinch movement: action -> (cooldown attribute, (positive key, label), (negative key, label))
+    PINCH_ACTIONS = {
+        "Volume up/down": ("pinch_cooldown", ("up", "Volume Up"), ("down", "Volume Down")),
+        "Seek forward/backward": ("seeker_cooldown", ("right", "Seek Forward"), ("left", "Seek Backward")),
+    }
+    # Pinch pseudo-gestures and the movement axis they stand for
+    PINCH_GESTURES = {"Pinch up/down": "vertical", "Pinch left/right": "horizontal"}
+
+    UI_TO_INTERNAL = {
+        "Open palm": "Open_Palm",
+        "Victory": "Victory",
+        "Pointing up": "Pointing_Up",
+        "Fist": "Closed_Fist",
+        "Thumb up": "Thumb_Up",
+        "Thumb down": "Thumb_Down",
+        "Pinch up/down": "Pinch up/down",
+        "Pinch left/right": "Pinch left/right",
+        "Swipe left": SWIPE_LEFT,
+        "Swipe right": SWIPE_RIGHT
+    }
+    MOTION_GESTURES = {SWIPE_LEFT, SWIPE_RIGHT}
+
+    # Pinch movement (from the pinch start, in normalised image units) that fires a volume/seek step
+    PINCH_TRIGGER = 0.07
+    # Predictive pinch: an early decision needs this fraction of PINCH_TRIGGER already covered, at least this filtered
+    # speed (units/s) towards the predicted crossing, and the dominant axis this many times the other one.
+    # Tuned with bench_pinch.py for no false triggers on hesitations and reversals below the threshold.
+    PREDICT_MIN_FRACTION = 0.6
+    PREDICT_MIN_SPEED = 0.2           # Speed of the filtered pinch point, which lags the raw landmarks
+    PREDICT_AXIS_RATIO = 2.0
+    PREDICT_MAX_LEAD = 0.15         # Seconds; longer latencies are not extrapolated further
+
     def __init__(self):
         # State Initialization
         self.pinch_start_coords = None
@@ -18,6 +109,12 @@ class GestureProcessor:
         self.base_volume_sensitivity = 0.5
         self.isSystemOn = False
         self.isMuted = False
+        self.power_requests = deque()       # System on/off requests from the GUI thread, applied in process_result
+        self.overlay = None                 # (wrist, pinch start, current pinch) of the latest decision, for draw_overlay
+        self.settings_version = 0           # Version of the SharedState settings snapshot last applied
+        self.predictive_pinch = False
+        self.pipeline_latency = 0.08        # Seconds from capture to decision, kept up to date by main.py
+        self._last_pinch = None             # (x, y, t) of the previous filtered pinch point, for the pinch velocity
         
         # Default Settings
         self.user_hand_preference = "Left"
@@ -28,8 +125,8 @@ class GestureProcessor:
             "Play/Pause": "Pointing_Up",
             "Mute Toggle": "Closed_Fist",
             "Seek forward/backward": "Pinch left/right",
-            "Next Track": "Thumb_Up",
-            "Previous Track": "Thumb_Down",
+            "Next Track": SWIPE_RIGHT,
+            "Previous Track": SWIPE_LEFT,
             'Volume up/down': "Pinch up/down",
             "Rest": "Open_Palm"
         }
@@ -45,9 +142,25 @@ class GestureProcessor:
         self.filter_x = OneEuroFilter(freq=30, mincutoff=1.0, beta=0.5, dcutoff=1.0)
         self.filter_y = OneEuroFilter(freq=30, mincutoff=1.0, beta=0.5, dcutoff=1.0)
 
+        # Custom landmark poses enrolled with landmark_classifier.py (None when nothing is enrolled)
+        self.custom_classifier = LandmarkClassifier.load()
+        self.custom_gestures = set(self.custom_classifier.label_names) if self.custom_classifier else set()
+        self._custom_result = None
+        self._custom_labels = []
+
+        # Motion gestures detected from the recent history of the palm position
+        self.swipe_detector = SwipeDetector()
+
+        # Compiled dispatch state, rebuilt by compile_dispatch() whenever the configuration changes
+        self.rules = []
+        self.dispatch = {}
+        self.pinch_axes = {}
+        self.motion_enabled = False
+        self.compile_dispatch()
+
     def update_config(self, config):
         """
-        Updates internal variables based on a settings dictionary.
+        Updates internal variables based on a settings dictionary and recompiles the dispatch table.
         Expected config format:
         {
             "hand_preference": "Left" / "Right" / "Both / No Preference",
@@ -60,7 +173,12 @@ class GestureProcessor:
                 "System Toggle": "Victory",
                 "Play/Pause": "Pointing up",
                 ...
-            }
+            },
+            "rules": [          # Optional, checked before the plain gesture mappings
+                {"action": "Next Track", "gesture": "Thumb up", "hand": "Right", "min_score": 0.8},
+                ...
+            ],
+            "predictive_pinch": False
         }
         Output:
             Prints the updated configuration for verification.
@@ -74,25 +192,87 @@ class GestureProcessor:
             self.pinch_cooldown.limit = cooldowns["Volume cooldown"]
         if "Seekbar cooldown" in cooldowns:
             self.seeker_cooldown.limit = cooldowns["Seekbar cooldown"]
-            
-        ui_to_internal = {
-            "Open palm": "Open_Palm",
-            "Victory": "Victory",
-            "Pointing up": "Pointing_Up",
-            "Fist": "Closed_Fist",
-            "Thumb up": "Thumb_Up",
-            "Thumb down": "Thumb_Down",
-            "Pinch up/down": "Pinch up/down",
-            "Pinch left/right": "Pinch left/right"
-        }
         
         new_gestures = config.get("gestures", {})
         for action, ui_name in new_gestures.items():
-            if ui_name in ui_to_internal:
-                self.gesture_map[action] = ui_to_internal[ui_name]
+            if ui_name in self.UI_TO_INTERNAL:
+                self.gesture_map[action] = self.UI_TO_INTERNAL[ui_name]
+            elif ui_name in self.custom_gestures:
+                self.gesture_map[action] = ui_name
+
+        self.predictive_pinch = bool(config.get("predictive_pinch", False))
+        self.rules = list(config.get("rules", []))
+        self.compile_dispatch()
         
         print(f"Processor config updated successfully: {config}")
 
+    def compile_dispatch(self):
+        """
+        Compiles gesture_map and the user's rules into flat lookup tables so per-frame dispatch is a single dictionary lookup.
+        - self.dispatch: gesture name -> tuple of DispatchRule, most specific (user rules) first.
+        - self.pinch_axes: "vertical"/"horizontal" -> (cooldown, positive (key, label), negative (key, label)) for pinch-driven actions.
+        Rules are dictionaries with "action", "gesture" and optional "hand" and "min_score" keys; invalid rules (see
+        rule_error()) and unsupported gestures are skipped with a warning.
+        """
+        dispatch = {}
+
+        def add(action, gesture, hand=None, min_score=0.0):
+            spec = self.DISCRETE_ACTIONS.get(action)
+            if spec is None or gesture in self.PINCH_GESTURES:
+                return False
+            handler_name, cooldown_name, command, label = spec
+            rule = DispatchRule(action, getattr(self, handler_name), getattr(self, cooldown_name), command,
+                                label, hand, min_score, always_active=(action == "System Toggle"))
+            dispatch.setdefault(gesture, []).append(rule)
+            return True
+
+        for rule in self.rules:
+            problem = rule_error(rule)
+            if problem:
+                print(f"Ignoring invalid gesture rule {rule!r}: {problem}")
+                continue
+            gesture = self.UI_TO_INTERNAL.get(rule.get("gesture"), rule.get("gesture"))
+            hand = rule.get("hand")
+            if hand == "Both / No Preference":
+                hand = None
+            if not add(rule.get("action"), gesture, hand, float(rule.get("min_score", 0.0))):
+                print(f"Ignoring unsupported gesture rule: {rule}")
+
+        for action in self.DISCRETE_ACTIONS:
+            gesture = self.gesture_map.get(action)
+            if gesture:
+                add(action, gesture)
+
+        pinch_axes = {}
+        for action, (cooldown_name, positive, negative) in self.PINCH_ACTIONS.items():
+            axis = self.PINCH_GESTURES.get(self.gesture_map.get(action))
+            if axis and axis not in pinch_axes:
+                pinch_axes[axis] = (getattr(self, cooldown_name), positive, negative)
+
+        self.dispatch = {gesture: tuple(rules) for gesture, rules in dispatch.items()}
+        self.pinch_axes = pinch_axes
+        self.motion_enabled = any(gesture in self.MOTION_GESTURES for gesture in self.dispatch)
+
+    def _fire_system_toggle(self, rule):
+        if rule.cooldown.ready():
+            self.isSystemOn = not self.isSystemOn
+            if not self.isSystemOn: async_typer(rule.command)
+            return "System Started" if self.isSystemOn else "System Stopped"
+        return None
+
+    def _fire_mute_toggle(self, rule):
+        if rule.cooldown.ready():
+            self.isMuted = not self.isMuted
+            async_typer(rule.command)
+            return "Muted" if self.isMuted else "Unmuted"
+        return None
+
+    def _fire_key(self, rule):
+        if rule.cooldown.ready():
+            async_typer(rule.command)
+            return rule.label
+        return None
+
     def process_frame(self, result, frame):
         """
         Processes the gesture recognition results for a single video frame and executes corresponding media control actions based on user preferences and cooldowns.
@@ -102,19 +282,55 @@ class GestureProcessor:
         Output:
             - A string indicating the executed action (e.g., "Play/Pause", "Volume Up") or None if no action was taken to be shown in the application's main page.
         """
+        action = self.process_result(result)
+        self.draw_overlay(frame)
+        return action
 
+    def draw_overlay(self, frame):
+        """
+        Draws the debug visuals of the latest decision (wrist point, pinch start, pinch vector) onto frame.
+        Safe to call from the display thread while another thread runs process_result(): self.overlay is replaced, never mutated.
+        """
+        overlay = self.overlay
+        if overlay is None:
+            return
+        h, w, _ = frame.shape
+        wrist, pinch_start, pinch = overlay
+        cv2.circle(frame, (int(wrist[0] * w), int(wrist[1] * h)), 8, (0, 255, 255), 2)
+        if pinch is not None:
+            curr_px = (int(pinch[0] * w), int(pinch[1] * h))
+            if pinch_start is not None:
+                start_px = (int(pinch_start[0] * w), int(pinch_start[1] * h))
+                cv2.circle(frame, start_px, int(self.PINCH_TRIGGER * w), (255, 100, 100), 2)
+                cv2.line(frame, start_px, curr_px, (255, 0, 0), 2)
+            cv2.circle(frame, curr_px, 3, (255, 255, 0), -1)
+
+    def process_result(self, result, now=None):
+        """
+        Makes the gesture decision for one recognizer result and sends the resulting command, without touching a frame.
+        The debug visuals of the decision are kept in self.overlay for draw_overlay().
+        Input:
+            - now: Timestamp in seconds for the pinch filters (defaults to time.time()), so recorded traces can be replayed.
+        Output:
+            - The executed action label or None.
+        """
+        now = time.time() if now is None else now
+
+        self.apply_power_requests()
         if not result or not result.gestures or not result.handedness or len(result.handedness) == 0:
             self.reset_gesture_states()
             return None
         
         # Hand Preference check: Determine which hand's gestures to prioritize based on user settings and detected handedness
         chosen_hand_idx = -1
+        chosen_hand = None
         for i in range(len(result.handedness)):
             try:
                 detected_hand = result.handedness[i][0].category_name
                 preference = self.user_hand_preference
                 if preference == "Both / No Preference" or detected_hand == preference:
                     chosen_hand_idx = i
+                    chosen_hand = detected_hand
                     break
             except: continue
                 
@@ -124,16 +340,29 @@ class GestureProcessor:
         
         # Extract necessary landmarks and gesture information for the chosen hand, with error handling to ensure robustness against incomplete data.
         try:
-            h, w, _ = frame.shape
             hand_landmarks = result.hand_landmarks[chosen_hand_idx]
             wrist = hand_landmarks[0]
             middle_mcp = hand_landmarks[9]
-            gesture_name = result.gestures[chosen_hand_idx][0].category_name
+            top_gesture = result.gestures[chosen_hand_idx][0]
+            gesture_name = top_gesture.category_name
+            gesture_score = top_gesture.score
         except: return None
+
+        # Custom landmark poses: used only when the model has no answer. The classifier's kNN vote fraction is not
+        # comparable with the model's softmax score, so it never overrides a built-in gesture.
+        if self.custom_classifier is not None and gesture_name == "None":
+            custom_label, custom_score = self._classify_custom(result)[chosen_hand_idx]
+            if custom_label:
+                gesture_name, gesture_score = custom_label, custom_score
+
+        # Motion gestures: a completed swipe overrides the static gesture for this frame (not while pinching)
+        if self.motion_enabled and self.pinch_start_coords is None:
+            swipe = self.swipe_detector.update(chosen_hand, now, middle_mcp.x, middle_mcp.y)
+            if swipe:
+                gesture_name, gesture_score = swipe, 1.0
         
-        # Debug Visuals: Draw wrist point and hand size circle for visual feedback on the video feed
-        cv2.circle(frame, (int(wrist.x * w), int(wrist.y * h)), 8, (0, 255, 255), 2)
-        
+        # Debug Visuals: wrist point for the video feed
+        self.overlay = ((wrist.x, wrist.y), None, None)
 
         # Gesture Execution Logic ----------------
         hand_size = sqrt((middle_mcp.x - wrist.x)**2 + (middle_mcp.y - wrist.y)**2)
@@ -141,51 +370,35 @@ class GestureProcessor:
         gap_threshold = self.base_gap_threshold / scale_factor
 
 
-        # 1. System Toggle
-        if gesture_name == self.gesture_map.get("System Toggle"):
-            if self.toggle_cooldown.ready():
-                self.isSystemOn = not self.isSystemOn
-                if not self.isSystemOn: async_typer("`")
-                return "System Started" if self.isSystemOn else "System Stopped"
-            return None
+        # 1. Discrete actions: one lookup in the compiled dispatch table
+        matched = None
+        for rule in self.dispatch.get(gesture_name, ()):
+            if (rule.hand is None or rule.hand == chosen_hand) and gesture_score >= rule.min_score:
+                matched = rule
+                break
+
+        if matched is not None and matched.always_active:
+            return matched.handler(matched)
         
         if not self.isSystemOn: return None
 
-        # 2. Mute Toggle
-        if gesture_name == self.gesture_map.get("Mute Toggle"):
-            if self.toggle_cooldown.ready():
-                self.isMuted = not self.isMuted
-                async_typer("m")
-                return "Muted" if self.isMuted else "Unmuted"
-        
-        # 3. Play/Pause
-        elif gesture_name == self.gesture_map.get("Play/Pause"):
-            if self.toggle_cooldown.ready():
-                async_typer("space")
-                return "Play/Pause"
-        
-        # 4. Playlist control
-        elif gesture_name == self.gesture_map.get("Next Track"):
-            if self.toggle_cooldown.ready():
-                async_typer("next")
-                return "Next track"
-        elif gesture_name == self.gesture_map.get("Previous Track"):
-            if self.toggle_cooldown.ready():
-                async_typer("prev")
-                return "Previous track"
-
-        # 5. Pinch Logic
-        if self.gesture_map.get("Volume up/down") == "Pinch up/down" or self.gesture_map.get("Seek Forward/Backward") == "Pinch left/right":
+        if matched is not None:
+            action = matched.handler(matched)
+            if action: return action
+
+        # 2. Pinch Logic
+        if self.pinch_axes:
             
             thumb_tip, index_tip = hand_landmarks[4], hand_landmarks[8]
             raw_dist = sqrt((thumb_tip.x - index_tip.x)**2 + (thumb_tip.y - index_tip.y)**2)
-            finger_dist = self.filter_dist(raw_dist, time.time())
+            finger_dist = self.filter_dist(raw_dist, now)
             
             raw_cx = (thumb_tip.x + index_tip.x) / 2
             raw_cy = (thumb_tip.y + index_tip.y) / 2
-            curr_pinch_x = self.filter_x(raw_cx, time.time())
-            curr_pinch_y = self.filter_y(raw_cy, time.time())
+            curr_pinch_x = self.filter_x(raw_cx, now)
+            curr_pinch_y = self.filter_y(raw_cy, now)
             curr_pinch = (curr_pinch_x, curr_pinch_y)
+            velocity = self._pinch_velocity(curr_pinch, now)
 
             if finger_dist <= gap_threshold:
                 if self.pinch_start_coords:
@@ -193,26 +406,80 @@ class GestureProcessor:
                     dx = self.pinch_start_coords[0] - curr_pinch[0]
                     distance = sqrt(dx**2 + dy**2)
 
-                    # Debug Visuals: Draw pinch start point, current pinch point, and line connecting them for visual feedback on the video feed
-                    start_px = (int(self.pinch_start_coords[0]*w), int(self.pinch_start_coords[1]*h))
-                    curr_px = (int(curr_pinch[0]*w), int(curr_pinch[1]*h))
-                    cv2.circle(frame, start_px, int(0.07*w), (255, 100, 100), 2)
-                    cv2.line(frame, start_px, curr_px, (255, 0, 0), 2)
-
-                    if distance > 0.07 and self.pinch_cooldown.ready():
-                        if abs(dx) > abs(dy):                                   # Horizontal movement
-                            async_typer("right" if dx > 0 else "left")
-                            return "Seek Forward" if dx > 0 else "Seek Backward"
-                        else:                                                   # Vertical movement
-                            async_typer("up" if dy > 0 else "down")
-                            return "Volume Up" if dy > 0 else "Volume Down"
+                    # Debug Visuals: pinch start point, current pinch point and the line connecting them
+                    self.overlay = ((wrist.x, wrist.y), self.pinch_start_coords, curr_pinch)
+
+                    move = None
+                    if distance > self.PINCH_TRIGGER:
+                        # Horizontal or vertical movement, each axis drives whichever action is mapped to it
+                        move = ("horizontal", dx) if abs(dx) > abs(dy) else ("vertical", dy)
+                    elif self.predictive_pinch:
+                        move = self._predict_pinch(dx, dy, distance, velocity)
+                    if move:
+                        axis, delta = move
+                        pinch_action = self.pinch_axes.get(axis)
+                        if pinch_action and pinch_action[0].ready():
+                            key, label = pinch_action[1] if delta > 0 else pinch_action[2]
+                            async_typer(key)
+                            return label
                 else:
                     self.pinch_start_coords = curr_pinch
-                cv2.circle(frame, (int(curr_pinch[0]*w), int(curr_pinch[1]*h)), 3, (255, 255, 0), -1)
+                    self.overlay = ((wrist.x, wrist.y), None, curr_pinch)
             else:
                 self.pinch_start_coords = None
 
         return None
 
+    def _pinch_velocity(self, pinch, now):
+        """Velocity (units/s) of the filtered pinch point, from the previous filtered point and its timestamp."""
+        last, self._last_pinch = self._last_pinch, (pinch[0], pinch[1], now)
+        if last is None or now <= last[2]:
+            return 0.0, 0.0
+        return (pinch[0] - last[0]) / (now - last[2]), (pinch[1] - last[1]) / (now - last[2])
+
+    def _predict_pinch(self, dx, dy, distance, velocity):
+        """
+        Extrapolates the pinch over the pipeline latency and returns (axis, delta) when the predicted movement crosses
+        PINCH_TRIGGER confidently, otherwise None. dx/dy are measured from the pinch start towards it (start - current).
+        """
+        if distance < self.PINCH_TRIGGER * self.PREDICT_MIN_FRACTION:
+            return None
+        lead = min(max(self.pipeline_latency, 0.0), self.PREDICT_MAX_LEAD)
+        vx, vy = velocity
+        pdx, pdy = dx - vx * lead, dy - vy * lead
+        if sqrt(pdx**2 + pdy**2) <= self.PINCH_TRIGGER:
+            return None
+        if abs(pdx) >= abs(pdy):
+            axis, delta, pdelta, other, speed = "horizontal", dx, pdx, pdy, -vx
+        else:
+            axis, delta, pdelta, other, speed = "vertical", dy, pdy, pdx, -vy
+        # The hand must still be moving the way it already moved, clearly along one axis
+        if abs(pdelta) < self.PREDICT_AXIS_RATIO * abs(other) or delta * pdelta <= 0:
+            return None
+        if speed * delta <= 0 or abs(speed) < self.PREDICT_MIN_SPEED:
+            return None
+        return axis, delta
+
+    def _classify_custom(self, result):
+        """Runs the custom classifier once per recognizer result, batched across every detected hand."""
+        if result is not self._custom_result:
+            left = np.array([hand[0].category_name == "Left" for hand in result.handedness])
+            features = normalise_landmarks(landmarks_to_array(result.hand_landmarks), left)
+            self._custom_labels = self.custom_classifier.classify(features)
+            self._custom_result = result
+        return self._custom_labels
+
+    def request_system_state(self, on):
+        """Thread-safe way for the GUI to switch the system on or off; takes effect on the next processed result."""
+        self.power_requests.append(on)
+
+    def apply_power_requests(self):
+        while self.power_requests:
+            self.isSystemOn = self.power_requests.popleft()
+            self.reset_gesture_states()
+
     def reset_gesture_states(self):
-        self.pinch_start_coords = None
\ No newline at end of file
+        self.pinch_start_coords = None
+        self.overlay = None
+        self._last_pinch = None
+        self.swipe_detector.reset()
\ No newline at end of file
@@ -1,82 +1,553 @@
 import queue
 import requests
+from abc import ABC, abstractmethod
+import socket
+import time
 import xml.etree.ElementTree as ET
-from threading import Thread
+from collections import deque
+from threading import Condition, Thread
+
+from profiler import POLL_INTERVAL, profiler
+from thread_placement import placement
+from utilities import percentile
 
 # VLC Configuration
 VLC_IP = "localhost"        # Change to 127.0.0.1 for raspberry Pi if not working.
 VLC_PORT = "8080"
 VLC_PASSWORD = "raspberry"
 VLC_AUTH = ("", VLC_PASSWORD)
+RC_ADDRESS = "localhost:4212"       # VLC RC interface, "host:port" or a Unix socket path
 
-# Queue to store pending commands
-input_queue = queue.Queue()
+# Command priority classes. Discrete actions jump ahead of continuous volume/seek streams.
+PRIORITY_DISCRETE = 0
+PRIORITY_CONTINUOUS = 1
+CONTINUOUS_KEYS = {"up", "down", "left", "right"}
 
-def vlc_request(command_url):
-    """Helper to send the HTTP GET request to VLC."""
-    
-    url = f"http://{VLC_IP}:{VLC_PORT}/requests/status.xml?{command_url}"
-    try:
-        response = requests.get(url, auth=VLC_AUTH, timeout=0.2)        # Short timeout to prevent the worker from hanging
-        return response.status_code == 200
-    except Exception as e:          # If VLC isn't open yet.
+# Seconds a command may wait in the queue before it is considered stale and dropped
+COMMAND_DEADLINES = {
+    PRIORITY_DISCRETE: 2.0,
+    PRIORITY_CONTINUOUS: 0.3,
+}
+QUEUE_CAPACITY = 32
+
+# Circuit breaker around VLC: consecutive failures before opening, and the probe backoff range in seconds
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BACKOFF_INITIAL = 0.5
+BREAKER_BACKOFF_MAX = 8.0
+
+class Command:
+    """A queued key press with its priority class, enqueue time and expiry deadline (perf_counter seconds)."""
+    __slots__ = ("key", "priority", "enqueued_at", "deadline")
+
+    def __init__(self, key, priority, enqueued_at, deadline):
+        self.key = key
+        self.priority = priority
+        self.enqueued_at = enqueued_at
+        self.deadline = deadline
+
+class QueueMetrics:
+    """
+    Counters and rolling windows describing the command queue.
+    - enqueued: Commands accepted by put().
+    - dropped_expired: Commands discarded because their deadline passed before the worker got to them.
+    - dropped_overflow: Commands discarded because the queue was full.
+    - dropped_flushed: Continuous commands discarded by an explicit flush (e.g. system switched off).
+    - wait_ms / service_ms: Recent queue wait times and enqueue-to-sent times in milliseconds.
+    - max_depth: Deepest the queue has been.
+    """
+    def __init__(self, window=256):
+        self.enqueued = 0
+        self.dropped_expired = 0
+        self.dropped_overflow = 0
+        self.dropped_flushed = 0
+        self.max_depth = 0
+        self.wait_ms = deque(maxlen=window)
+        self.service_ms = deque(maxlen=window)
+
+    def record_service(self, command):
+        self.service_ms.append((time.perf_counter() - command.enqueued_at) * 1000)
+
+    def snapshot(self, depth=0):
+        """Returns the current counters and p50/p95/p99 of the wait and service windows as a dict."""
+        waits, services = list(self.wait_ms), list(self.service_ms)
+        return {
+            "depth": depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dropped_expired": self.dropped_expired,
+            "dropped_overflow": self.dropped_overflow,
+            "dropped_flushed": self.dropped_flushed,
+            "wait_ms": {p: percentile(waits, p) for p in (50, 95, 99)},
+            "service_ms": {p: percentile(services, p) for p in (50, 95, 99)},
+        }
+
+class CommandQueue:
+    """
+    Bounded, priority-aware command queue with per-command deadlines.
+    Each priority class has its own FIFO lane; get() always serves the most urgent non-empty lane and silently drops
+    commands whose deadline has passed. When the queue is full the oldest command of the least urgent class is evicted
+    to make room; a command is never evicted in favour of a less urgent one, in that case the newcomer is rejected.
+    The join()/task_done() semantics mirror queue.Queue so callers can wait for the queue to drain.
+    """
+    def __init__(self, capacity=QUEUE_CAPACITY, deadlines=COMMAND_DEADLINES):
+        self.capacity = capacity
+        self.deadlines = dict(deadlines)
+        self.metrics = QueueMetrics()
+        self._lanes = {priority: deque() for priority in sorted(self.deadlines)}
+        self._size = 0
+        self._unfinished = 0
+        self._woken = False
+        self._cond = Condition()
+
+    def put(self, key, priority):
+        """
+        Enqueues a key press.
+        Returns:
+            - True if the command was queued, False if it was rejected because the queue is full.
+        """
+        now = time.perf_counter()
+        command = Command(key, priority, now, now + self.deadlines[priority])
+        with self._cond:
+            if self._size >= self.capacity and not self._evict_below(priority):
+                self.metrics.dropped_overflow += 1
+                return False
+            self._lanes[priority].append(command)
+            self._size += 1
+            self._unfinished += 1
+            self.metrics.enqueued += 1
+            self.metrics.max_depth = max(self.metrics.max_depth, self._size)
+            self._cond.notify_all()
+            return True
+
+    def _evict_below(self, priority):
+        """Evicts the oldest command from the least urgent non-empty lane that is not more urgent than priority."""
+        for lane_priority in sorted(self._lanes, reverse=True):
+            if lane_priority < priority:
+                break
+            lane = self._lanes[lane_priority]
+            if lane:
+                lane.popleft()
+                self._size -= 1
+                self._finish(1)
+                self.metrics.dropped_overflow += 1
+                return True
         return False
-    
-def get_volume():
-    """Fetches the current vlc volume from status.xml"""
 
-    url = f"http://{VLC_IP}:{VLC_PORT}/requests/status.xml"
-    try:
-        response = requests.get(url, auth=VLC_AUTH, timeout=0.2)
+    def get(self, timeout=None):
+        """
+        Removes and returns the most urgent live command, blocking until one is available.
+        Raises:
+            - queue.Empty if timeout (seconds) elapses without a live command, or wake() is called.
+        """
+        end = None if timeout is None else time.perf_counter() + timeout
+        with self._cond:
+            while True:
+                now = time.perf_counter()
+                for lane in self._lanes.values():
+                    while lane:
+                        command = lane.popleft()
+                        self._size -= 1
+                        if command.deadline >= now:
+                            self.metrics.wait_ms.append((now - command.enqueued_at) * 1000)
+                            return command
+                        self.metrics.dropped_expired += 1
+                        self._finish(1)
+                remaining = None if end is None else end - now
+                if self._woken or (remaining is not None and remaining <= 0):
+                    self._woken = False
+                    raise queue.Empty
+                self._cond.wait(remaining)
+
+    def wake(self):
+        """Makes a get() that is waiting (or the next one, if none is) raise queue.Empty without a command."""
+        with self._cond:
+            self._woken = True
+            self._cond.notify_all()
+
+    def discard(self, priority):
+        """Drops every pending command of the given priority class. Returns the number of commands dropped."""
+        with self._cond:
+            lane = self._lanes[priority]
+            dropped = len(lane)
+            lane.clear()
+            self._size -= dropped
+            self.metrics.dropped_flushed += dropped
+            self._finish(dropped)
+            return dropped
+
+    def _finish(self, count):
+        # Caller must hold self._cond
+        self._unfinished -= count
+        if self._unfinished <= 0:
+            self._cond.notify_all()
+
+    def task_done(self):
+        with self._cond:
+            self._finish(1)
+
+    def join(self):
+        with self._cond:
+            while self._unfinished > 0:
+                self._cond.wait()
+
+    def qsize(self):
+        return self._size
+
+    def stats(self):
+        """Returns the queue metrics snapshot including the current depth."""
+        with self._cond:
+            return self.metrics.snapshot(depth=self._size)
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding the VLC client.
+    - closed: Requests go through. After failure_threshold consecutive failures the breaker opens.
+    - open: Requests fail fast without touching the network until the backoff expires.
+    - half-open: The next request after the backoff is let through as a probe. Success closes the breaker,
+      failure reopens it with the backoff doubled (capped at max_backoff).
+    on_open is called every time the breaker (re)opens.
+    Only the input worker thread drives the breaker; other threads may read state for display.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, initial_backoff=BREAKER_BACKOFF_INITIAL,
+                 max_backoff=BREAKER_BACKOFF_MAX, on_open=None):
+        self.failure_threshold = failure_threshold
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.on_open = on_open
+        self.state = self.CLOSED
+        self.failures = 0
+        self.backoff = initial_backoff
+        self.next_probe = 0.0
+
+    def allow(self):
+        """Returns True if a request may be sent now. In the open state the first call after the backoff becomes the probe."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() >= self.next_probe:
+            self.state = self.HALF_OPEN
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.backoff = self.initial_backoff
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+            self._open()
+        elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+            self.backoff = self.initial_backoff
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.next_probe = time.monotonic() + self.backoff
+        if self.on_open:
+            self.on_open()
+
+    def seconds_until_probe(self):
+        """Seconds until the next probe is due, or None while the breaker is closed."""
+        if self.state == self.CLOSED:
+            return None
+        return max(0.0, self.next_probe - time.monotonic())
+
+class PlayerBackend(ABC):
+    """
+    Interface for the output path to the media player.
+    Backends translate semantic player actions into their own wire protocol. Methods raise an exception when the
+    player cannot be reached (so the circuit breaker can count the failure) and otherwise return normally.
+    - send(action, value): Performs "pause", "next", "prev", "volume" or "seek". value is a status.xml style argument:
+      "+5"/"-1" are relative steps, "256" is absolute. Returns True if the player accepted the command.
+    - get_volume(): Returns the current volume (0-512 scale) or None if the player did not report one.
+    - close(): Releases any connection held by the backend.
+    """
+    name = "base"
+
+    @abstractmethod
+    def send(self, action, value=None):
+        pass
+
+    @abstractmethod
+    def get_volume(self):
+        pass
+
+    def close(self):
+        pass
+
+class HTTPBackend(PlayerBackend):
+    """
+    VLC web interface backend: one HTTP GET to /requests/status.xml per command.
+    Host, port and password default to the module level VLC_* settings, read at request time.
+    """
+    name = "http"
+    COMMANDS = {
+        "pause": "pl_pause",
+        "next": "pl_next",
+        "prev": "pl_previous",
+        "volume": "volume",
+        "seek": "seek",
+    }
+
+    def __init__(self, host=None, port=None, password=None, timeout=0.2):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout          # Short timeout to prevent the worker from hanging
+
+    def _get(self, query=""):
+        url = f"http://{self.host or VLC_IP}:{self.port or VLC_PORT}/requests/status.xml"
+        if query:
+            url += f"?{query}"
+        auth = ("", self.password) if self.password is not None else VLC_AUTH
+        return requests.get(url, auth=auth, timeout=self.timeout)
+
+    def send(self, action, value=None):
+        query = f"command={self.COMMANDS[action]}"
+        if value is not None:
+            query += f"&val={value}"
+        return self._get(query).status_code == 200
+
+    def get_volume(self):
+        response = self._get()
         if response.status_code == 200:
-            root = ET.fromstring(response.text)
-            volume_tag = root.find("volume")
-            if volume_tag is not None:
-                return int(volume_tag.text)
-    except Exception:
+            try:
+                volume_tag = ET.fromstring(response.text).find("volume")
+                if volume_tag is not None:
+                    return int(volume_tag.text)
+            except (ET.ParseError, ValueError, TypeError):
+                return None
         return None
-    return None
+
+class RCSocketBackend(PlayerBackend):
+    """
+    VLC remote-control (RC) interface backend over one persistent line-based socket.
+    Start VLC with `vlc --extraintf rc --rc-host localhost:4212` for TCP, or `--rc-unix /path/to/socket` for a Unix socket.
+    address is either "host:port" or a filesystem path. Every command is one text line; the reply is read up to VLC's
+    "> " prompt so each call is a full round trip. The connection is opened lazily and dropped on any error, so a
+    half-read reply can never be mistaken for the answer to a later command.
+    Unlike status.xml, the RC interface reads the argument of "volume X" and "seek X" as an absolute value. Relative
+    steps are sent as the absolute target computed from the current "volume" or "get_time", so a step moves the player
+    by the same amount as over HTTP ("volup"/"voldown" would move one --volume-step, 12.8 by default, instead).
+    """
+    name = "rc"
+    COMMANDS = {
+        "pause": "pause",
+        "next": "next",
+        "prev": "prev",
+        "volume": "volume",
+        "seek": "seek",
+    }
+    PROMPT = b"> "
+
+    def __init__(self, address=RC_ADDRESS, timeout=0.2):
+        self.address = address
+        self.timeout = timeout
+        self._sock = None
+        self._buffer = b""
+
+    def _connect(self):
+        if ":" in self.address and not self.address.startswith("/"):
+            host, port = self.address.rsplit(":", 1)
+            self._sock = socket.create_connection((host, int(port)), timeout=self.timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(self.timeout)
+            self._sock.connect(self.address)
+        self._buffer = b""
+        self._read_reply()          # Swallow the welcome banner
+
+    def _read_reply(self):
+        while not self._buffer.endswith(self.PROMPT):
+            chunk = self._sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("RC interface closed the connection")
+            self._buffer += chunk
+        reply, self._buffer = self._buffer[:-len(self.PROMPT)], b""
+        return reply.decode("utf-8", "replace")
+
+    def _transact(self, line):
+        try:
+            if self._sock is None:
+                self._connect()
+            self._sock.sendall(line.encode("utf-8") + b"\n")
+            return self._read_reply()
+        except Exception:
+            self.close()
+            raise
+
+    def send(self, action, value=None):
+        relative = value is not None and value[:1] in ("+", "-")
+        if relative:
+            current = self.get_volume() if action == "volume" else self._get_time()
+            if current is None:
+                return False
+            line = f"{self.COMMANDS[action]} {max(0, current + int(value))}"
+        else:
+            line = self.COMMANDS[action] if value is None else f"{self.COMMANDS[action]} {value}"
+        reply = self._transact(line)
+        return "Unknown command" not in reply and not reply.startswith("Error")
+
+    def _first_number(self, line):
+        for token in self._transact(line).split():
+            if token.isdigit():
+                return int(token)
+        return None
+
+    def _get_time(self):
+        """Current playback time in whole seconds, or None if the player did not report one."""
+        return self._first_number("get_time")
+
+    def get_volume(self):
+        return self._first_number("volume")
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._buffer = b""
+
+BACKENDS = {
+    HTTPBackend.name: HTTPBackend,
+    RCSocketBackend.name: RCSocketBackend,
+}
+
+def create_backend(config):
+    """
+    Builds a player backend from a settings dictionary.
+    Expected config format:
+    {
+        "backend": "http" / "rc",
+        "rc_address": "localhost:4212"
+    }
+    """
+    name = config.get("backend", "http")
+    if name == RCSocketBackend.name:
+        return RCSocketBackend(config.get("rc_address") or RC_ADDRESS)
+    return HTTPBackend()
+
+# Queue to store pending commands
+input_queue = CommandQueue()
+profiler.watch_lock(input_queue, "_cond")      # Profiling sessions sample wait times on the queue lock
+profiler.add_waker(input_queue.wake)            # An idle input_worker reaches its checkpoint when a session starts or ends
+
+# Stale volume/seek steps must not fire in a burst when VLC comes back
+vlc_breaker = CircuitBreaker(on_open=lambda: input_queue.discard(PRIORITY_CONTINUOUS))
+
+# Active backend and the one requested from settings; the worker swaps them between commands
+player_backend = HTTPBackend()
+_requested_backend = player_backend
+_player_config = {"backend": "http"}
+
+def configure_player(config):
+    """Selects the player backend from settings. The swap happens on the worker thread before its next command."""
+    global _requested_backend, _player_config
+    if config == _player_config:
+        return
+    _player_config = dict(config)
+    _requested_backend = create_backend(config)
+    print(f"Player backend set to: {_requested_backend.name}")
+
+def _through_breaker(operation, *args):
+    """Runs a backend call through the circuit breaker. Returns its result, or None if the player is unreachable or the breaker is open."""
+    if not vlc_breaker.allow():
+        return None
+    try:
+        result = operation(*args)
+    except Exception:           # If VLC isn't open yet.
+        vlc_breaker.record_failure()
+        return None
+    vlc_breaker.record_success()        # Any answer means VLC is up
+    return result
+
+def player_command(action, value=None):
+    """Helper to send one command to the player through the active backend."""
+
+    return bool(_through_breaker(player_backend.send, action, value))
+
+def get_volume():
+    """Fetches the current player volume, or None if it is unavailable."""
+
+    return _through_breaker(player_backend.get_volume)
+
+def _swap_backend():
+    """Installs the backend requested by configure_player(). Only called from the worker thread."""
+    global player_backend
+    if _requested_backend is not player_backend:
+        player_backend.close()
+        player_backend = _requested_backend
+        vlc_breaker.record_success()        # Give the new backend a clean slate
 
 def input_worker():
     """
-    Background thread that sends HTTP requests to VLC.
-    - input_worker(): Continuously listens for commands in the input_queue and sends corresponding requests to VLC.
+    Background thread that sends commands to VLC through the active player backend.
+    - input_worker(): Continuously takes the most urgent live command from input_queue and sends the corresponding command to VLC.
     """
 
     saved_volume = 256
     while True:
         try:
-            key_name = input_queue.get()
-            
-            # Maps the 'keys' to VLC API commands
-            if key_name == "space":
-                vlc_request("command=pl_pause")
+            placement.apply("input_worker")
+            if profiler.active or profiler.orphaned:
+                profiler.checkpoint("input_worker")
+            timeout = vlc_breaker.seconds_until_probe()
+            if profiler.active:
+                timeout = POLL_INTERVAL if timeout is None else min(timeout, POLL_INTERVAL)
+            try:
+                command = input_queue.get(timeout=timeout)
+            except queue.Empty:
+                probe_in = vlc_breaker.seconds_until_probe()
+                if probe_in is None or probe_in > 0:
+                    continue        # Woken early to reach the profiler checkpoint
+                _swap_backend()
+                get_volume()        # Breaker is open and nothing is queued: probe VLC so it can close again
+                continue
+            key_name = command.key
+            _swap_backend()
+
+            # Maps the 'keys' to player commands
+            if key_name == "`":
+                # System switched off: pending volume/seek steps are no longer wanted
+                input_queue.discard(PRIORITY_CONTINUOUS)
+            elif key_name == "space":
+                player_command("pause")
             elif key_name == "up":
-                # Increment volume 
-                vlc_request("command=volume&val=+5")
+                # Increment volume
+                player_command("volume", "+5")
             elif key_name == "down":
-                vlc_request("command=volume&val=-5")
+                player_command("volume", "-5")
             elif key_name == "next":
                 # Move now playing to next track
-                vlc_request("command=pl_next")
+                player_command("next")
             elif key_name == "prev":
                 # Move now playing to previous track
-                vlc_request("command=pl_previous")
+                player_command("prev")
             elif key_name == "m":
                 current_volume = get_volume()
                 if current_volume is not None:
                     if current_volume > 0:
                         saved_volume = current_volume
-                        vlc_request("command=volume&val=0")
+                        player_command("volume", "0")
                     else:
-                        vlc_request(f"command=volume&val={saved_volume if saved_volume > 0 else 256}")
+                        player_command("volume", str(saved_volume if saved_volume > 0 else 256))
             elif key_name == "right":
                 # Seek forward by 1s for precise controlling
-                vlc_request("command=seek&val=+1")
+                player_command("seek", "+1")
             elif key_name == "left":
                 # Seek backward by 1s for precise controlling
-                vlc_request("command=seek&val=-1")
+                player_command("seek", "-1")
 
+            input_queue.metrics.record_service(command)
             input_queue.task_done()
         except Exception as e:
             print(f"VLC API Worker Error: {e}")
@@ -85,6 +556,8 @@ def input_worker():
 worker = Thread(target=input_worker, daemon=True)
 worker.start()
 
-# Just a intermediate function 
+# Just a intermediate function
 def async_typer(key_name):
-    input_queue.put(key_name)
\ No newline at end of file
+    """Queues a key press, giving discrete actions priority over continuous volume/seek steps."""
+    priority = PRIORITY_CONTINUOUS if key_name in CONTINUOUS_KEYS else PRIORITY_DISCRETE
+    input_queue.put(key_name, priority)
@@ -0,0 +1,218 @@
+"""
+Lightweight custom gesture classifier that runs on the 21 hand landmarks MediaPipe already returns.
+Custom poses can be added without retraining the gesture_recognizer.task bundle.
+Key components:
+- normalise_landmarks(): Removes wrist position and hand scale (and mirrors left hands) so poses compare across users and distances.
+- LandmarkClassifier: Vectorised k-nearest-neighbour classifier, batched across all detected hands, stored as a compact .npz file.
+- Command line enrollment: records a few seconds of a pose from the webcam (or a video file) and adds it to the .npz.
+Usage:
+    python landmark_classifier.py enroll --label OK_Sign --seconds 3
+    python landmark_classifier.py list
+    python landmark_classifier.py remove --label OK_Sign
+"""
+
+import argparse
+import os
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from utilities import find_model
+
+CUSTOM_GESTURES_FILE = "custom_gestures.npz"
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_MCP = 9
+
+def landmarks_to_array(hand_landmarks_list):
+    """Converts MediaPipe hand_landmarks (a list of hands, each a list of 21 points) to a (hands, 21, 2) float32 array."""
+    out = np.empty((len(hand_landmarks_list), NUM_LANDMARKS, 2), dtype=np.float32)
+    for h, hand in enumerate(hand_landmarks_list):
+        for i, point in enumerate(hand):
+            out[h, i, 0] = point.x
+            out[h, i, 1] = point.y
+    return out
+
+def normalise_landmarks(points, left_hand=None):
+    """
+    Normalises a batch of hands for wrist position and hand scale.
+    Parameters:
+        - points: (hands, 21, 2) array of image-normalised landmark coordinates.
+        - left_hand: Optional (hands,) boolean array. Left hands are mirrored so one enrolled pose matches either hand.
+    Returns:
+        - (hands, 40) float32 feature array: every landmark except the wrist, relative to the wrist and divided by
+          the wrist to middle-finger-MCP distance.
+    """
+    centred = points - points[:, WRIST:WRIST + 1, :]
+    scale = np.linalg.norm(centred[:, MIDDLE_MCP, :], axis=1)
+    centred /= np.maximum(scale, 1e-6)[:, None, None]
+    if left_hand is not None:
+        centred[left_hand, :, 0] *= -1
+    return centred[:, 1:, :].reshape(len(points), -1).astype(np.float32)
+
+class LandmarkClassifier:
+    """
+    k-nearest-neighbour classifier over normalised landmark features.
+    classify() handles every detected hand in one batched distance computation. A hand is only labelled when the
+    nearest samples are within max_distance and at least half of the k neighbours agree.
+    """
+    def __init__(self, k=5, max_distance=0.6):
+        self.k = k
+        self.max_distance = max_distance
+        self.features = np.empty((0, (NUM_LANDMARKS - 1) * 2), dtype=np.float32)
+        self.labels = np.empty((0,), dtype=np.int32)
+        self.label_names = []
+        self._norms = np.empty((0,), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _refresh(self):
+        self._norms = np.einsum("ij,ij->i", self.features, self.features)
+
+    def enroll(self, label, features):
+        """Adds (n, 40) normalised feature samples for label."""
+        if label not in self.label_names:
+            self.label_names.append(label)
+        idx = self.label_names.index(label)
+        self.features = np.vstack([self.features, np.asarray(features, dtype=np.float32)])
+        self.labels = np.concatenate([self.labels, np.full(len(features), idx, dtype=np.int32)])
+        self._refresh()
+
+    def remove(self, label):
+        """Deletes every sample of label. Returns True if the label existed."""
+        if label not in self.label_names:
+            return False
+        idx = self.label_names.index(label)
+        keep = self.labels != idx
+        self.features, self.labels = self.features[keep], self.labels[keep]
+        self.labels[self.labels > idx] -= 1
+        self.label_names.pop(idx)
+        self._refresh()
+        return True
+
+    def classify(self, features):
+        """
+        Classifies a batch of hands.
+        Parameters:
+            - features: (hands, 40) array from normalise_landmarks().
+        Returns:
+            - List with one (label, confidence) tuple per hand, or (None, 0.0) when no custom pose matches.
+        """
+        if len(self.labels) == 0 or len(features) == 0:
+            return [(None, 0.0)] * len(features)
+
+        # Squared euclidean distances to every stored sample in one matrix product
+        query_norms = np.einsum("ij,ij->i", features, features)
+        dist = query_norms[:, None] + self._norms[None, :] - 2.0 * features @ self.features.T
+        k = min(self.k, len(self.labels))
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+
+        results = []
+        for row, idx in enumerate(nearest):
+            if np.sqrt(max(dist[row, idx].min(), 0.0)) > self.max_distance:
+                results.append((None, 0.0))
+                continue
+            votes = np.bincount(self.labels[idx], minlength=len(self.label_names))
+            best = int(votes.argmax())
+            confidence = votes[best] / k
+            results.append((self.label_names[best], float(confidence)) if confidence >= 0.5 else (None, 0.0))
+        return results
+
+    def save(self, path=CUSTOM_GESTURES_FILE):
+        """Stores the samples as a compressed .npz (float16 features keep the file small)."""
+        np.savez_compressed(path, features=self.features.astype(np.float16), labels=self.labels,
+                            label_names=np.array(self.label_names), k=self.k, max_distance=self.max_distance)
+
+    @classmethod
+    def load(cls, path=CUSTOM_GESTURES_FILE):
+        """Loads a classifier saved with save(). Returns None if the file does not exist."""
+        if not os.path.exists(path):
+            return None
+        data = np.load(path)
+        classifier = cls(k=int(data["k"]), max_distance=float(data["max_distance"]))
+        classifier.features = data["features"].astype(np.float32)
+        classifier.labels = data["labels"].astype(np.int32)
+        classifier.label_names = [str(name) for name in data["label_names"]]
+        classifier._refresh()
+        return classifier
+
+def enrolled_labels(path=CUSTOM_GESTURES_FILE):
+    """Returns the custom gesture labels stored in path, or an empty list if there are none."""
+    classifier = LandmarkClassifier.load(path)
+    return list(classifier.label_names) if classifier else []
+
+def record_samples(seconds, source=0, model_path=None, countdown=3):
+    """
+    Records normalised landmark samples of one pose from the webcam or a video file.
+    Returns:
+        - (n, 40) feature array, one row per frame where a hand was detected.
+    """
+    options = mp.tasks.vision.GestureRecognizerOptions(
+        base_options=mp.tasks.BaseOptions(model_asset_path=model_path or find_model()),
+        num_hands=1,
+        running_mode=mp.tasks.vision.RunningMode.VIDEO
+    )
+    recogniser = mp.tasks.vision.GestureRecognizer.create_from_options(options)
+    camera = cv2.VideoCapture(source)
+
+    live = isinstance(source, int)
+    fps = camera.get(cv2.CAP_PROP_FPS) or 30
+    if live:
+        print(f"Hold the pose in front of the camera. Recording starts in {countdown} s...")
+        time.sleep(countdown)
+
+    samples = []
+    start = time.time()
+    frame_idx = 0
+    try:
+        # Webcams are recorded for `seconds` of wall time, video files for `seconds` of footage
+        while (time.time() - start if live else frame_idx / fps) < seconds:
+            success, frame = camera.read()
+            if not success:
+                break
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = recogniser.recognize_for_video(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb), int(frame_idx * 1000 / fps))
+            frame_idx += 1
+            if result.hand_landmarks:
+                left = np.array([h[0].category_name == "Left" for h in result.handedness[:1]])
+                samples.append(normalise_landmarks(landmarks_to_array(result.hand_landmarks[:1]), left)[0])
+    finally:
+        camera.release()
+        recogniser.close()
+    return np.array(samples, dtype=np.float32)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage custom landmark gestures.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    enroll = sub.add_parser("enroll", help="Record a pose and add it under a label")
+    enroll.add_argument("--label", required=True)
+    enroll.add_argument("--seconds", type=float, default=3.0)
+    enroll.add_argument("--video", default=None, help="Read frames from a video file instead of the webcam")
+    enroll.add_argument("--model", default=None, help="Path to gesture_recognizer.task")
+    remove = sub.add_parser("remove", help="Delete every sample of a label")
+    remove.add_argument("--label", required=True)
+    sub.add_parser("list", help="List enrolled labels")
+    parser.add_argument("--file", default=CUSTOM_GESTURES_FILE)
+    args = parser.parse_args()
+
+    classifier = LandmarkClassifier.load(args.file) or LandmarkClassifier()
+    if args.command == "enroll":
+        samples = record_samples(args.seconds, args.video if args.video else 0, args.model)
+        if len(samples) == 0:
+            print("No hand detected, nothing enrolled.")
+        else:
+            classifier.enroll(args.label, samples)
+            classifier.save(args.file)
+            print(f"Enrolled {len(samples)} samples for '{args.label}' in {args.file}")
+    elif args.command == "remove":
+        if classifier.remove(args.label):
+            classifier.save(args.file)
+            print(f"Removed '{args.label}'")
+        else:
+            print(f"No label '{args.label}' in {args.file}")
+    else:
+        for idx, name in enumerate(classifier.label_names):
+            print(f"{name}: {int((classifier.labels == idx).sum())} samples")
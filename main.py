@@ -6,47 +6,31 @@ It also manages the AI processing thread and updates the GUI with the latest res
 
 import cv2 as reader
 import mediapipe as mp
-import os
+import signal
 import time
-from threading import Lock, Thread
+from threading import Thread
 import tkinter as tk
 
 # Importing custom modules
-from utilities import PerformanceMonitor
+from utilities import PerformanceMonitor, find_model
+from input_handler import configure_player, vlc_breaker
+from qos_controller import QualityController
+from thermal_monitor import ThermalMonitor
+from frame_grabber import FrameGrabber
+from recognizer_pool import RecognizerPool
+from stall_watchdog import Watchdog
+from thread_placement import placement
+from profiler import POLL_INTERVAL, profiler
+from shared_state import SharedState
 from app import app
 from main_page import main_page
 from settings_page import settings_page
 
-class SharedState:
-    """
-    Shared state object to manage data between the AI worker thread and the main GUI thread.
-    Includes:
-    - latest_result: The most recent gesture recognition result from the AI.
-    - current_action: The current action determined by the processor based on the latest result.
-    - lock: A threading lock to ensure thread-safe access to shared variables.
-    - is_running: A flag to control the main loop and allow for graceful shutdown.
-    - ai_busy: A flag to indicate if the AI is currently processing a frame, used for throttling.
-    - ai_latency_ms: Stores the latency of the AI processing for the latest frame.
-    - frame_capture_time: Timestamp of when the current frame was captured, used for total latency calculation.
-    - settings: A variable to track the current settings from the UI, allowing the AI worker to react to changes in configuration.
-    """
-    def __init__(self):
-        self.latest_result = None
-        self.current_action = "Idle"
-        self.lock = Lock()
-        self.is_running = True
-        
-        self.ai_busy = False 
-        self.ai_latency_ms = 0
-        self.frame_capture_time = 0 
-        
-        self.settings = None        # State variable for settings tracking
-    
 state = SharedState()
 
 def result_callback(result_obj, inp_img, timestamp):
     """
-    Callback function that is called by the MediaPipe recognizer when a new result is available.
+    Callback function that is called (through the RecognizerPool) when a recognizer result newer than every earlier one is available.
     It updates the shared state with the latest result and calculates the AI processing latency.
     Parameters:
         - result_obj: The result object returned by the MediaPipe recognizer, containing gesture recognition results
@@ -55,43 +39,123 @@ def result_callback(result_obj, inp_img, timestamp):
     Returns:
         - None
     """
-    with state.lock:
-        state.latest_result = result_obj
-        state.ai_latency_ms = int((time.time() * 1000) - (timestamp / 1000))
-        state.ai_busy = False
+    placement.apply("mediapipe_callback")
+    state.publish_result(result_obj, int((time.time() * 1000) - (timestamp / 1000)), timestamp)
+    if state.dispatch.callback_mode:
+        state.dispatch.wake.set()
+
+def decide(processor, monitor, snapshot, new_result):
+    """
+    Runs the gesture decision for a result snapshot and publishes the outcome. Only called by the thread that owns the processor.
+    Parameters:
+        - processor: The GestureProcessor
+        - monitor: The PerformanceMonitor, which records the capture-to-decision latency of every new result
+        - snapshot: The ResultSnapshot to decide on
+        - new_result: True the first time this snapshot is decided on
+    """
+    settings = state.settings
+    if settings.version != processor.settings_version:
+        processor.settings_version = settings.version
+        processor.update_config(settings.settings)
 
-def ai_worker(recogniser, camera, processor, monitor):
+    decision_ms = monitor.get_decision_latency()
+    if decision_ms > 0:
+        processor.pipeline_latency = decision_ms / 1000        # Lead time for predictive pinch
+    action = processor.process_result(snapshot.result)
+    if new_result and snapshot.result is not None:
+        monitor.record_decision(time.time() * 1000 - snapshot.timestamp_us / 1000)
+    state.publish_decision(action or state.decision.action, processor.isSystemOn)
+
+def gesture_worker(processor, monitor):
+    """
+    Worker thread for the "callback" dispatch mode: decides on every recognizer result as soon as result_callback
+    delivers it, instead of waiting for ai_worker's next camera frame. Idle while the dispatch mode is "frame".
+    """
+    dispatch = state.dispatch
+    last_version = 0
+    while state.is_running:
+        dispatch.wake.wait(POLL_INTERVAL)
+        dispatch.wake.clear()
+        placement.apply("gesture_worker")
+        if profiler.active or profiler.orphaned:
+            profiler.checkpoint("gesture_worker")
+        if not dispatch.begin():
+            continue
+        try:
+            snapshot = state.result
+            if snapshot.version != last_version:
+                last_version = snapshot.version
+                decide(processor, monitor, snapshot, True)
+        finally:
+            dispatch.end()
+
+def ai_worker(pool, camera, processor, monitor, qos, thermal):
     """
     Worker thread function that continuously captures frames from the camera, processes them with the gesture recognizer, and updates the shared state with results and performance metrics.
     Parameters:
-        - recogniser: The MediaPipe gesture recognizer instance used to process frames
-        - camera: The OpenCV VideoCapture object used to capture frames from the webcam
+        - pool: The RecognizerPool whose MediaPipe gesture recognizers process frames in round-robin
+        - camera: The FrameGrabber that hands out the freshest frame from the webcam
         - processor: The processor object that takes recognition results and determines the current action
         - monitor: The PerformanceMonitor instance used to track and calculate FPS and other performance metrics
+        - qos: The QualityController that picks the inference (and optionally capture) resolution from measured latency
+        - thermal: The ThermalMonitor that caps the inference rate and resolution as the SoC heats up
     Returns:
         - None
     """
 
+    last_result_version = 0
+    last_decided_version = 0
+    last_submit = 0.0
+    qos_settings_version = -1
+    capture_size = qos.base_capture
     while state.is_running:
+        placement.apply("ai_worker")
+        if profiler.active or profiler.orphaned:
+            profiler.checkpoint("ai_worker")
         loop_start = time.perf_counter()
         
-        success, frame = camera.read()      
-        if not success:         # If frame capture fails, skip processing and try again
+        success, frame, capture_timestamp = camera.read()
+        if not success:         # If frame capture fails, skip processing and try again (the watchdog reopens a camera that stays down)
             time.sleep(0.01)
             continue
+        monitor.record_frame_age(camera.last_age_ms)
 
-        capture_timestamp = time.time()
+        # Take the latest published result
+        snapshot = state.result
+        res = snapshot.result
 
-        with state.lock:        # Safely read the latest result and settings for processing
-            res = state.latest_result
-            current_settings = state.settings
+        # Feed every new result's latency to the monitor and let the QoS controller react
+        if res is not None and snapshot.version != last_result_version:
+            last_result_version = snapshot.version
+            monitor.record_inference(snapshot.ai_latency_ms)
+        settings = state.settings
+        if settings.version != qos_settings_version:
+            qos_settings_version = settings.version
+            qos.update_config(settings.settings.get("qos", {}))
+        qos.update()
+        if thermal.update():
+            qos.set_min_level(thermal.min_resolution_level, f"(thermal {thermal.status()})")
+        if qos.capture_size != capture_size:        # Follows the level with adapt_capture, back to the base size without
+            capture_size = qos.capture_size
+            camera.set(reader.CAP_PROP_FRAME_WIDTH, capture_size[0])
+            camera.set(reader.CAP_PROP_FRAME_HEIGHT, capture_size[1])
             
-        # Process frame
-        action = processor.process_frame(res, frame)
-        
-        with state.lock:
-            if action: state.current_action = action
-            state.frame_capture_time = capture_timestamp
+        # Recognizer pool size, and the watchdog's stall recovery: rebuilding drops the frames in flight on the old instances
+        if pool.recreate_requested:
+            pool.recreate()
+            state.in_flight.reset()
+        if pool.resize(state.settings.settings.get("recognizer_pool", 1)):
+            state.in_flight.set_limit(pool.size)
+            state.in_flight.reset()
+
+        # Gesture decision: made here on every frame in "frame" mode, by gesture_worker in "callback" mode
+        state.dispatch.set_callback_mode(state.settings.settings.get("dispatch_mode") == "callback")
+        if not state.dispatch.callback_mode:
+            decide(processor, monitor, snapshot, snapshot.version != last_decided_version)
+            last_decided_version = snapshot.version
+        processor.draw_overlay(frame)
+
+        state.publish_frame(capture_timestamp)
 
         # Display the frame (for debugging purposes, can be removed in final version)
         reader.imshow("Touchless Controller Feed", frame)
@@ -99,18 +163,19 @@ def ai_worker(recogniser, camera, processor, monitor):
             state.is_running = False
             break
 
-        # AI Throttling
-        can_send_to_ai = False
-        with state.lock:
-            if not state.ai_busy:
-                state.ai_busy = True
-                can_send_to_ai = True
-
-        if can_send_to_ai:
-            frame_RGB = reader.cvtColor(frame, reader.COLOR_BGR2RGB)
+        # AI Throttling: only submit when a pool slot is free and the thermal rate cap allows it
+        submit_time = time.perf_counter()
+        if submit_time - last_submit >= thermal.min_interval and state.in_flight.try_acquire():
+            last_submit = submit_time
+            ai_frame = frame
+            width, height = qos.inference_size(frame.shape[1], frame.shape[0])
+            if (frame.shape[1], frame.shape[0]) != (width, height):
+                ai_frame = reader.resize(frame, (width, height), interpolation=reader.INTER_AREA)
+            frame_RGB = reader.cvtColor(ai_frame, reader.COLOR_BGR2RGB)
             mediapipe_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_RGB)
             current_us = int(capture_timestamp * 1000000) 
-            recogniser.recognize_async(mediapipe_image, current_us)
+            if not pool.submit(mediapipe_image, current_us):       # Every instance still busy
+                state.in_flight.release()
 
         # Update performance monitor with the time taken for this loop iteration
         monitor.update(loop_start, time.perf_counter())
@@ -122,36 +187,61 @@ def main():
     It also starts the AI worker thread that handles frame processing and gesture recognition in the background.
     """
 
+    def open_camera():
+        """Opens the webcam at the capture resolution (at startup, and again when the watchdog recovers it)."""
+        camera = reader.VideoCapture(0)
+        camera.set(3, 480) 
+        camera.set(4, 320) 
+        return camera
+
     # Initialize camera
-    camera = reader.VideoCapture(0)
-    camera.set(3, 480) 
-    camera.set(4, 320) 
+    grabber = FrameGrabber(open_camera()).start()
 
-    model_path = "gesture_recognizer.task"
-    if not os.path.exists(model_path):
-        model_path = os.path.expanduser("~/arm/arm_project/gesture_recognizer.task")
-    
-    # Initialize MediaPipe Gesture Recognizer with options
-    options = mp.tasks.vision.GestureRecognizerOptions(
-        base_options=mp.tasks.BaseOptions(model_asset_path=model_path),
-        num_hands=4,
-        running_mode=mp.tasks.vision.RunningMode.LIVE_STREAM,
-        result_callback=result_callback
-    )
-    recogniser = mp.tasks.vision.GestureRecognizer.create_from_options(options)
+    model_path = find_model("gesture_recognizer.task")
+
+    def create_recogniser(callback):
+        """Creates one MediaPipe Gesture Recognizer instance for the pool, reporting results to callback."""
+        options = mp.tasks.vision.GestureRecognizerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=model_path),
+            num_hands=4,
+            running_mode=mp.tasks.vision.RunningMode.LIVE_STREAM,
+            result_callback=callback
+        )
+        # MediaPipe's graph threads inherit the creating thread's placement
+        with placement.applied("mediapipe_callback"):
+            return mp.tasks.vision.GestureRecognizer.create_from_options(options)
 
     # Initialize the main application GUI
     root = app()
     processor = root.processor
     monitor = PerformanceMonitor()
+    qos = QualityController(monitor)
+    thermal = ThermalMonitor()
     
     # Store initial settings
-    state.settings = root.get_settings()
-    processor.update_config(state.settings)
+    settings = root.get_settings()
+    processor.update_config(settings)
+    state.publish_settings(settings)
+    processor.settings_version = state.settings.version
+    configure_player(settings.get("player", {}))
+    placement.configure(settings.get("threads", {}))
+
+    # Initialize the pool of MediaPipe Gesture Recognizers, one frame in flight per instance
+    pool = RecognizerPool(create_recogniser, settings.get("recognizer_pool", 1),
+                          on_result=result_callback, on_done=state.in_flight.release)
+    state.in_flight.set_limit(pool.size)
+
+    # Stall watchdog: reopens the camera or recreates the recognizers when their heartbeats stop
+    watchdog = Watchdog(grabber, pool, state.in_flight, open_camera, settings.get("stall_threshold", 2.0)).start()
+
+    # Profiling mode: `kill -USR1 <pid>` starts a session
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: profiler.start())
     
     # Start AI thread
-    worker_thread = Thread(target=ai_worker, args=(recogniser, camera, processor, monitor), daemon=True)
+    worker_thread = Thread(target=ai_worker, args=(pool, grabber, processor, monitor, qos, thermal), daemon=True)
     worker_thread.start()
+    Thread(target=gesture_worker, args=(processor, monitor), daemon=True).start()
 
     def update_gui():
         """
@@ -163,23 +253,26 @@ def main():
             root.destroy()
             return
 
+        placement.apply("gui")
+
         # If settings change then call new changes from UI
         try:
             current_ui_settings = root.get_settings()
-            if current_ui_settings != state.settings:
-                with state.lock:
-                    state.settings = current_ui_settings
-                processor.update_config(current_ui_settings)
+            if current_ui_settings != state.settings.settings:
+                state.publish_settings(current_ui_settings)        # Applied by the thread that owns the processor
+                configure_player(current_ui_settings.get("player", {}))
+                placement.configure(current_ui_settings.get("threads", {}))
+                watchdog.threshold = current_ui_settings.get("stall_threshold", 2.0)
         except Exception as e:
             pass
 
 
         # Dasboard Updates -------------------
-        with state.lock:
-            result = state.latest_result
-            action = state.current_action
-            ai_lat = state.ai_latency_ms
-            capture_t = state.frame_capture_time
+        result_snapshot = state.result
+        frame_snapshot = state.frame
+        decision = state.decision
+        result = result_snapshot.result
+        capture_t = frame_snapshot.frame_capture_time
 
         total_latency = int((time.time() - capture_t) * 1000) if capture_t > 0 else 0
         gesture_name = "--"
@@ -191,11 +284,23 @@ def main():
         if main_page in root.frames:
             root.frames[main_page].update_dashboard(
                 fps=fps, 
-                ai_latency=ai_lat, 
+                ai_latency=result_snapshot.ai_latency_ms, 
                 total_latency=total_latency,
                 gesture_name=gesture_name, 
-                action_name=action, 
-                is_system_active=processor.isSystemOn
+                action_name=decision.action, 
+                is_system_active=decision.system_active,
+                player_state=vlc_breaker.state,
+                quality=qos.status(),
+                quality_degraded=qos.effective_level > 0,
+                temperature=thermal.status(),
+                throttle_level=thermal.level,
+                throttle_fps=thermal.max_fps,
+                decision_latency=monitor.get_decision_latency(),
+                frame_age=monitor.get_frame_age(),
+                inference_fps=pool.result_rate(),
+                pool_status=pool.status(),
+                watchdog_status=watchdog.status(),
+                watchdog_alert=watchdog.stalled is not None
             )
 
         root.after(100, update_gui)
@@ -210,13 +315,16 @@ def main():
 
     # Set the window close protocol to ensure a error-free shutdown
     root.protocol("WM_DELETE_WINDOW", on_closing)
+    root.after(2000, lambda: print(f"Effective thread placement:\n{placement.describe()}"))
     update_gui()
     root.mainloop()
 
     # Cleanup
     state.is_running = False
-    recogniser.close()
-    camera.release()
+    watchdog.stop()
+    pool.close()
+    if not grabber.stop():
+        print("Frame grabber: camera still blocked in grab(), it is released when grab() returns")
     reader.destroyAllWindows()
 
 if __name__ == "__main__":
@@ -4,10 +4,17 @@ from input_handler import async_typer
 class main_page(tk.Frame):
     """
     Class representing the main page of the application. It displays system controls, metrics, and provides navigation to the settings page.
+    Metrics besides Engine FPS, AI Latency, Total Latency and Status:
+    - Inference Res: the inference resolution and level chosen by the QoS controller (quality, quality_degraded).
+    - Decision Latency: frame capture to gesture decision (decision_latency).
+    - SoC Temp and Thermal Throttle: the thermal monitor's reading and throttle level (temperature, throttle_level, throttle_fps).
+    - Frame Age: age of camera frames when the AI worker receives them (frame_age).
+    - Inference FPS: published recognizer results per second with the pool status (inference_fps, pool_status).
+    - Watchdog: the stall watchdog state and recovery count, highlighted while a stage is stalled (watchdog_status, watchdog_alert).
     Methods:
     - __init__(parent, controller, processor): Initializes the main page with UI elements for system control and metrics display.
     - create_metric_item(parent, label_text, initial_val): Helper method to create a labeled metric display item.
-    - update_dashboard(fps, ai_latency, total_latency, gesture_name, action_name, is_system_active): Updates the dashboard with the latest performance metrics and detected gestures/actions.
+    - update_dashboard(fps, ai_latency, total_latency, gesture_name, action_name, is_system_active, player_state, quality, quality_degraded, decision_latency, temperature, throttle_level, throttle_fps, frame_age, inference_fps, pool_status, watchdog_status, watchdog_alert): Updates the dashboard with the latest performance metrics and detected gestures/actions.
     """
     def __init__(self, parent, controller, processor):
         tk.Frame.__init__(self, parent)
@@ -63,14 +70,12 @@ class main_page(tk.Frame):
         self.ctrl_frame.pack(fill="x", pady=5)
 
         def start_system():
-            self.processor.isSystemOn = True
-            self.processor.reset_gesture_states()
+            self.processor.request_system_state(True)
             print("System Started")
         
         def stop_system():
-            self.processor.isSystemOn = False
+            self.processor.request_system_state(False)
             async_typer("`")
-            self.processor.reset_gesture_states()
             print("System Stopped")
 
         self.start_btn = tk.Button(self.ctrl_frame, text="ENABLE SYSTEM", bg=self.fg_accent, fg="white", 
@@ -87,7 +92,14 @@ class main_page(tk.Frame):
 
         self.lbl_fps = self.create_metric_item(self.metrics_frame, "Engine FPS", "0")
         self.lbl_ai_latency = self.create_metric_item(self.metrics_frame, "AI Latency", "0 ms")
+        self.lbl_inference_fps = self.create_metric_item(self.metrics_frame, "Inference FPS", "0")
         self.lbl_total_latency = self.create_metric_item(self.metrics_frame, "Total Latency", "0 ms")
+        self.lbl_decision_latency = self.create_metric_item(self.metrics_frame, "Decision Latency", "0 ms")
+        self.lbl_frame_age = self.create_metric_item(self.metrics_frame, "Frame Age", "0 ms")
+        self.lbl_quality = self.create_metric_item(self.metrics_frame, "Inference Res", "--")
+        self.lbl_temperature = self.create_metric_item(self.metrics_frame, "SoC Temp", "--")
+        self.lbl_throttle = self.create_metric_item(self.metrics_frame, "Thermal Throttle", "Off")
+        self.lbl_watchdog = self.create_metric_item(self.metrics_frame, "Watchdog", "OK")
         self.lbl_sys_status = self.create_metric_item(self.metrics_frame, "Status", "OFFLINE")
 
         # 4. Live Feedback Section
@@ -118,14 +130,15 @@ class main_page(tk.Frame):
             "victory": "\u270C",
             "open_palm": "\u270B",
             "fist": "\u270A",
-            "point_up": "\u261D"
+            "point_up": "\u261D",
+            "swipe": "\U0001F44B"
         }
         legend_data = [
             (f"{emojis['victory']} Victory", "System On/Off"),
             (f"{emojis['open_palm']} Open Palm", "Rest"),
             (f"{emojis['point_up']} Pointing Up", "Play/Pause"),
-            (f"{emojis['thumb_up']} Thumb Up", "Next Track"),
-            (f"{emojis['thumb_down']} Thumb Down", "Previous Track"),
+            (f"{emojis['swipe']} Swipe Right", "Next Track"),
+            (f"{emojis['swipe']} Swipe Left", "Previous Track"),
             (f"{emojis['fist']} Fist", "Mute Toggle"),
             (f"{emojis['pinch']} Pinch (Vertical)", "Volume Up/Down"),
             (f"{emojis['pinch']} Pinch (Horizontal)", "Seek Forward/Back"),
@@ -155,7 +168,9 @@ class main_page(tk.Frame):
         val_lbl.pack(side="right")
         return val_lbl
 
-    def update_dashboard(self, fps, ai_latency, total_latency, gesture_name, action_name, is_system_active):
+    def update_dashboard(self, fps, ai_latency, total_latency, gesture_name, action_name, is_system_active, player_state="closed", quality="--", quality_degraded=False, decision_latency=0,
+                         temperature="--", throttle_level=0, throttle_fps=None, frame_age=0,
+                         inference_fps=0, pool_status="", watchdog_status="OK", watchdog_alert=False):
         """
         Updates the text-based components of the GUI.
         This method is called periodically (e.g., every 100 ms) to refresh the displayed performance metrics, detected gestures, and current action status. 
@@ -167,17 +182,47 @@ class main_page(tk.Frame):
         :param gesture_name: The name of the currently detected gesture, if any.
         :param action_name: The name of the current action being performed based on the detected gesture
         :param is_system_active: A boolean indicating whether the gesture control system is currently active (True) or offline (False).
+        :param player_state: The VLC circuit breaker state ("closed", "open" or "half-open"). Anything but "closed" means VLC is unreachable.
+        :param quality: The inference resolution chosen by the QoS controller (e.g. "336x224 L2").
+        :param quality_degraded: True when the QoS controller has stepped the resolution down from the default.
+        :param decision_latency: Average latency from frame capture to the gesture decision in milliseconds.
+        :param temperature: The SoC temperature text from the thermal monitor (e.g. "71.2 C").
+        :param throttle_level: The thermal throttle level, 0 when unthrottled.
+        :param throttle_fps: The inference rate cap of the throttle level, or None.
+        :param frame_age: Average age of camera frames when the AI worker receives them, in milliseconds.
+        :param inference_fps: Recognizer results published per second.
+        :param pool_status: The recognizer pool size and dropped result count (e.g. "x2, 3 dropped").
+        :param watchdog_status: The stall watchdog state and recovery count (e.g. "OK (2 recovered)").
+        :param watchdog_alert: True while a pipeline stage is stalled.
         """
         self.lbl_fps.config(text=f"{int(fps)}")
         
         ai_lat_color = self.fg_accent if ai_latency < 100 else self.fg_alert
         self.lbl_ai_latency.config(text=f"{int(ai_latency)} ms", fg=ai_lat_color)
         
+        self.lbl_inference_fps.config(text=f"{int(inference_fps)} ({pool_status})" if pool_status else f"{int(inference_fps)}")
+
         total_lat_color = self.fg_accent if total_latency < 150 else self.fg_alert
         self.lbl_total_latency.config(text=f"{int(total_latency)} ms", fg=total_lat_color)
         
+        decision_color = self.fg_accent if decision_latency < 150 else self.fg_alert
+        self.lbl_decision_latency.config(text=f"{int(decision_latency)} ms", fg=decision_color)
+
+        self.lbl_frame_age.config(text=f"{int(frame_age)} ms", fg=self.fg_accent if frame_age < 30 else self.fg_alert)
+
+        self.lbl_quality.config(text=quality, fg=self.fg_alert if quality_degraded else self.fg_text)
+
+        self.lbl_temperature.config(text=temperature, fg=self.fg_alert if throttle_level else self.fg_text)
+        throttle_text = f"L{throttle_level} ({throttle_fps} fps)" if throttle_level else "Off"
+        self.lbl_throttle.config(text=throttle_text, fg=self.fg_alert if throttle_level else self.fg_text)
+
+        self.lbl_watchdog.config(text=watchdog_status, fg=self.fg_alert if watchdog_alert else self.fg_text)
+
         status_text = "ACTIVE" if is_system_active else "OFFLINE"
-        status_color = self.fg_accent if is_system_active else self.fg_alert
+        vlc_reachable = player_state == "closed"
+        if not vlc_reachable:
+            status_text += " | VLC DOWN" if player_state == "open" else " | VLC PROBING"
+        status_color = self.fg_accent if is_system_active and vlc_reachable else self.fg_alert
         self.lbl_sys_status.config(text=status_text, fg=status_color)
 
         self.lbl_detected.config(text=f"Gesture: {gesture_name if gesture_name else '--'}")
@@ -0,0 +1,120 @@
+"""
+Dynamic (motion) gestures built on a short history of hand positions.
+Key components:
+- LandmarkHistory: Fixed-size, array-backed ring buffer of per-hand positions and timestamps with O(1) append.
+- SwipeDetector: Recognises horizontal swipes from the history by displacement and velocity, emitting "Swipe_Left" / "Swipe_Right".
+Directions are named from the user's point of view. The camera feed is not mirrored, so a swipe to the user's right
+moves the hand towards smaller x in the image (the same convention the pinch seek logic uses).
+"""
+
+import numpy as np
+
+SWIPE_LEFT = "Swipe_Left"
+SWIPE_RIGHT = "Swipe_Right"
+
+class LandmarkHistory:
+    """
+    Ring buffer of (timestamp, x, y) samples for each hand slot.
+    Storage is preallocated NumPy arrays, so append() is O(1) and never allocates.
+    Hands are addressed by handedness label ("Left" / "Right").
+    """
+    def __init__(self, capacity=16, hands=("Left", "Right")):
+        self.capacity = capacity
+        self.slots = {hand: i for i, hand in enumerate(hands)}
+        self.times = np.full((len(hands), capacity), -np.inf)          # -inf marks an empty entry
+        self.points = np.zeros((len(hands), capacity, 2), dtype=np.float64)
+        self.heads = [0] * len(hands)          # Index the next sample is written to
+        self.counts = [0] * len(hands)
+
+    def append(self, hand, timestamp, x, y):
+        slot = self.slots[hand]
+        head = self.heads[slot]
+        self.times[slot, head] = timestamp
+        self.points[slot, head, 0] = x
+        self.points[slot, head, 1] = y
+        self.heads[slot] = (head + 1) % self.capacity
+        if self.counts[slot] < self.capacity:
+            self.counts[slot] += 1
+
+    def latest(self, hand):
+        """Returns (timestamp, x, y) of the newest sample for hand, or None if the slot is empty."""
+        slot = self.slots[hand]
+        if self.counts[slot] == 0:
+            return None
+        idx = (self.heads[slot] - 1) % self.capacity
+        return self.times[slot, idx], self.points[slot, idx, 0], self.points[slot, idx, 1]
+
+    def oldest_within(self, hand, span, now):
+        """
+        Returns (timestamp, x, y) of the oldest sample no older than span seconds before now, or None.
+        The search is one vectorised pass over the fixed-size buffer, so the cost per call is constant.
+        """
+        slot = self.slots[hand]
+        if self.counts[slot] == 0:
+            return None
+        times = self.times[slot]
+        candidates = np.where(now - times <= span, times, np.inf)
+        idx = int(candidates.argmin())
+        if candidates[idx] == np.inf:
+            return None
+        return times[idx], self.points[slot, idx, 0], self.points[slot, idx, 1]
+
+    def clear(self, hand=None):
+        """Forgets the samples of one hand, or of every hand when hand is None."""
+        slots = self.slots.values() if hand is None else [self.slots[hand]]
+        for slot in slots:
+            self.times[slot] = -np.inf
+            self.heads[slot] = 0
+            self.counts[slot] = 0
+
+class SwipeDetector:
+    """
+    Detects horizontal swipes from a LandmarkHistory.
+    A swipe is reported when, within the last `window` seconds, the hand travelled at least min_displacement
+    (normalised image units) horizontally, at an average speed of at least min_velocity units/second, and the
+    vertical travel is at most max_vertical_ratio of the horizontal travel. After a swipe the hand's history is
+    cleared and further swipes from that hand are suppressed for `refractory` seconds.
+    """
+    def __init__(self, capacity=16, window=0.35, min_displacement=0.22, min_velocity=0.9,
+                 max_vertical_ratio=0.6, refractory=0.6):
+        self.history = LandmarkHistory(capacity)
+        self.window = window
+        self.min_displacement = min_displacement
+        self.min_velocity = min_velocity
+        self.max_vertical_ratio = max_vertical_ratio
+        self.refractory = refractory
+        self.blocked_until = {hand: 0.0 for hand in self.history.slots}
+
+    def update(self, hand, timestamp, x, y):
+        """
+        Records a new position for hand and checks for a swipe.
+        Returns:
+            - SWIPE_LEFT / SWIPE_RIGHT if a swipe just completed, otherwise None.
+        """
+        if hand not in self.history.slots:
+            return None
+        self.history.append(hand, timestamp, x, y)
+        if timestamp < self.blocked_until[hand]:
+            return None
+
+        start = self.history.oldest_within(hand, self.window, timestamp)
+        if start is None:
+            return None
+        t0, x0, y0 = start
+        elapsed = timestamp - t0
+        if elapsed <= 0:
+            return None
+
+        dx = x - x0
+        dy = y - y0
+        if abs(dx) < self.min_displacement or abs(dy) > self.max_vertical_ratio * abs(dx):
+            return None
+        if abs(dx) / elapsed < self.min_velocity:
+            return None
+
+        self.history.clear(hand)
+        self.blocked_until[hand] = timestamp + self.refractory
+        return SWIPE_RIGHT if dx < 0 else SWIPE_LEFT
+
+    def reset(self, hand=None):
+        self.history.clear(hand)
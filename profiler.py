@@ -0,0 +1,244 @@
+"""
+Built-in profiling mode that can be switched on at runtime (settings page button or SIGUSR1).
+For a fixed window it:
+- runs cProfile on the AI worker, gesture worker and input worker threads (each thread enables its own profiler at its next checkpoint),
+- traces allocations with tracemalloc and reports them per processed frame,
+- times every acquisition of the command queue lock (shared by the GUI, AI and input threads) by wrapping it for the duration of the window,
+and then writes a report bundle to profiles/<timestamp>/.
+When profiling is off the worker loops only check profiler.active and profiler.orphaned and the lock is not wrapped, so
+it costs nothing. A thread that misses the end of a session keeps its profile running only until its next checkpoint,
+which disables it; that profile is left out of the bundle.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+from utilities import percentile
+
+PROFILED_ROLES = ("ai_worker", "gesture_worker", "input_worker")
+PROFILE_DIR = "profiles"
+POLL_INTERVAL = 0.5         # Longest a profiled thread may block before reaching its next checkpoint
+
+class TimedLock:
+    """
+    Wraps a threading.Lock (or Condition) and records how long each acquire() waited, per thread name.
+    Wrapping (instead of replacing) the lock keeps mutual exclusion intact while it is swapped in and out.
+    Other attributes (Condition.wait, notify_all, ...) are passed through to the wrapped object.
+    """
+    def __init__(self, inner):
+        self.inner = inner
+        self.waits = {}
+
+    def acquire(self, blocking=True, timeout=-1):
+        t0 = time.perf_counter()
+        acquired = self.inner.acquire(blocking, timeout)
+        self.waits.setdefault(threading.current_thread().name, []).append((time.perf_counter() - t0) * 1000)
+        return acquired
+
+    def release(self):
+        self.inner.release()
+
+    def locked(self):
+        return self.inner.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+class Profiler:
+    """
+    Runtime profiling session manager. One session at a time.
+    - watch_lock(owner, attr): Registers the lock (owner.attr) whose wait times are sampled during a session.
+    - start(duration): Starts a session; returns False if one is already running.
+    - add_waker(wake): Registers a function that interrupts a profiled thread blocked waiting for work, so it reaches a
+      checkpoint when a session starts or ends instead of when work happens to arrive.
+    - checkpoint(role): Called once per loop iteration by a profiled thread while self.active or self.orphaned is set.
+    The session is finished by a timer thread, which collects the per-thread profiles and writes the bundle. The profile
+    of a thread that does not hand it in within POLL_INTERVAL * 4 is kept in self.orphaned (role -> profile) until that
+    thread's next checkpoint disables it.
+    """
+    def __init__(self):
+        self.active = False
+        self.last_report = None
+        self.orphaned = {}
+        self._wakers = []
+        self._lock_owner = None
+        self._lock_attr = None
+        self._session = None
+        self._mutex = threading.Lock()
+
+    def watch_lock(self, owner, attr="lock"):
+        self._lock_owner, self._lock_attr = owner, attr
+
+    def add_waker(self, wake):
+        self._wakers.append(wake)
+
+    def _wake(self):
+        for wake in self._wakers:
+            wake()
+
+    def start(self, duration=10.0, output_dir=PROFILE_DIR):
+        with self._mutex:
+            if self._session is not None:
+                return False
+            self._session = {
+                "start": time.perf_counter(),
+                "duration": duration,
+                "dir": os.path.join(output_dir, time.strftime("%Y%m%d-%H%M%S")),
+                "stopping": False,
+                "profiles": {},          # role -> cProfile.Profile (while running)
+                "stats": {},             # role -> disabled cProfile.Profile handed in by its thread
+                "frames": {},            # role -> checkpoints during the session
+                "handed_in": {role: threading.Event() for role in PROFILED_ROLES},
+                "frame_peaks": [],       # Traced memory growth (KiB) within each AI frame
+                "last_traced": None,
+            }
+        tracemalloc.start(10)
+        self._session["snapshot"] = tracemalloc.take_snapshot()
+        if self._lock_owner is not None:
+            setattr(self._lock_owner, self._lock_attr, TimedLock(getattr(self._lock_owner, self._lock_attr)))
+        self.active = True
+        self._wake()                        # Idle threads enable their profiler now, not at their next piece of work
+        print(f"Profiling for {duration:.0f} s ...")
+        threading.Thread(target=self._finish, name="profiler", daemon=True).start()
+        return True
+
+    def checkpoint(self, role):
+        """Enables this thread's profiler on first call, counts iterations and hands the profile in once stopping."""
+        orphan = self.orphaned.pop(role, None)
+        if orphan:
+            orphan.disable()                # Left running by a session this thread did not hand in to
+        session = self._session
+        if session is None:
+            return
+        profile = session["profiles"].get(role)
+        if session["stopping"]:
+            if profile is not None and not session["handed_in"][role].is_set():
+                profile.disable()
+                session["stats"][role] = profile
+                session["handed_in"][role].set()
+            return
+        if profile is None:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:         # Another profiler is already active in this interpreter
+                print(f"Profiling: cannot profile {role}: {e}")
+                session["handed_in"][role].set()
+                profile = False
+            session["profiles"][role] = profile
+        session["frames"][role] = session["frames"].get(role, 0) + 1
+        if role == "ai_worker":
+            # Peak traced memory above the level at the previous frame boundary = transient allocations of one frame
+            current, peak = tracemalloc.get_traced_memory()
+            if session["last_traced"] is not None:
+                session["frame_peaks"].append((peak - session["last_traced"]) / 1024)
+            session["last_traced"] = current
+            tracemalloc.reset_peak()
+
+    def _finish(self):
+        session = self._session
+        time.sleep(session["duration"])
+        session["stopping"] = True
+        self._wake()
+        for role in PROFILED_ROLES:
+            if role in session["profiles"]:
+                session["handed_in"][role].wait(POLL_INTERVAL * 4)
+        for role, profile in list(session["profiles"].items()):
+            if not session["handed_in"][role].is_set():
+                session["handed_in"][role].set()            # Too late: the thread disables it at its next checkpoint
+                session["stats"].pop(role, None)
+                self.orphaned[role] = profile
+        elapsed = time.perf_counter() - session["start"]
+
+        end_snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        timed_lock = None
+        if self._lock_owner is not None:
+            timed_lock = getattr(self._lock_owner, self._lock_attr)
+            if isinstance(timed_lock, TimedLock):
+                setattr(self._lock_owner, self._lock_attr, timed_lock.inner)
+        self.active = False
+        if self.orphaned:
+            self._wake()
+
+        try:
+            self.last_report = self._write_bundle(session, elapsed, end_snapshot, timed_lock)
+            print(f"Profiling report written to {self.last_report}")
+        except OSError as e:
+            print(f"Profiling: could not write report: {e}")
+        finally:
+            with self._mutex:
+                self._session = None
+
+    def _write_bundle(self, session, elapsed, end_snapshot, timed_lock):
+        out = session["dir"]
+        os.makedirs(out, exist_ok=True)
+        frames = session["frames"]
+        summary = {"duration_s": round(elapsed, 2), "iterations": dict(frames), "threads": {}}
+
+        # CPU profiles: binary .prof for snakeviz/pstats plus a readable top-40 by cumulative time
+        for role in PROFILED_ROLES:
+            profile = session["stats"].get(role)
+            if not profile:
+                summary["threads"][role] = "not profiled (thread did not reach a checkpoint in time)"
+                continue
+            profile.dump_stats(os.path.join(out, f"{role}.prof"))
+            text = io.StringIO()
+            pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(40)
+            with open(os.path.join(out, f"{role}.txt"), "w") as f:
+                f.write(text.getvalue())
+            summary["threads"][role] = f"{role}.prof"
+
+        # Allocations: transient peak per AI frame, plus blocks still alive at the end of the window (leaks/growth)
+        diff = end_snapshot.compare_to(session["snapshot"], "lineno")
+        ai_frames = max(frames.get("ai_worker", 0), 1)
+        peaks = session["frame_peaks"]
+        summary["allocations"] = {
+            "frame_peak_kib_p50": round(percentile(peaks, 50), 1) if peaks else None,
+            "frame_peak_kib_p99": round(percentile(peaks, 99), 1) if peaks else None,
+            "retained_blocks_per_frame": round(sum(s.count_diff for s in diff if s.count_diff > 0) / ai_frames, 2),
+            "retained_kib_per_frame": round(sum(s.size_diff for s in diff if s.size_diff > 0) / 1024 / ai_frames, 2),
+        }
+        with open(os.path.join(out, "allocations.txt"), "w") as f:
+            f.write(f"Blocks retained between the start and end of the window, {ai_frames} AI frames\n\n")
+            for stat in diff[:40]:
+                f.write(f"{stat.count_diff / ai_frames:+9.2f} blocks/frame {stat.size_diff / 1024:+10.1f} KiB  {stat.traceback}\n")
+
+        # Lock waits per thread
+        summary["lock_wait_ms"] = {}
+        if timed_lock is not None:
+            for name, waits in timed_lock.waits.items():
+                summary["lock_wait_ms"][name] = {
+                    "acquisitions": len(waits),
+                    "p50": round(percentile(waits, 50), 4),
+                    "p99": round(percentile(waits, 99), 4),
+                    "max": round(max(waits), 4),
+                }
+
+        with open(os.path.join(out, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        return out
+
+    def status(self):
+        """Short text for the settings page button."""
+        session = self._session
+        if self.active and session is not None:
+            remaining = session["duration"] - (time.perf_counter() - session["start"])
+            return f"Profiling... {max(0, remaining):.0f} s"
+        return "Profile 10 s"
+
+# Shared instance used by the worker threads, the settings page and the signal handler
+profiler = Profiler()
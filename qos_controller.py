@@ -0,0 +1,162 @@
+"""
+Closed-loop quality-of-service controller for the capture and inference pipeline.
+It watches the AI latency and end-to-end latency measured by PerformanceMonitor against a latency budget and steps the
+inference input resolution down when the budget is missed and back up when there is headroom. Optionally the camera
+capture resolution follows the inference resolution.
+Hysteresis keeps it from oscillating: a step down needs several consecutive misses, a step up needs a longer run of
+evaluations with clear headroom, and both streaks restart after every change. The monitor's AI latency samples are
+cleared on every change too, so the next streak is not judged on latencies measured at the previous level.
+An external floor (min_level, set by the thermal monitor) can hold the resolution down regardless of latency.
+"""
+
+import time
+from collections import deque
+
+# Inference input scale relative to the captured frame, best quality first. Level 0 sends frames unchanged.
+RESOLUTION_LEVELS = [1.0, 0.85, 0.7, 0.55, 0.4]
+
+class QualityController:
+    """
+    Steps the inference resolution between RESOLUTION_LEVELS (scale factors of the captured frame) based on measured latency.
+    - ai_budget_ms / total_budget_ms: Latency targets. Missing either one counts as a miss.
+    - headroom: Fraction of the budgets both latencies must stay under to count towards a step up.
+    - down_after / up_after: Consecutive evaluations needed before stepping down / up.
+    - interval: Seconds between evaluations.
+    - adapt_capture: If True, the requested camera capture size (base_capture scaled by the level) follows as well.
+    - enabled: If False, update() does nothing and the level stays at 0.
+    The budgets, adapt_capture and enabled come from the "qos" settings through update_config().
+    Decisions are kept in self.decisions as (timestamp, level, reason) and counted in downgrades/upgrades.
+    The level actually used is effective_level: the latency-driven level, but never better than min_level.
+    """
+    def __init__(self, monitor, ai_budget_ms=80, total_budget_ms=110, headroom=0.7, down_after=3, up_after=10,
+                 interval=0.5, levels=RESOLUTION_LEVELS, adapt_capture=False, base_capture=(480, 320)):
+        self.monitor = monitor
+        self.ai_budget_ms = ai_budget_ms
+        self.total_budget_ms = total_budget_ms
+        self.headroom = headroom
+        self.down_after = down_after
+        self.up_after = up_after
+        self.interval = interval
+        self.levels = list(levels)
+        self.adapt_capture = adapt_capture
+        self.base_capture = base_capture
+        self.enabled = True
+        self.last_size = None
+
+        self.level = 0
+        self.min_level = 0
+        self.miss_streak = 0
+        self.ok_streak = 0
+        self.downgrades = 0
+        self.upgrades = 0
+        self.decisions = deque(maxlen=50)
+        self.last_eval = 0.0
+
+    @property
+    def effective_level(self):
+        return max(self.level, self.min_level)
+
+    @property
+    def scale(self):
+        return self.levels[self.effective_level]
+
+    @property
+    def capture_size(self):
+        scale = self.scale if self.adapt_capture else 1.0
+        return int(self.base_capture[0] * scale), int(self.base_capture[1] * scale)
+
+    def inference_size(self, width, height):
+        """Returns the (width, height) a width x height frame should be resized to before inference."""
+        self.last_size = (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+        return self.last_size
+
+    def update_config(self, config, now=None):
+        """
+        Applies the "qos" settings. Expected config format:
+        {"enabled": True, "adapt_capture": False, "ai_budget_ms": 80, "total_budget_ms": 110}
+        Disabling the controller returns it to full resolution (the thermal floor still applies).
+        """
+        now = time.perf_counter() if now is None else now
+        self.enabled = bool(config.get("enabled", True))
+        self.adapt_capture = bool(config.get("adapt_capture", False))
+        self.ai_budget_ms = config.get("ai_budget_ms", self.ai_budget_ms)
+        self.total_budget_ms = config.get("total_budget_ms", self.total_budget_ms)
+        self.miss_streak = 0
+        self.ok_streak = 0
+        if not self.enabled and self.level > 0:
+            self.level = 0
+            self.decisions.append((now, self.effective_level, "disabled"))
+            print(f"QoS: disabled, inference scale -> {self.scale:.0%} (level {self.effective_level})")
+
+    def update(self, now=None):
+        """
+        Evaluates the latest latency stats if the evaluation interval has passed.
+        Returns:
+            bool: True if the resolution level changed.
+        """
+        now = time.perf_counter() if now is None else now
+        if not self.enabled or now - self.last_eval < self.interval:
+            return False
+        self.last_eval = now
+
+        ai_ms, total_ms = self.monitor.get_latency_stats()
+        if ai_ms <= 0:
+            return False            # No inference results yet
+
+        if ai_ms > self.ai_budget_ms or total_ms > self.total_budget_ms:
+            self.miss_streak += 1
+            self.ok_streak = 0
+            if self.miss_streak >= self.down_after and self.level < len(self.levels) - 1:
+                return self._set_level(self.level + 1, now, f"over budget (AI {ai_ms:.0f} ms, total {total_ms:.0f} ms)")
+        elif ai_ms < self.ai_budget_ms * self.headroom and total_ms < self.total_budget_ms * self.headroom:
+            self.ok_streak += 1
+            self.miss_streak = 0
+            if self.ok_streak >= self.up_after and self.level > 0:
+                return self._set_level(self.level - 1, now, f"headroom (AI {ai_ms:.0f} ms, total {total_ms:.0f} ms)")
+        else:
+            # Inside the hysteresis band: hold the current level
+            self.miss_streak = 0
+            self.ok_streak = 0
+        return False
+
+    def set_min_level(self, min_level, reason="", now=None):
+        """
+        Sets the floor on the resolution level (0 removes it).
+        Returns:
+            bool: True if the effective level changed.
+        """
+        now = time.perf_counter() if now is None else now
+        min_level = min(max(0, min_level), len(self.levels) - 1)
+        if min_level == self.min_level:
+            return False
+        before = self.effective_level
+        self.min_level = min_level
+        self.decisions.append((now, self.effective_level, f"floor {min_level} {reason}".strip()))
+        if self.effective_level != before:
+            self._restart_measurement()
+            print(f"QoS: inference scale -> {self.scale:.0%} (level {self.effective_level}), floor {min_level} {reason}".rstrip())
+            return True
+        return False
+
+    def _set_level(self, level, now, reason):
+        if level > self.level:
+            self.downgrades += 1
+        else:
+            self.upgrades += 1
+        self.level = level
+        self._restart_measurement()
+        self.decisions.append((now, level, reason))
+        print(f"QoS: inference scale -> {self.scale:.0%} (level {self.effective_level}), {reason}")
+        return True
+
+    def _restart_measurement(self):
+        """After a level change, both streaks start over and are judged only on latencies measured at the new level."""
+        self.miss_streak = 0
+        self.ok_streak = 0
+        self.monitor.clear_inference()
+
+    def status(self):
+        """Short text for the dashboard, e.g. "336x224 L2"."""
+        if self.last_size is None:
+            return f"{self.scale:.0%} L{self.effective_level}"
+        return f"{self.last_size[0]}x{self.last_size[1]} L{self.effective_level}"
@@ -0,0 +1,168 @@
+"""
+Pool of MediaPipe gesture recognizers for pipelined inference.
+One LIVE_STREAM recognizer works on one frame at a time, so with a single frame in flight the inference rate is capped
+at 1 / inference latency while the other cores sit idle. RecognizerPool keeps 1-3 recognizer instances and hands each
+submitted frame to an idle instance, taking them in round-robin order, so up to `size` frames are recognised at the
+same time and a slow instance never gets a second frame queued behind the first.
+Results can then finish out of order. Each result is checked against the newest timestamp already published: an older
+one (out of order, or superseded by a newer frame) is dropped, so GestureProcessor only ever sees results in capture
+order. Every instance gets strictly increasing timestamps, as MediaPipe requires, because frames are submitted in
+capture order.
+"""
+
+import time
+from collections import deque
+from threading import Lock, Thread
+
+MAX_POOL_SIZE = 3
+
+class _Instance:
+    """One recognizer of the pool, the pool generation it belongs to, and whether it has a frame in flight."""
+    __slots__ = ("recognizer", "generation", "busy")
+
+    def __init__(self, generation):
+        self.recognizer = None
+        self.generation = generation
+        self.busy = False
+
+class RecognizerPool:
+    """
+    Pool of LIVE_STREAM recognizers, each with at most one frame in flight.
+    - create: Function taking a result callback and returning a new recognizer (anything with recognize_async/close).
+    - on_result(result, image, timestamp): Called for every result that is newer than all results published so far.
+    - on_done(): Called for every completed frame of the current instances, published or dropped (releases the
+      in-flight slot). Frames answered by replaced instances are ignored, as the caller resets its count on a rebuild.
+    - submit(image, timestamp): Hands the frame to the next idle instance. Returns False if every instance is busy.
+    - resize(size) / recreate(): Replace the instances. The caller resets its in-flight count afterwards.
+    - request_recreate(): Asks the submitting thread to call recreate() (used by the watchdog, so the rebuild and the
+      in-flight reset happen on the thread that owns submissions). recreate_requested stays True until then.
+    One lock serialises submit's instance choice, the rebuilds, close() and the result bookkeeping, so the watchdog,
+    ai_worker, the MediaPipe callback threads and shutdown can never see a half-replaced pool. Recognizers are created
+    and closed outside the lock.
+    Counters: submitted, published, dropped (out-of-order or superseded results), recreated.
+    last_submit and last_result are the time.perf_counter() of the latest submission and of the latest completed frame
+    (the watchdog's submit and result heartbeats).
+    """
+    def __init__(self, create, size=1, on_result=None, on_done=None):
+        self.create = create
+        self.on_result = on_result
+        self.on_done = on_done
+        self.size = 0
+        self.submitted = 0
+        self.published = 0
+        self.dropped = 0
+        self.recreated = 0
+        self.recreate_requested = False
+        self.last_submit = self.last_result = time.perf_counter()
+        self.last_timestamp = -1
+        self._instances = []
+        self._generation = 0
+        self._next = 0
+        self._lock = Lock()
+        self._published_times = deque(maxlen=4 * 30)
+        self.resize(size)
+
+    def _build(self, size):
+        """Creates `size` instances of the next generation and swaps them in. Returns the replaced instances."""
+        generation = self._generation + 1
+        instances = [_Instance(generation) for _ in range(size)]
+        for instance in instances:
+            instance.recognizer = self.create(lambda result, image, timestamp, instance=instance:
+                                              self._deliver(instance, result, image, timestamp))
+        with self._lock:
+            stale, self._instances = self._instances, instances
+            self._generation = generation
+            self.size = size
+            self._next = 0
+            self.last_result = time.perf_counter()
+        return stale
+
+    @staticmethod
+    def _close_in_background(instances):
+        """close() may block on a hung graph, so replaced instances are closed on their own thread."""
+        if instances:
+            Thread(target=lambda: [instance.recognizer.close() for instance in instances],
+                   name="recognizer_close", daemon=True).start()
+
+    def resize(self, size):
+        """
+        Replaces the recognizers with `size` new instances (clamped to 1..MAX_POOL_SIZE) if the size changed.
+        Returns:
+            bool: True if the pool was rebuilt.
+        """
+        size = max(1, min(MAX_POOL_SIZE, int(size)))
+        if size == self.size:
+            return False
+        self._close_in_background(self._build(size))
+        print(f"Recognizer pool: {size} instance{'s' if size > 1 else ''}")
+        return True
+
+    def recreate(self):
+        """Replaces every instance with a new one of the same pool size (stall recovery)."""
+        self.recreate_requested = False
+        self._close_in_background(self._build(max(1, self.size)))
+        self.recreated += 1
+
+    def request_recreate(self):
+        self.recreate_requested = True
+
+    def submit(self, image, timestamp):
+        """
+        Hands a frame to the first idle instance, starting after the one that got the previous frame.
+        Returns:
+            bool: False if every instance is busy (or the pool is closed) and the frame was not submitted.
+        """
+        with self._lock:
+            count = len(self._instances)
+            for i in range(count):
+                instance = self._instances[(self._next + i) % count]
+                if not instance.busy:
+                    instance.busy = True
+                    self._next = (self._next + i + 1) % count
+                    break
+            else:
+                return False
+        instance.recognizer.recognize_async(image, timestamp)
+        self.submitted += 1
+        self.last_submit = time.perf_counter()
+        return True
+
+    def _deliver(self, instance, result, image, timestamp):
+        """Result callback of one instance."""
+        with self._lock:
+            current = instance.generation == self._generation
+            instance.busy = False
+            fresh = current and timestamp > self.last_timestamp
+            if fresh:
+                self.last_timestamp = timestamp
+                self.published += 1
+                self._published_times.append(time.perf_counter())
+                if self.on_result is not None:
+                    self.on_result(result, image, timestamp)
+            else:
+                self.dropped += 1
+            if current:
+                self.last_result = time.perf_counter()
+        if current and self.on_done is not None:
+            self.on_done()
+
+    def result_rate(self, now=None):
+        """Published results per second over the last second (the inference FPS)."""
+        now = time.perf_counter() if now is None else now
+        return sum(1 for t in list(self._published_times) if now - t <= 1.0)
+
+    @property
+    def in_flight(self):
+        return sum(instance.busy for instance in list(self._instances))
+
+    def close(self):
+        with self._lock:
+            instances, self._instances = self._instances, []
+            self._generation += 1
+            self.size = 0
+        for instance in instances:
+            instance.recognizer.close()
+
+    def status(self):
+        """Short text for the dashboard, e.g. "x2, 3 dropped"."""
+        return f"x{self.size}" + (f", {self.dropped} dropped" if self.dropped else "")
@@ -1,5 +1,15 @@
+import json
+import os
 import tkinter as tk
 
+from gesture_processor_logic import rule_error
+from landmark_classifier import enrolled_labels
+from profiler import profiler
+from thread_placement import ROLES
+
+# Optional file with richer gesture rules (gesture + handedness + minimum confidence), see README
+RULES_FILE = "gesture_rules.json"
+
 class settings_page(tk.Frame):
     """
     Class implementing the settings page of the application. It allows users to customize gesture mappings, cooldown durations, and hand preferences. 
@@ -25,6 +35,8 @@ class settings_page(tk.Frame):
         self.font_body = ("Segoe UI", 9)
 
         self.configure(bg=self.bg_main)
+
+        self.gesture_rules = self.load_rules(RULES_FILE)
         
         # Page switching buttons
         self.button_frame = tk.Frame(self, bg=self.bg_main)
@@ -52,7 +64,8 @@ class settings_page(tk.Frame):
 
         # Actions and Gestures list
         actions = ["Rest", "System Toggle", "Play/Pause", "Volume up/down", "Seek forward/backward", "Next Track", "Previous Track", "Mute Toggle"]
-        gestures = ["Open palm", "Victory", "Pointing up", "Pinch up/down", "Pinch left/right", "Thumb up", "Thumb down", "Fist"]
+        gestures = ["Open palm", "Victory", "Pointing up", "Pinch up/down", "Pinch left/right", "Thumb up", "Thumb down", "Fist", "Swipe left", "Swipe right"]
+        gestures += enrolled_labels()          # Custom poses enrolled with landmark_classifier.py
 
         self.mappings = {}        # Dictionary to store StringVars for retrieval
 
@@ -72,8 +85,8 @@ class settings_page(tk.Frame):
             
             # Setting logical defaults based on recent gesture logic updates
             default_gesture = gestures[i % len(gestures)]
-            if action_text == "Next Track": default_gesture = "Thumb up"
-            elif action_text == "Previous Track": default_gesture = "Thumb down"
+            if action_text == "Next Track": default_gesture = "Swipe right"
+            elif action_text == "Previous Track": default_gesture = "Swipe left"
             elif action_text == "Mute Toggle": default_gesture = "Fist"
             elif action_text == "Seek forward/backward": default_gesture = "Pinch left/right"
             
@@ -197,6 +210,302 @@ class settings_page(tk.Frame):
         
         hand_dropdown.grid(row=0, column=1, sticky="ew", padx=(5, 10), pady=4)
 
+        # Player backend selection
+        lbl_backend = tk.Label(
+            self.other_settings_frame,
+            text="Player Backend",
+            bg=self.bg_panel,
+            fg=self.fg_text,
+            font=self.font_body
+        )
+        lbl_backend.grid(row=1, column=0, sticky="w", padx=(10, 5), pady=4)
+
+        self.backend_options = {"HTTP (Web interface)": "http", "RC socket": "rc"}
+        self.backend_var = tk.StringVar(self)
+        self.backend_var.set("HTTP (Web interface)")
+
+        backend_dropdown = tk.OptionMenu(self.other_settings_frame, self.backend_var, *self.backend_options)
+        backend_dropdown.config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            highlightthickness=0, 
+            activebackground=self.fg_accent,
+            font=self.font_body,
+            relief="flat",
+            anchor="w"
+        )
+        backend_dropdown["menu"].config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            font=self.font_body,
+            activebackground=self.fg_accent,
+            relief="flat"
+        )
+        backend_dropdown.grid(row=1, column=1, sticky="ew", padx=(5, 10), pady=4)
+
+        # RC interface address ("host:port" or a Unix socket path), only used by the RC socket backend
+        lbl_rc = tk.Label(
+            self.other_settings_frame,
+            text="RC Address",
+            bg=self.bg_panel,
+            fg=self.fg_text,
+            font=self.font_body
+        )
+        lbl_rc.grid(row=2, column=0, sticky="w", padx=(10, 5), pady=4)
+
+        self.rc_address_var = tk.StringVar(self)
+        self.rc_address_var.set("localhost:4212")
+        rc_entry = tk.Entry(
+            self.other_settings_frame,
+            textvariable=self.rc_address_var,
+            bg=self.bg_main,
+            fg=self.fg_text,
+            insertbackground=self.fg_text,
+            font=self.font_body,
+            relief="flat",
+            width=14
+        )
+        rc_entry.grid(row=2, column=1, sticky="ew", padx=(5, 10), pady=4)
+
+        # Gesture dispatch: act when the next camera frame is processed, or as soon as the recognizer result arrives
+        lbl_dispatch = tk.Label(
+            self.other_settings_frame,
+            text="Gesture Dispatch",
+            bg=self.bg_panel,
+            fg=self.fg_text,
+            font=self.font_body
+        )
+        lbl_dispatch.grid(row=3, column=0, sticky="w", padx=(10, 5), pady=4)
+
+        self.dispatch_options = {"On next frame": "frame", "On result": "callback"}
+        self.dispatch_var = tk.StringVar(self)
+        self.dispatch_var.set("On next frame")
+
+        dispatch_dropdown = tk.OptionMenu(self.other_settings_frame, self.dispatch_var, *self.dispatch_options)
+        dispatch_dropdown.config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            highlightthickness=0, 
+            activebackground=self.fg_accent,
+            font=self.font_body,
+            relief="flat",
+            anchor="w"
+        )
+        dispatch_dropdown["menu"].config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            font=self.font_body,
+            activebackground=self.fg_accent,
+            relief="flat"
+        )
+        dispatch_dropdown.grid(row=3, column=1, sticky="ew", padx=(5, 10), pady=4)
+
+        # Predictive pinch: fire volume/seek steps early when the filtered pinch velocity predicts the threshold crossing
+        lbl_predict = tk.Label(
+            self.other_settings_frame,
+            text="Pinch Prediction",
+            bg=self.bg_panel,
+            fg=self.fg_text,
+            font=self.font_body
+        )
+        lbl_predict.grid(row=4, column=0, sticky="w", padx=(10, 5), pady=4)
+
+        self.predict_var = tk.StringVar(self)
+        self.predict_var.set("Off")
+
+        predict_dropdown = tk.OptionMenu(self.other_settings_frame, self.predict_var, "Off", "On")
+        predict_dropdown.config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            highlightthickness=0, 
+            activebackground=self.fg_accent,
+            font=self.font_body,
+            relief="flat",
+            anchor="w"
+        )
+        predict_dropdown["menu"].config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            font=self.font_body,
+            activebackground=self.fg_accent,
+            relief="flat"
+        )
+        predict_dropdown.grid(row=4, column=1, sticky="ew", padx=(5, 10), pady=4)
+
+        # Recognizer pool: number of recognizer instances taking frames in round-robin (one frame in flight each)
+        lbl_pool = tk.Label(
+            self.other_settings_frame,
+            text="Recognizer Pool",
+            bg=self.bg_panel,
+            fg=self.fg_text,
+            font=self.font_body
+        )
+        lbl_pool.grid(row=5, column=0, sticky="w", padx=(10, 5), pady=4)
+
+        self.pool_var = tk.StringVar(self)
+        self.pool_var.set("1")
+
+        pool_dropdown = tk.OptionMenu(self.other_settings_frame, self.pool_var, "1", "2", "3")
+        pool_dropdown.config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            highlightthickness=0, 
+            activebackground=self.fg_accent,
+            font=self.font_body,
+            relief="flat",
+            anchor="w"
+        )
+        pool_dropdown["menu"].config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            font=self.font_body,
+            activebackground=self.fg_accent,
+            relief="flat"
+        )
+        pool_dropdown.grid(row=5, column=1, sticky="ew", padx=(5, 10), pady=4)
+
+        # Stall threshold: seconds without a camera frame or recognizer result before the watchdog recovers that stage
+        lbl_stall = tk.Label(
+            self.other_settings_frame,
+            text="Stall Threshold",
+            bg=self.bg_panel,
+            fg=self.fg_text,
+            font=self.font_body
+        )
+        lbl_stall.grid(row=6, column=0, sticky="w", padx=(10, 5), pady=4)
+
+        self.stall_options = {"1 s": 1.0, "2 s": 2.0, "5 s": 5.0, "10 s": 10.0}
+        self.stall_var = tk.StringVar(self)
+        self.stall_var.set("2 s")
+
+        stall_dropdown = tk.OptionMenu(self.other_settings_frame, self.stall_var, *self.stall_options)
+        stall_dropdown.config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            highlightthickness=0, 
+            activebackground=self.fg_accent,
+            font=self.font_body,
+            relief="flat",
+            anchor="w"
+        )
+        stall_dropdown["menu"].config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            font=self.font_body,
+            activebackground=self.fg_accent,
+            relief="flat"
+        )
+        stall_dropdown.grid(row=6, column=1, sticky="ew", padx=(5, 10), pady=4)
+
+        # Adaptive quality: the QoS controller scales the inference resolution (and optionally the capture size) with latency
+        lbl_qos = tk.Label(
+            self.other_settings_frame,
+            text="Adaptive Quality",
+            bg=self.bg_panel,
+            fg=self.fg_text,
+            font=self.font_body
+        )
+        lbl_qos.grid(row=7, column=0, sticky="w", padx=(10, 5), pady=4)
+
+        self.qos_options = {"Off": (False, False), "Inference": (True, False), "Inference + Capture": (True, True)}
+        self.qos_var = tk.StringVar(self)
+        self.qos_var.set("Inference")
+
+        qos_dropdown = tk.OptionMenu(self.other_settings_frame, self.qos_var, *self.qos_options)
+        qos_dropdown.config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            highlightthickness=0, 
+            activebackground=self.fg_accent,
+            font=self.font_body,
+            relief="flat",
+            anchor="w"
+        )
+        qos_dropdown["menu"].config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            font=self.font_body,
+            activebackground=self.fg_accent,
+            relief="flat"
+        )
+        qos_dropdown.grid(row=7, column=1, sticky="ew", padx=(5, 10), pady=4)
+
+        # Latency budget of the QoS controller: AI latency / end-to-end latency
+        lbl_budget = tk.Label(
+            self.other_settings_frame,
+            text="Latency Budget",
+            bg=self.bg_panel,
+            fg=self.fg_text,
+            font=self.font_body
+        )
+        lbl_budget.grid(row=8, column=0, sticky="w", padx=(10, 5), pady=4)
+
+        self.budget_options = {"60 / 90 ms": (60, 90), "80 / 110 ms": (80, 110), "120 / 160 ms": (120, 160)}
+        self.budget_var = tk.StringVar(self)
+        self.budget_var.set("80 / 110 ms")
+
+        budget_dropdown = tk.OptionMenu(self.other_settings_frame, self.budget_var, *self.budget_options)
+        budget_dropdown.config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            highlightthickness=0, 
+            activebackground=self.fg_accent,
+            font=self.font_body,
+            relief="flat",
+            anchor="w"
+        )
+        budget_dropdown["menu"].config(
+            bg=self.bg_main, 
+            fg=self.fg_text, 
+            font=self.font_body,
+            activebackground=self.fg_accent,
+            relief="flat"
+        )
+        budget_dropdown.grid(row=8, column=1, sticky="ew", padx=(5, 10), pady=4)
+
+        # Thread placement frame: CPU cores (e.g. "2-3" or "0,2", empty = unpinned) and nice value per pipeline thread
+        self.thread_frame = tk.Frame(self.settings_container, bg=self.bg_panel, bd=1, relief="ridge")
+        self.thread_frame.pack(fill="x", padx=8, pady=(4, 8))
+        self.thread_frame.columnconfigure(1, weight=1)
+
+        for col, heading in enumerate(("Thread", "Cores", "Nice")):
+            tk.Label(self.thread_frame, text=heading, bg=self.bg_panel, fg=self.fg_dim,
+                     font=self.font_body).grid(row=0, column=col, sticky="w", padx=(10, 5), pady=(4, 0))
+
+        self.thread_mappings = dict()
+        for i, role in enumerate(ROLES, start=1):
+            tk.Label(self.thread_frame, text=role, bg=self.bg_panel, fg=self.fg_text,
+                     font=self.font_body).grid(row=i, column=0, sticky="w", padx=(10, 5), pady=2)
+
+            cores_var = tk.StringVar(self)
+            nice_var = tk.StringVar(self)
+            for col, var, width in ((1, cores_var, 8), (2, nice_var, 4)):
+                tk.Entry(
+                    self.thread_frame,
+                    textvariable=var,
+                    bg=self.bg_main,
+                    fg=self.fg_text,
+                    insertbackground=self.fg_text,
+                    font=self.font_body,
+                    relief="flat",
+                    width=width
+                ).grid(row=i, column=col, sticky="ew", padx=(5, 10), pady=2)
+            self.thread_mappings[role] = (cores_var, nice_var)
+
+        # Profiling button: records a 10 s report bundle under profiles/ (also started with SIGUSR1)
+        self.profile_btn = tk.Button(
+            self,
+            text=profiler.status(),
+            command=self.start_profiling,
+            bg=self.bg_panel,
+            fg=self.fg_text,
+            font=self.font_body,
+            bd=1,
+            relief="ridge",
+            cursor="hand2"
+        )
+        self.profile_btn.pack(fill="x", padx=16, pady=(6, 0))
+
         # Apply button
         self.apply_btn = tk.Button(
             self, 
@@ -211,6 +520,42 @@ class settings_page(tk.Frame):
         )
         self.apply_btn.pack(fill="x", padx=16, pady=6)
 
+    def start_profiling(self):
+        """Starts a profiling session and shows the countdown on the button until it finishes."""
+        profiler.start()
+        self.refresh_profile_button()
+
+    def refresh_profile_button(self):
+        self.profile_btn.config(text=profiler.status())
+        if profiler.active:
+            self.after(500, self.refresh_profile_button)
+
+    def load_rules(self, path):
+        """
+        Loads the optional list of gesture rules from a JSON file.
+        Each rule looks like {"action": "Next Track", "gesture": "Thumb up", "hand": "Right", "min_score": 0.8}.
+        Returns an empty list if the file is missing or invalid. Invalid rules are skipped with a warning.
+        """
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                rules = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load gesture rules from {path}: {e}")
+            return []
+        if not isinstance(rules, list):
+            print(f"Could not load gesture rules from {path}: expected a list of rules")
+            return []
+        valid = []
+        for rule in rules:
+            problem = rule_error(rule)
+            if problem:
+                print(f"Skipping gesture rule {rule!r} in {path}: {problem}")
+            else:
+                valid.append(rule)
+        return valid
+
     def save_settings(self):
         """
         Extracts the current settings from the UI elements and returns them as a structured dictionary for application in gesture_processor_logic.py.
@@ -228,7 +573,24 @@ class settings_page(tk.Frame):
                     "Volume cooldown": 0.05,
                     ...
                 },
-                "hand_preference": "Both / No Preference"
+                "hand_preference": "Both / No Preference",
+                "rules": [
+                    {"action": "Next Track", "gesture": "Thumb up", "hand": "Right", "min_score": 0.8},
+                    ...
+                ],
+                "player": {
+                    "backend": "http",
+                    "rc_address": "localhost:4212"
+                },
+                "threads": {
+                    "ai_worker": {"cores": "2-3", "nice": "-5"},
+                    ...
+                },
+                "dispatch_mode": "frame" / "callback",
+                "predictive_pinch": False,
+                "recognizer_pool": 1,
+                "stall_threshold": 2.0,
+                "qos": {"enabled": True, "adapt_capture": False, "ai_budget_ms": 80, "total_budget_ms": 110}
             }
         """
 
@@ -241,9 +603,36 @@ class settings_page(tk.Frame):
         # 3. Extract Hand Preference
         hand_pref = self.hand_pref_var.get()
         
+        # 4. Extract Player Backend
+        player_config = {
+            "backend": self.backend_options.get(self.backend_var.get(), "http"),
+            "rc_address": self.rc_address_var.get().strip()
+        }
+
+        # 5. Extract Thread Placement
+        thread_config = {role: {"cores": cores.get().strip(), "nice": nice.get().strip()}
+                         for role, (cores, nice) in self.thread_mappings.items()}
+
+        # 6. Extract Gesture Dispatch Mode
+        dispatch_mode = self.dispatch_options.get(self.dispatch_var.get(), "frame")
+
+        # 7. Extract Adaptive Quality
+        qos_enabled, adapt_capture = self.qos_options.get(self.qos_var.get(), (True, False))
+        ai_budget, total_budget = self.budget_options.get(self.budget_var.get(), (80, 110))
+        qos_config = {"enabled": qos_enabled, "adapt_capture": adapt_capture,
+                      "ai_budget_ms": ai_budget, "total_budget_ms": total_budget}
+
         # Return as a dictionary
         return {
             "gestures": gesture_config, 
             "cooldowns": cooldown_config,
-            "hand_preference": hand_pref
+            "hand_preference": hand_pref,
+            "rules": self.gesture_rules,
+            "player": player_config,
+            "threads": thread_config,
+            "dispatch_mode": dispatch_mode,
+            "predictive_pinch": self.predict_var.get() == "On",
+            "recognizer_pool": int(self.pool_var.get()),
+            "stall_threshold": self.stall_options.get(self.stall_var.get(), 2.0),
+            "qos": qos_config
         }
\ No newline at end of file
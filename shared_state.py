@@ -0,0 +1,134 @@
+"""
+Low-contention state sharing between the AI worker, MediaPipe's result callback and the GUI.
+Every piece of shared state has exactly one writer thread. A writer never mutates a published object: it builds a new
+immutable snapshot (a namedtuple carrying a version number) and publishes it with a single attribute assignment,
+which is atomic in CPython. Readers take the current reference and never block or see a half-written update.
+Key components:
+- ResultSnapshot: Latest recognizer result, published by result_callback (serialised by RecognizerPool when several
+  recognizer instances deliver results).
+- FrameSnapshot: Capture time of the latest processed frame, published by ai_worker.
+- DecisionSnapshot: Latest gesture decision (action, system power), published by whichever thread owns the processor.
+- SettingsSnapshot: Latest UI settings, published by the GUI and applied to the processor by the thread that owns it.
+- InFlightCounter: Counter of frames submitted to the recognizer and not yet answered (replaces the ai_busy flag). It is
+  the one piece guarded by a lock, as several recognizer callback threads release slots concurrently.
+- DispatchControl: Hands the GestureProcessor between ai_worker ("frame" mode) and the gesture worker ("callback" mode).
+"""
+
+from collections import namedtuple
+from itertools import count
+from threading import Event, Lock
+
+ResultSnapshot = namedtuple("ResultSnapshot", ["version", "result", "ai_latency_ms", "timestamp_us"])
+FrameSnapshot = namedtuple("FrameSnapshot", ["version", "frame_capture_time"])
+DecisionSnapshot = namedtuple("DecisionSnapshot", ["version", "action", "system_active"])
+SettingsSnapshot = namedtuple("SettingsSnapshot", ["version", "settings"])
+
+class InFlightCounter:
+    """
+    Limits the number of frames in flight.
+    Releases come from the recognizer callback threads (one per pool instance) while ai_worker acquires and the
+    watchdog or a pool resize resets, so every check-and-update happens under a small lock. It is held for a few
+    instructions and is uncontended on the per-frame path.
+    - try_acquire(): Takes a slot. Returns False if limit frames are already in flight.
+    - release(): Returns a slot when a result arrives. Never takes the count below zero.
+    - reset(): Forgets every in-flight frame (used when a result will never arrive).
+    - set_limit(limit): Changes the capacity (the recognizer pool size).
+    """
+    def __init__(self, limit=1):
+        self.limit = limit
+        self._count = 0
+        self._lock = Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            if self._count >= self.limit:
+                return False
+            self._count += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            if self._count > 0:
+                self._count -= 1
+
+    def set_limit(self, limit):
+        with self._lock:
+            self.limit = limit
+
+    def reset(self):
+        with self._lock:
+            self._count = 0
+
+    @property
+    def in_flight(self):
+        return self._count
+
+class DispatchControl:
+    """
+    Decides which thread runs the gesture decision, so the GestureProcessor only ever has one writer.
+    - "frame" mode: ai_worker decides on every camera frame using the latest result (the original behaviour).
+    - "callback" mode: the gesture worker decides as soon as result_callback wakes it with a new result.
+    Only ai_worker changes the mode. When it takes the processor back it waits until the gesture worker is idle.
+    The Events are only used to wake and hand over, never on the per-frame path.
+    """
+    def __init__(self):
+        self.callback_mode = False
+        self.wake = Event()
+        self.idle = Event()
+        self.idle.set()
+
+    def set_callback_mode(self, enabled):
+        """Called by ai_worker only."""
+        if enabled == self.callback_mode:
+            return
+        self.callback_mode = enabled
+        if enabled:
+            self.wake.set()
+        else:
+            self.idle.wait(1.0)         # Let the gesture worker finish the result it is deciding on
+
+    def begin(self):
+        """Called by the gesture worker before deciding. Returns False if the processor belongs to ai_worker."""
+        self.idle.clear()
+        if self.callback_mode:          # Checked after clearing idle so a concurrent hand-back waits for end()
+            return True
+        self.idle.set()
+        return False
+
+    def end(self):
+        self.idle.set()
+
+class SharedState:
+    """
+    Shared state between the AI worker thread, the recognizer callback and the main GUI thread.
+    Includes:
+    - result: ResultSnapshot written only by result_callback.
+    - frame: FrameSnapshot written only by ai_worker.
+    - decision: DecisionSnapshot written only by the thread that currently owns the processor (see DispatchControl).
+    - settings: SettingsSnapshot written only by the GUI thread.
+    - in_flight: InFlightCounter gating submissions to the recognizer.
+    - dispatch: DispatchControl deciding which thread runs the gesture decision.
+    - is_running: A flag to control the main loop and allow for graceful shutdown.
+    Writers call the publish_* methods; readers simply read the attributes once and use the snapshot they got.
+    """
+    def __init__(self, max_in_flight=1):
+        self._versions = count(1)           # next() is atomic, so versions are unique across writers
+        self.result = ResultSnapshot(0, None, 0, 0)
+        self.frame = FrameSnapshot(0, 0)
+        self.decision = DecisionSnapshot(0, "Idle", False)
+        self.settings = SettingsSnapshot(0, None)
+        self.in_flight = InFlightCounter(max_in_flight)
+        self.dispatch = DispatchControl()
+        self.is_running = True
+
+    def publish_result(self, result, ai_latency_ms, timestamp_us):
+        self.result = ResultSnapshot(next(self._versions), result, ai_latency_ms, timestamp_us)
+
+    def publish_frame(self, frame_capture_time):
+        self.frame = FrameSnapshot(next(self._versions), frame_capture_time)
+
+    def publish_decision(self, action, system_active):
+        self.decision = DecisionSnapshot(next(self._versions), action, system_active)
+
+    def publish_settings(self, settings):
+        self.settings = SettingsSnapshot(next(self._versions), settings)
@@ -0,0 +1,113 @@
+"""
+Stall watchdog for the capture and inference pipeline.
+Without it a webcam hiccup leaves ai_worker retrying camera.read() forever, and a recognizer callback that never arrives
+keeps every in-flight slot taken, so inference silently stops while the GUI keeps showing the last numbers.
+The watchdog thread checks three per-stage heartbeats a few times per second:
+- frame: The latest successful grab (FrameGrabber.last_grab). Stale -> the camera is reopened.
+- result: The latest completed recognizer frame (RecognizerPool.last_result). Stale while frames are flowing and a frame
+  is in flight -> the recognizers are recreated and the in-flight count is reset. The watchdog only requests this:
+  ai_worker does it before its next submission, as it owns submissions and already rebuilds the pool on a resize.
+- submit: The latest submission (RecognizerPool.last_submit). Stale while frames are flowing and no frame is in flight
+  means ai_worker itself is stuck; that cannot be repaired from outside, so it is only reported.
+The camera is reopened on the watchdog thread, so ai_worker never waits for a camera to open; the properties set through
+the grabber (such as the QoS capture size) are applied to the new camera.
+"""
+
+import time
+from threading import Thread
+
+class Watchdog:
+    """
+    - grabber: The FrameGrabber supplying frames.
+    - pool: The RecognizerPool doing inference.
+    - in_flight: The InFlightCounter gating submissions.
+    - open_camera: Function returning a newly opened cv2.VideoCapture.
+    - threshold: Seconds without a heartbeat before a stage counts as stalled (may be changed at any time).
+    - interval: Seconds between checks.
+    Counters: camera_recoveries, recognizer_recoveries. stalled is the stage currently stalled, or None.
+    """
+    def __init__(self, grabber, pool, in_flight, open_camera, threshold=2.0, interval=0.25):
+        self.grabber = grabber
+        self.pool = pool
+        self.in_flight = in_flight
+        self.open_camera = open_camera
+        self.threshold = threshold
+        self.interval = interval
+        self.camera_recoveries = 0
+        self.recognizer_recoveries = 0
+        self.stalled = None
+        self._grace_until = 0.0
+        self._running = False
+
+    def start(self):
+        self._running = True
+        self._grace_until = time.perf_counter() + 2 * self.threshold        # The first inference loads the model
+        Thread(target=self._run, name="watchdog", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._running = False
+
+    def heartbeats(self, now=None):
+        """Seconds since each stage's latest heartbeat."""
+        now = time.perf_counter() if now is None else now
+        return {"frame": now - self.grabber.last_grab,
+                "submit": now - self.pool.last_submit,
+                "result": now - self.pool.last_result}
+
+    def check(self, now=None):
+        """
+        Finds the stalled stage, if any. The camera comes first: without frames nothing is submitted or answered.
+        Returns:
+            str or None: "frame", "result" or "submit".
+        """
+        now = time.perf_counter() if now is None else now
+        if now < self._grace_until:
+            return None
+        ages = self.heartbeats(now)
+        if ages["frame"] > self.threshold:
+            return "frame"
+        if ages["result"] > self.threshold and self.in_flight.in_flight > 0:
+            return "result"
+        if ages["submit"] > self.threshold and self.in_flight.in_flight == 0:
+            return "submit"
+        return None
+
+    def recover(self, stage):
+        """Repairs a stalled stage. Returns True if a recovery was attempted."""
+        try:
+            if stage == "frame":
+                self.grabber.reopen(self.open_camera())
+                self.camera_recoveries += 1
+            elif stage == "result":
+                self.pool.request_recreate()
+                self.recognizer_recoveries += 1
+            else:
+                return False
+        except Exception as e:
+            print(f"Watchdog: recovering the {stage} stage failed: {e}")
+            return False
+        finally:
+            self._grace_until = time.perf_counter() + self.threshold
+        return True
+
+    def _run(self):
+        while self._running:
+            time.sleep(self.interval)
+            stage = self.check()
+            if stage != self.stalled:
+                if stage:
+                    print(f"Watchdog: no {stage} heartbeat for over {self.threshold:.1f} s")
+                self.stalled = stage
+            if stage:
+                self.recover(stage)
+
+    @property
+    def recoveries(self):
+        return self.camera_recoveries + self.recognizer_recoveries
+
+    def status(self):
+        """Short text for the dashboard, e.g. "OK (2 recovered)" or "STALLED: result"."""
+        if self.stalled:
+            return f"STALLED: {self.stalled}"
+        return f"OK ({self.recoveries} recovered)" if self.recoveries else "OK"
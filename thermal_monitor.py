@@ -0,0 +1,148 @@
+"""
+Thermal-aware throttling of the inference pipeline.
+The SoC temperature is read from the Linux thermal sysfs tree (/sys/class/thermal/thermal_zone*/temp, in millidegrees).
+As it climbs towards the firmware's own throttling point (80 C on the Raspberry Pi 4/5), the monitor steps up a throttle
+level. Each level caps the inference rate and sets a floor on the QoS resolution level, so the load drops gradually
+before the SoC throttles itself and latency spikes unpredictably.
+The sysfs root is configurable (constructor argument, or the THERMAL_ROOT environment variable for the app), so a fake
+tree can stand in for the real one:
+    python thermal_monitor.py --demo                   # Ramps a fake zone through every level
+    python thermal_monitor.py --root /tmp/fake_thermal  # Prints the readings of another tree
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+THERMAL_ROOT = os.environ.get("THERMAL_ROOT", "/sys/class/thermal")
+PREFERRED_ZONES = ("cpu-thermal", "cpu_thermal", "soc-thermal", "x86_pkg_temp")
+
+# (enter at C, max inference fps, minimum QoS resolution level). Level 0 is unthrottled.
+THROTTLE_STEPS = [
+    (70.0, 20, 1),
+    (75.0, 15, 2),
+    (78.0, 10, 3),
+]
+
+class ThermalMonitor:
+    """
+    Reads the SoC temperature and maps it to a throttle level with hysteresis.
+    - root: Thermal sysfs root. The zone is picked by type (PREFERRED_ZONES), else the hottest zone is used.
+    - steps: THROTTLE_STEPS style list, coolest first.
+    - hysteresis: Degrees below a step's entry temperature before that step is left again.
+    - interval: Seconds between sysfs reads.
+    When no thermal zone is readable the temperature is None and the level stays 0.
+    """
+    def __init__(self, root=THERMAL_ROOT, steps=THROTTLE_STEPS, hysteresis=3.0, interval=1.0):
+        self.root = root
+        self.steps = list(steps)
+        self.hysteresis = hysteresis
+        self.interval = interval
+        self.temperature = None
+        self.level = 0
+        self.changes = 0
+        self.last_read = 0.0
+        self.zone_paths = self._find_zones()
+
+    def _find_zones(self):
+        """The temp file of the preferred SoC zone, or of every zone when none matches by type."""
+        zones = sorted(glob.glob(os.path.join(self.root, "thermal_zone*")))
+        for zone in zones:
+            try:
+                with open(os.path.join(zone, "type")) as f:
+                    if f.read().strip() in PREFERRED_ZONES:
+                        return [os.path.join(zone, "temp")]
+            except OSError:
+                continue
+        return [os.path.join(zone, "temp") for zone in zones]
+
+    def read_temperature(self):
+        """Current temperature in degrees C (the hottest of the monitored zones), or None if it cannot be read."""
+        readings = []
+        for path in self.zone_paths:
+            try:
+                with open(path) as f:
+                    readings.append(int(f.read().strip()) / 1000.0)
+            except (OSError, ValueError):
+                continue
+        return max(readings) if readings else None
+
+    def update(self, now=None):
+        """
+        Reads the temperature if the read interval has passed and updates the throttle level.
+        Returns:
+            bool: True if the throttle level changed.
+        """
+        now = time.perf_counter() if now is None else now
+        if now - self.last_read < self.interval:
+            return False
+        self.last_read = now
+        self.temperature = self.read_temperature()
+        if self.temperature is None:
+            return self._set_level(0)
+
+        level = self.level
+        # Step up as soon as the next step's temperature is reached, step down only once clearly below the current one
+        while level < len(self.steps) and self.temperature >= self.steps[level][0]:
+            level += 1
+        while level > 0 and self.temperature < self.steps[level - 1][0] - self.hysteresis:
+            level -= 1
+        return self._set_level(level)
+
+    def _set_level(self, level):
+        if level == self.level:
+            return False
+        self.level = level
+        self.changes += 1
+        print(f"Thermal: {self.status()} -> max {self.max_fps or 'unlimited'} fps, resolution level >= {self.min_resolution_level}")
+        return True
+
+    @property
+    def max_fps(self):
+        """Inference rate cap of the current level, or None when unthrottled."""
+        return self.steps[self.level - 1][1] if self.level else None
+
+    @property
+    def min_interval(self):
+        """Minimum seconds between recognizer submissions at the current level."""
+        return 1.0 / self.max_fps if self.level else 0.0
+
+    @property
+    def min_resolution_level(self):
+        return self.steps[self.level - 1][2] if self.level else 0
+
+    def status(self):
+        """Short text for the dashboard, e.g. "71.2 C"."""
+        return "--" if self.temperature is None else f"{self.temperature:.1f} C"
+
+def write_fake_zone(root, temperature, zone_type="cpu-thermal"):
+    """Creates or updates a one-zone fake thermal tree under root (for the demo and for testing without a Pi)."""
+    zone = os.path.join(root, "thermal_zone0")
+    os.makedirs(zone, exist_ok=True)
+    with open(os.path.join(zone, "type"), "w") as f:
+        f.write(zone_type + "\n")
+    with open(os.path.join(zone, "temp"), "w") as f:
+        f.write(f"{int(temperature * 1000)}\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read the SoC temperature and show the resulting throttle level.")
+    parser.add_argument("--root", default=THERMAL_ROOT, help="Thermal sysfs root")
+    parser.add_argument("--demo", action="store_true", help="Ramp a fake thermal zone from 60 C to 82 C and back")
+    args = parser.parse_args()
+
+    if args.demo:
+        root = tempfile.mkdtemp(prefix="fake_thermal_")
+        ramp = [60 + i for i in range(23)] + [82 - i for i in range(23)]
+        write_fake_zone(root, ramp[0])
+        monitor = ThermalMonitor(root, interval=0.0)
+        for temperature in ramp:
+            write_fake_zone(root, temperature)
+            monitor.update()
+            print(f"{temperature:5.1f} C -> level {monitor.level}")
+    else:
+        monitor = ThermalMonitor(args.root, interval=0.0)
+        monitor.update()
+        print(f"Zones: {', '.join(monitor.zone_paths) or 'none found'}")
+        print(f"Temperature: {monitor.status()}, throttle level {monitor.level}")
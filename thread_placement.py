@@ -0,0 +1,160 @@
+"""
+CPU affinity and scheduling niceness for the pipeline threads.
+Each thread role can be pinned to a set of cores and given a nice value so our threads stop competing with
+VLC's decoder threads. Linux only: os.sched_setaffinity / os.setpriority act on the calling thread, so every
+thread applies its own placement through placement.apply(role), which is a cheap no-op once applied.
+Roles:
+- frame_grabber: Continuous camera grabbing (frame_grabber.py).
+- ai_worker: Frame processing and inference submission (main.py).
+- gesture_worker: Gesture decisions in the "callback" dispatch mode (main.py).
+- input_worker: VLC command sender (input_handler.py).
+- mediapipe_callback: MediaPipe's result callback thread(s). MediaPipe starts its graph threads when a recognizer is
+  created and they inherit the creating thread's placement, so recognizers are created inside
+  placement.applied("mediapipe_callback") (main.py) whichever thread builds them: the GUI thread at startup, ai_worker
+  on a pool resize or a watchdog-requested recreate.
+- gui: The Tk mainloop thread.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+ROLES = ("frame_grabber", "ai_worker", "gesture_worker", "input_worker", "mediapipe_callback", "gui")
+SUPPORTED = hasattr(os, "sched_setaffinity") and hasattr(os, "setpriority")
+
+# Placement the process started with, restored on threads whose role setting is cleared
+DEFAULT_CORES = os.sched_getaffinity(0) if SUPPORTED else None
+DEFAULT_NICE = os.getpriority(os.PRIO_PROCESS, 0) if SUPPORTED else None
+
+def parse_cores(text):
+    """
+    Parses a core list such as "2-3" or "0,2" into a set of ints.
+    Returns None for an empty string, meaning "the process's original affinity".
+    Raises:
+        - ValueError for malformed input.
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    cores = set()
+    for part in text.split(","):
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cores.update(range(int(start), int(end) + 1))
+        else:
+            cores.add(int(part))
+    return cores
+
+class ThreadPlacement:
+    """
+    Holds the per-role placement settings and applies them from inside each thread.
+    Expected config format:
+    {
+        "ai_worker": {"cores": "2-3", "nice": -5},
+        "input_worker": {"cores": "1", "nice": 0},
+        ...
+    }
+    A role with empty cores gets the affinity the process started with (DEFAULT_CORES); a nice value of None gets the
+    process's original niceness (DEFAULT_NICE). Clearing a setting therefore undoes an earlier placement.
+    The effective placement of every thread is kept in self.report and printed when it changes.
+    """
+    def __init__(self):
+        self.config = {}
+        self.generation = 0
+        self.report = {}
+        self._applied = {}          # native thread id -> generation applied
+        self._lock = threading.Lock()
+
+    def configure(self, config):
+        """Stores new placement settings. Threads pick them up the next time they call apply()."""
+        parsed = {}
+        for role in ROLES:
+            entry = config.get(role, {})
+            try:
+                cores = parse_cores(entry.get("cores"))
+            except ValueError:
+                print(f"Thread placement: ignoring invalid core list for {role}: {entry.get('cores')!r}")
+                cores = None
+            nice = entry.get("nice")
+            try:
+                nice = int(nice) if nice not in (None, "") else None
+            except ValueError:
+                print(f"Thread placement: ignoring invalid nice value for {role}: {nice!r}")
+                nice = None
+            parsed[role] = {"cores": cores, "nice": nice}
+        if parsed != self.config:
+            self.config = parsed
+            self.generation += 1
+
+    def apply(self, role):
+        """Applies the placement for role to the calling thread if it has not been applied since the last configure()."""
+        tid = threading.get_native_id()
+        if self._applied.get(tid) == self.generation:
+            return
+        self._applied[tid] = self.generation
+        if not SUPPORTED:
+            self._record(role, tid, None, None, "unsupported on this platform")
+            return
+
+        entry = self.config.get(role, {})
+        errors = self._set(tid, entry.get("cores") or DEFAULT_CORES,
+                           DEFAULT_NICE if entry.get("nice") is None else entry["nice"])
+        self._record(role, tid, sorted(os.sched_getaffinity(0)), os.getpriority(os.PRIO_PROCESS, tid), "; ".join(errors))
+
+    @contextmanager
+    def applied(self, role):
+        """
+        Applies the placement for role to the calling thread for the duration of the block, then restores the thread's
+        previous affinity and niceness. Threads started inside the block inherit the role's placement.
+        """
+        if not SUPPORTED:
+            yield
+            return
+        tid = threading.get_native_id()
+        cores, nice = os.sched_getaffinity(0), os.getpriority(os.PRIO_PROCESS, tid)
+        entry = self.config.get(role, {})
+        errors = self._set(tid, entry.get("cores") or DEFAULT_CORES,
+                           DEFAULT_NICE if entry.get("nice") is None else entry["nice"])
+        try:
+            yield
+        finally:
+            errors += self._set(tid, cores, nice)
+            if errors:
+                print(f"Thread placement: {role} (temporary on tid {tid}): {'; '.join(errors)}")
+
+    @staticmethod
+    def _set(tid, cores, nice):
+        """Sets the calling thread's affinity and niceness. Returns the error messages."""
+        errors = []
+        if cores != os.sched_getaffinity(0):
+            try:
+                os.sched_setaffinity(0, cores)                  # 0 = the calling thread on Linux
+            except (OSError, ValueError) as e:
+                errors.append(f"affinity: {e}")
+        if nice != os.getpriority(os.PRIO_PROCESS, tid):
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, nice)
+            except OSError as e:                                # Lowering niceness needs CAP_SYS_NICE
+                errors.append(f"nice: {e}")
+        return errors
+
+    def _record(self, role, tid, cores, nice, error):
+        with self._lock:
+            previous = self.report.get(role)
+            self.report[role] = {"tid": tid, "cores": cores, "nice": nice, "error": error}
+        if previous != self.report[role]:
+            print(f"Thread placement: {self.describe_role(role)}")
+
+    def describe_role(self, role):
+        entry = self.report.get(role)
+        if entry is None:
+            return f"{role}: not started"
+        text = f"{role} (tid {entry['tid']}): cores {entry['cores']}, nice {entry['nice']}"
+        return text + (f" [{entry['error']}]" if entry["error"] else "")
+
+    def describe(self):
+        """One line per role with its effective placement."""
+        return "\n".join(self.describe_role(role) for role in ROLES)
+
+# Shared instance used by every thread
+placement = ThreadPlacement()
@@ -1,5 +1,34 @@
+import math
+import os
 import time
 
+def find_model(model_path="gesture_recognizer.task"):
+    """
+    Locates the gesture recognizer model.
+    Args:
+        model_path (str): Preferred path, relative to the working directory.
+    Returns:
+        str: model_path if it exists, otherwise the default install location under ~/arm/arm_project.
+    """
+    if os.path.exists(model_path):
+        return model_path
+    return os.path.expanduser(os.path.join("~/arm/arm_project", os.path.basename(model_path)))
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a sequence of numbers.
+    Args:
+        values (iterable): The samples.
+        pct (float): The percentile to compute, 0-100.
+    Returns:
+        float: The percentile value, or 0 if there are no samples.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
 class GestureCooldown:
     """
     Utility class to manage cooldowns for gestures.
@@ -27,6 +56,8 @@ class PerformanceMonitor:
     def __init__(self):
         self.inference_times = []
         self.total_latencies = []
+        self.decision_latencies = []
+        self.frame_ages = []
         self.fps = 0
         self.last_fps_update = time.time()
         self.frame_count = 0
@@ -53,10 +84,70 @@ class PerformanceMonitor:
             self.frame_count = 0
             self.last_fps_update = time.time()
 
+    def record_inference(self, ai_ms):
+        """
+        Records the AI latency (frame capture to recognizer result) of one frame.
+        Args:
+            ai_ms (float): The measured latency in milliseconds.
+        """
+        self.inference_times.append(ai_ms)
+        if len(self.inference_times) > 30:
+            self.inference_times.pop(0)
+
+    def clear_inference(self):
+        """Drops the recorded AI latencies, so later averages only cover frames recorded from now on."""
+        self.inference_times = []
+
+    def record_decision(self, decision_ms):
+        """
+        Records the end-to-end latency from frame capture to the gesture decision for one recognizer result.
+        Args:
+            decision_ms (float): The measured latency in milliseconds.
+        """
+        self.decision_latencies.append(decision_ms)
+        if len(self.decision_latencies) > 30:
+            self.decision_latencies.pop(0)
+
+    def get_decision_latency(self):
+        """
+        Returns:
+            float: Average capture-to-decision latency in milliseconds.
+        """
+        decisions = list(self.decision_latencies)
+        return sum(decisions) / len(decisions) if decisions else 0
+
+    def record_frame_age(self, age_ms):
+        """
+        Records how old a camera frame was when the AI worker received it.
+        Args:
+            age_ms (float): Milliseconds between the frame grab and the hand-off.
+        """
+        self.frame_ages.append(age_ms)
+        if len(self.frame_ages) > 30:
+            self.frame_ages.pop(0)
+
+    def get_frame_age(self):
+        """
+        Returns:
+            float: Average frame age at hand-off in milliseconds.
+        """
+        ages = list(self.frame_ages)
+        return sum(ages) / len(ages) if ages else 0
+
     def get_stats(self):
         """
         Returns:
             tuple: A tuple containing the current FPS and average latency.
         """
         avg_total = sum(self.total_latencies) / len(self.total_latencies) if self.total_latencies else 0
-        return self.fps, avg_total
\ No newline at end of file
+        return self.fps, avg_total
+
+    def get_latency_stats(self):
+        """
+        Returns:
+            tuple: Average AI latency and average end-to-end latency (AI latency plus loop processing time) in milliseconds.
+        """
+        inference = list(self.inference_times)
+        avg_ai = sum(inference) / len(inference) if inference else 0
+        _, avg_loop = self.get_stats()
+        return avg_ai, avg_ai + avg_loop
\ No newline at end of file
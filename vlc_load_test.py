@@ -0,0 +1,132 @@
+"""
+Load driver for input_handler.py against the local VLC stand-in (vlc_stub.py).
+It pushes realistic command bursts (pinch volume/seek streams interleaved with discrete actions) through async_typer
+and reports throughput, queue backlog and end-to-end latency percentiles.
+Latency is taken from the command queue's own metrics: queue wait (enqueue to dequeue) and service time
+(enqueue to request completed), alongside the deadline and overflow drop counters.
+The player state at the end is compared with the net volume steps sent, so a backend that treats steps as absolute
+values shows up. --backend rc drives the RC socket backend against the RC stub instead of the web interface.
+Run with: python vlc_load_test.py --bursts 20 --latency 0.02 --error-rate 0.05
+"""
+
+import argparse
+import random
+import time
+from threading import Event, Thread
+
+import input_handler
+from utilities import percentile
+from vlc_stub import FaultProfile, RCStubServer, VLCStubServer
+
+def generate_bursts(count, seed=0):
+    """
+    Builds a list of bursts, each a list of (delay_before_seconds, key) pairs.
+    Pinch bursts emit 10-40 volume or seek steps at the pinch cooldown rate, discrete bursts emit a single action.
+    """
+    rng = random.Random(seed)
+    bursts = []
+    for _ in range(count):
+        if rng.random() < 0.7:
+            key = rng.choice(["up", "down", "right", "left"])
+            step = rng.uniform(0.01, 0.05)
+            bursts.append([(step, key) for _ in range(rng.randint(10, 40))])
+        else:
+            bursts.append([(0.0, rng.choice(["space", "next", "prev"]))])
+    return bursts
+
+def run_load(bursts, pause_between=0.3):
+    """
+    Replays the bursts through async_typer while sampling the queue depth.
+    Returns:
+        - enqueued: List of (perf_counter timestamp, key) for every command pushed.
+        - depths: List of sampled queue depths.
+        - elapsed: Wall time (seconds) from the first command until the queue drained.
+    """
+    enqueued, depths = [], []
+    done = Event()
+
+    def sampler():
+        while not done.is_set():
+            depths.append(input_handler.input_queue.qsize())
+            time.sleep(0.005)
+
+    sampler_thread = Thread(target=sampler, daemon=True)
+    sampler_thread.start()
+
+    start = time.perf_counter()
+    for burst in bursts:
+        for delay, key in burst:
+            if delay > 0:
+                time.sleep(delay)
+            enqueued.append((time.perf_counter(), key))
+            input_handler.async_typer(key)
+        time.sleep(pause_between)
+
+    input_handler.input_queue.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler_thread.join()
+    return enqueued, depths, elapsed
+
+def report(enqueued, served, depths, elapsed, player):
+    """Prints throughput, backlog, drops, tail latency and the final player state for a finished run."""
+    stats = input_handler.input_queue.stats()
+    services = list(input_handler.input_queue.metrics.service_ms)
+    waits = list(input_handler.input_queue.metrics.wait_ms)
+
+    outcomes = {}
+    for entry in served:
+        outcomes[entry[3]] = outcomes.get(entry[3], 0) + 1
+    dropped = stats["dropped_expired"] + stats["dropped_overflow"] + stats["dropped_flushed"]
+
+    print(f"Commands sent       : {len(enqueued)} (stub received {len(served)}, outcomes {outcomes})")
+    print(f"Throughput          : {len(served) / elapsed:.1f} cmd/s over {elapsed:.2f} s")
+    print(f"Queue backlog       : max {max(depths, default=0)}, mean {sum(depths) / len(depths) if depths else 0:.1f}")
+    print(f"Dropped             : {dropped} (expired {stats['dropped_expired']}, overflow {stats['dropped_overflow']}, flushed {stats['dropped_flushed']})")
+    print(f"Wait p50/p95/p99    : {percentile(waits, 50):.1f} / {percentile(waits, 95):.1f} / {percentile(waits, 99):.1f} ms")
+    print(f"Latency p50/p95/p99 : {percentile(services, 50):.1f} / {percentile(services, 95):.1f} / {percentile(services, 99):.1f} ms")
+    print(f"Latency max         : {max(services, default=0):.1f} ms")
+
+    # Every applied step moves the volume by 5 from 256: "+5"/"-5" over HTTP, an absolute "volume N" over RC
+    net_steps, volume = 0, 256
+    for entry in served:
+        if entry[3] != 200 or entry[1] != "volume" or entry[2] is None:
+            continue
+        if entry[2] in ("+5", "-5"):
+            net_steps += 1 if entry[2] == "+5" else -1
+        else:
+            net_steps += 1 if int(entry[2]) > volume else -1
+            volume = int(entry[2])
+    print(f"Player volume       : {player.volume} after {net_steps:+d} net volume steps from 256 (expected {256 + 5 * net_steps})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive input_handler.py against the local VLC stand-in.")
+    parser.add_argument("--bursts", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--down-every", type=float, default=0.0)
+    parser.add_argument("--down-for", type=float, default=0.0)
+    parser.add_argument("--backend", choices=["http", "rc"], default="http")
+    args = parser.parse_args()
+
+    faults = FaultProfile(args.latency, args.jitter, args.error_rate, args.down_every, args.down_for)
+
+    # Point the handler at the stub instead of a real VLC instance
+    if args.backend == "rc":
+        stub = RCStubServer("127.0.0.1:0", faults=faults).start()
+        input_handler.configure_player({"backend": "rc", "rc_address": stub.address})
+    else:
+        stub = VLCStubServer(port=0, faults=faults).start()
+        input_handler.VLC_IP = "127.0.0.1"
+        input_handler.VLC_PORT = str(stub.port)
+        input_handler.VLC_AUTH = ("", stub.password)
+    input_handler.input_queue.metrics = input_handler.QueueMetrics(window=100000)      # Keep every sample for the report
+
+    try:
+        enqueued, depths, elapsed = run_load(generate_bursts(args.bursts, args.seed))
+        time.sleep(0.1)     # Let in-flight handler threads finish logging
+        report(enqueued, stub.command_log(), depths, elapsed, stub.player)
+    finally:
+        stub.stop()
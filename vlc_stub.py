@@ -0,0 +1,403 @@
+"""
+Local stand-in for VLC's web interface, used to test input_handler.py without a real VLC instance.
+It implements the /requests/status.xml commands the controller sends (pl_pause, pl_next, pl_previous, volume, seek),
+keeps a consistent player state and answers with the same XML layout VLC uses.
+Key components:
+- PlayerState: Minimal model of the VLC player (play state, playlist position, volume, playback time).
+- FaultProfile: Configurable response latency, error rate and periodic downtime.
+- VLCStubServer: Threaded HTTP server that serves status.xml and records every request it receives.
+- RCStubServer: Line-based stand-in for VLC's RC interface over TCP or a Unix socket, sharing the same player model.
+  It follows the RC semantics, which differ from status.xml: "volume X" and "seek X" are absolute, relative volume
+  changes are "volup"/"voldown", and the playback time is read with "get_time".
+Run standalone with: python vlc_stub.py --port 8080 --rc-address 127.0.0.1:4212 --latency 0.02 --error-rate 0.05
+"""
+
+import argparse
+import base64
+import os
+import random
+import socketserver
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import unquote, urlsplit
+
+STUB_PASSWORD = "raspberry"
+MAX_VOLUME = 512
+VOLUME_STEP = 12.8          # VLC's default --volume-step, in the same units as the volume (256 = 100 %)
+
+def _rc_number(val):
+    """Parses an RC argument the way VLC's atoi()/atof() do: a leading sign is just a sign, garbage reads as 0."""
+    try:
+        return float(val)
+    except ValueError:
+        return 0.0
+
+class PlayerState:
+    """
+    Minimal model of the VLC player state exposed through status.xml.
+    Playback time advances with the wall clock while the state is "playing".
+    """
+    def __init__(self, playlist_length=5, track_length=240):
+        self.lock = Lock()
+        self.state = "paused"
+        self.volume = 256
+        self.playlist_length = playlist_length
+        self.track_length = track_length
+        self.current_item = 0
+        self._time_base = 0.0
+        self._time_anchor = time.monotonic()
+
+    def _current_time(self):
+        if self.state == "playing":
+            return self._time_base + (time.monotonic() - self._time_anchor)
+        return self._time_base
+
+    def _set_time(self, seconds):
+        self._time_base = max(0.0, min(float(seconds), float(self.track_length)))
+        self._time_anchor = time.monotonic()
+
+    def apply(self, command, val):
+        """
+        Applies a single status.xml command to the player state.
+        Parameters:
+            - command: The VLC command name (e.g. "pl_pause", "volume").
+            - val: The raw "val" query argument, or None if it was not supplied.
+        Returns:
+            - True if the command was understood, False otherwise.
+        """
+        with self.lock:
+            if command == "pl_pause":
+                self._set_time(self._current_time())
+                self.state = "paused" if self.state == "playing" else "playing"
+            elif command == "pl_next":
+                self.current_item = (self.current_item + 1) % self.playlist_length
+                self._set_time(0)
+            elif command == "pl_previous":
+                self.current_item = (self.current_item - 1) % self.playlist_length
+                self._set_time(0)
+            elif command == "volume" and val:
+                self.volume = self._resolve(val, self.volume, MAX_VOLUME)
+            elif command == "seek" and val:
+                self._set_time(self._resolve(val, self._current_time(), self.track_length))
+            else:
+                return False
+            return True
+
+    def apply_rc(self, name, val):
+        """
+        Applies a single RC interface command to the player state, with the RC semantics: the argument of "volume" and
+        "seek" is absolute (a leading "+" is ignored like VLC's atoi() does), "volup"/"voldown" take a number of steps.
+        Parameters:
+            - name: The RC command name (e.g. "pause", "volup").
+            - val: The first argument, or None if it was not supplied.
+        Returns:
+            - The reply text (without the prompt), or None if the command is unknown.
+        """
+        if name in RC_PLAYLIST_COMMANDS:
+            self.apply(RC_PLAYLIST_COMMANDS[name], None)
+            return ""
+        with self.lock:
+            if name == "volume":
+                if val is not None:
+                    self.volume = int(max(0, min(_rc_number(val), MAX_VOLUME)))
+                return f"{self.volume}\n"
+            if name in ("volup", "voldown"):
+                steps = _rc_number(val) if val else 1
+                sign = 1 if name == "volup" else -1
+                self.volume = int(max(0, min(round(self.volume + sign * steps * VOLUME_STEP), MAX_VOLUME)))
+                return f"( audio volume: {self.volume} )\n"
+            if name == "seek":
+                if val and val.endswith("%"):
+                    self._set_time(_rc_number(val[:-1]) * self.track_length / 100)
+                elif val:
+                    self._set_time(_rc_number(val))
+                return ""
+            if name == "get_time":
+                return f"{int(self._current_time())}\n"
+            return None
+
+    @staticmethod
+    def _resolve(val, current, full_scale):
+        """Resolves VLC style values: "+5"/"-5" are relative, "50%" is a fraction of full scale, anything else is absolute."""
+        val = val.strip()
+        relative = val[0] in "+-"
+        if val.endswith("%"):
+            amount = float(val[:-1]) * full_scale / 100
+        else:
+            amount = float(val)
+        target = current + amount if relative else amount
+        return int(max(0, min(target, full_scale)))
+
+    def to_xml(self):
+        """Serialises the current state using the same element layout as VLC's status.xml."""
+        with self.lock:
+            now = self._current_time()
+            position = now / self.track_length if self.track_length else 0
+            return (
+                '<?xml version="1.0" encoding="utf-8" standalone="yes" ?>\n'
+                "<root>\n"
+                "<fullscreen>false</fullscreen>\n"
+                "<apiversion>3</apiversion>\n"
+                f"<currentplid>{self.current_item}</currentplid>\n"
+                f"<time>{int(now)}</time>\n"
+                f"<volume>{self.volume}</volume>\n"
+                f"<length>{self.track_length}</length>\n"
+                "<random>false</random>\n"
+                f"<state>{self.state}</state>\n"
+                "<loop>false</loop>\n"
+                f"<position>{position:.4f}</position>\n"
+                "<rate>1</rate>\n"
+                "<repeat>false</repeat>\n"
+                "<version>3.0.18 Stub</version>\n"
+                "</root>\n"
+            )
+
+class FaultProfile:
+    """
+    Fault injection settings for the stub.
+    - latency: Fixed delay (seconds) added before every response.
+    - jitter: Extra uniformly distributed delay (seconds) on top of latency.
+    - error_rate: Probability (0-1) of answering with HTTP 500 instead of executing the command.
+    - down_every / down_for: Every down_every seconds the stub goes "down" for down_for seconds and drops connections without answering.
+    """
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, down_every=0.0, down_for=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.down_every = down_every
+        self.down_for = down_for
+        self.started_at = time.monotonic()
+
+    def is_down(self):
+        if self.down_every <= 0 or self.down_for <= 0:
+            return False
+        return (time.monotonic() - self.started_at) % self.down_every >= self.down_every - self.down_for
+
+    def delay(self):
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter > 0 else 0)
+
+    def should_fail(self):
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Request handler bound to a VLCStubServer instance through self.server."""
+
+    def log_message(self, format, *args):
+        pass        # Keep the console quiet under load
+
+    def do_GET(self):
+        stub = self.server.stub
+        arrived = time.perf_counter()
+        parts = urlsplit(self.path)
+
+        # Manual query parsing: VLC treats "+5" literally, parse_qs would turn the '+' into a space
+        params = {}
+        for pair in parts.query.split("&"):
+            if "=" in pair:
+                key, value = pair.split("=", 1)
+                params[unquote(key)] = unquote(value)
+        command = params.get("command")
+
+        if stub.faults.is_down():
+            stub.record(arrived, command, params.get("val"), "down")
+            self.close_connection = True        # Behave like an unreachable player
+            return
+
+        if not self._authorised():
+            stub.record(arrived, command, params.get("val"), 401)
+            self.send_response(401)
+            self.send_header("WWW-Authenticate", 'Basic realm="VLC stream"')
+            self.end_headers()
+            return
+
+        delay = stub.faults.delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        if parts.path != "/requests/status.xml":
+            stub.record(arrived, command, params.get("val"), 404)
+            self.send_error(404)
+            return
+
+        if stub.faults.should_fail():
+            stub.record(arrived, command, params.get("val"), 500)
+            self.send_error(500)
+            return
+
+        if command:
+            stub.player.apply(command, params.get("val"))
+        stub.record(arrived, command, params.get("val"), 200)
+
+        body = stub.player.to_xml().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorised(self):
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return False
+        try:
+            _, password = base64.b64decode(header[6:]).decode("utf-8").split(":", 1)
+        except Exception:
+            return False
+        return password == self.server.stub.password
+
+class VLCStubServer:
+    """
+    Threaded stand-in for VLC's web interface.
+    Every received request is appended to request_log as (arrival_perf_counter, command, val, outcome),
+    where outcome is the HTTP status code or "down" when the request was dropped by injected downtime.
+    """
+    def __init__(self, host="127.0.0.1", port=8080, password=STUB_PASSWORD, faults=None, player=None):
+        self.password = password
+        self.faults = faults or FaultProfile()
+        self.player = player or PlayerState()
+        self.request_log = []
+        self._log_lock = Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    def record(self, arrived, command, val, outcome):
+        with self._log_lock:
+            self.request_log.append((arrived, command, val, outcome))
+
+    def command_log(self):
+        """Returns a copy of the logged requests that carried a command (status polls are skipped)."""
+        with self._log_lock:
+            return [entry for entry in self.request_log if entry[1]]
+
+    def start(self):
+        self.faults.started_at = time.monotonic()
+        self._thread = Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+# RC playlist commands mapped to the equivalent status.xml commands; the rest are handled by PlayerState.apply_rc()
+RC_PLAYLIST_COMMANDS = {
+    "pause": "pl_pause",
+    "next": "pl_next",
+    "prev": "pl_previous",
+}
+RC_COMMANDS = set(RC_PLAYLIST_COMMANDS) | {"volume", "volup", "voldown", "seek", "get_time"}
+RC_QUERIES = {"volume", "get_time"}         # Answer without changing the player when given no argument
+RC_BANNER = "VLC media player 3.0.18 Stub\nCommand Line Interface initialized. Type `help' for help.\n"
+RC_PROMPT = "> "
+
+class _RCHandler(socketserver.StreamRequestHandler):
+    """Handles one persistent RC client connection: one command per line, every reply terminated by the prompt."""
+
+    def handle(self):
+        stub = self.server.stub
+        self.wfile.write((RC_BANNER + RC_PROMPT).encode("utf-8"))
+        for raw in self.rfile:
+            arrived = time.perf_counter()
+            parts = raw.decode("utf-8", "replace").split()
+            if not parts:
+                self.wfile.write(RC_PROMPT.encode("utf-8"))
+                continue
+            name, val = parts[0], (parts[1] if len(parts) > 1 else None)
+            command = name if name in RC_COMMANDS else None
+
+            if stub.faults.is_down():
+                stub.record(arrived, command, val, "down")
+                return          # Drop the connection like a player that went away
+
+            delay = stub.faults.delay()
+            if delay > 0:
+                time.sleep(delay)
+
+            if command is None:
+                reply = f"Unknown command `{name}'. Type `help' for help.\n"
+                outcome = "unknown"
+            elif stub.faults.should_fail():
+                reply = f"Error in `{name}' command.\n"
+                outcome = 500
+            else:
+                reply, outcome = stub.player.apply_rc(name, val), 200
+                if name in RC_QUERIES and val is None:
+                    command = None          # A query, not a command
+            stub.record(arrived, command, val, outcome)
+            self.wfile.write((reply + RC_PROMPT).encode("utf-8"))
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class RCStubServer(VLCStubServer):
+    """
+    Stand-in for VLC's RC interface. address is "host:port" for TCP (port 0 picks a free port) or a Unix socket path.
+    Shares the request log format and fault profile with VLCStubServer.
+    """
+    def __init__(self, address="127.0.0.1:4212", faults=None, player=None):
+        self.password = None
+        self.faults = faults or FaultProfile()
+        self.player = player or PlayerState()
+        self.request_log = []
+        self._log_lock = Lock()
+        self._thread = None
+        if ":" in address and not address.startswith("/"):
+            host, port = address.rsplit(":", 1)
+            self._httpd = _ThreadingTCPServer((host, int(port)), _RCHandler)
+            self.unix_path = None
+        else:
+            if os.path.exists(address):
+                os.unlink(address)
+            self._httpd = _ThreadingUnixServer(address, _RCHandler)
+            self.unix_path = address
+        self._httpd.stub = self
+
+    @property
+    def address(self):
+        if self.unix_path:
+            return self.unix_path
+        host, port = self._httpd.server_address[:2]
+        return f"{host}:{port}"
+
+    def stop(self):
+        super().stop()
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the VLC web interface.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rc-address", default=None, help="Also serve the RC interface on host:port or a Unix socket path")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of answering with HTTP 500")
+    parser.add_argument("--down-every", type=float, default=0.0, help="Period of simulated downtime in seconds")
+    parser.add_argument("--down-for", type=float, default=0.0, help="Length of each downtime window in seconds")
+    args = parser.parse_args()
+
+    faults = FaultProfile(args.latency, args.jitter, args.error_rate, args.down_every, args.down_for)
+    stub = VLCStubServer(args.host, args.port, faults=faults).start()
+    print(f"VLC stub listening on http://{args.host}:{stub.port}/requests/status.xml (password: {stub.password})")
+    rc_stub = None
+    if args.rc_address:
+        rc_stub = RCStubServer(args.rc_address, faults=faults, player=stub.player).start()
+        print(f"VLC RC stub listening on {rc_stub.address}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
+        if rc_stub:
+            rc_stub.stop()